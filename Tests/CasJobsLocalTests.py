@@ -0,0 +1,498 @@
+#!/usr/bin/python
+from SciServer import Authentication, CasJobs, Config
+try:
+    import unittest2 as unittest
+except ImportError:
+    import unittest
+import json;
+import numpy;
+import os;
+import pandas;
+import shutil;
+import tempfile;
+import time;
+from concurrent.futures import ThreadPoolExecutor
+from unittest import mock
+from LocalCasJobs import LocalCasJobs
+
+# Runs the query functions of SciServer.CasJobs against a local stand-in CasJobs API, so no SciServer account is needed.
+
+CasJobs_Result = {"Result": [{"TableName": "Table1", "Columns": ["objid", "name", "ra"], "Data": [[i, "objé" + str(i), 0.5 * i] for i in range(1000)]},
+                             {"TableName": "Table2", "Columns": ["x"], "Data": []},
+                             {"Data": [[1], [2]], "Columns": ["y"], "TableName": "Table3"}],
+                  "Other": {"a": [1, 2]}}
+CasJobs_Query = "select objid, name, ra from MyTable"
+
+
+class TestCasJobsLocal(unittest.TestCase):
+
+    def setUp(self):
+        self.previousQueryBatchSize = Config.QueryBatchSize
+        Config.QueryBatchSize = 99
+        self.content = json.dumps(CasJobs_Result).encode()
+        self.casJobs = LocalCasJobs().start()
+        self.casJobs.setResult(CasJobs_Query, CasJobs_Result["Result"])
+
+    def tearDown(self):
+        self.casJobs.stop()
+        Config.QueryBatchSize = self.previousQueryBatchSize
+
+    def assertDataFramesEqual(self, dfs):
+        self.assertEqual(len(dfs), len(CasJobs_Result["Result"]))
+        for (df, table) in zip(dfs, CasJobs_Result["Result"]):
+            self.assertEqual(list(df.columns), table["Columns"])
+            self.assertEqual(df.values.tolist(), pandas.DataFrame(table["Data"], columns=table["Columns"]).values.tolist())
+
+    # *******************************************************************************************************
+    # CasJobs section
+
+    def test_CasJobs_getQueryResult_pandas(self):
+        self.assertDataFramesEqual(CasJobs._getQueryResult(self.content, "pandas"))
+        df = CasJobs._getQueryResult(b'{"Result": [{"TableName": "T", "Columns": ["n"], "Data": [[12345]]}]}', "pandas")
+        self.assertEqual(df.n.tolist(), [12345])
+
+    def test_CasJobs_getDataFramesFromJson_chunks(self):
+        for chunkSize in [1, 7, 4096]:
+            chunks = [self.content[i:i + chunkSize] for i in range(0, len(self.content), chunkSize)]
+            self.assertDataFramesEqual(CasJobs._getDataFramesFromJson(chunks))
+
+    def test_CasJobs_executeQuery(self):
+        self.assertDataFramesEqual(CasJobs.executeQuery(CasJobs_Query))
+
+    def test_CasJobs_iterQuery(self):
+        chunks = list(CasJobs.iterQuery(CasJobs_Query, chunksize=300))
+        self.assertEqual([len(chunk) for chunk in chunks], [300, 300, 300, 100, 0, 2])
+        self.assertEqual([chunk.attrs["tableIndex"] for chunk in chunks], [0, 0, 0, 0, 1, 2])
+        self.assertEqual(chunks[-1].attrs["tableName"], "Table3")
+        self.assertDataFramesEqual([pandas.concat(chunks[:4], ignore_index=True), chunks[4], chunks[5]])
+        self.assertTrue(self.casJobs.requests[-1][1].endswith("/query"))
+
+        chunks = CasJobs.executeQuery(CasJobs_Query, chunksize=1000)
+        self.assertEqual(len(next(chunks)), 1000)
+        chunks.close()
+
+        self.assertRaises(Exception, CasJobs.executeQuery, CasJobs_Query, format="csv", chunksize=1000)
+
+    def test_CasJobs_executeQuery_dtype_downcast(self):
+        df = CasJobs.executeQuery(CasJobs_Query, dtype={"ra": "float32"})
+        self.assertEqual([str(t) for t in df[0].dtypes[["objid", "ra"]]], ["int64", "float32"])
+        df = CasJobs.executeQuery(CasJobs_Query, downcast=True)
+        self.assertEqual([str(t) for t in df[0].dtypes[["objid", "ra"]]], ["int16", "float32"])
+        self.assertEqual(df[0].ra.tolist(), [0.5 * i for i in range(1000)])
+        chunks = list(CasJobs.iterQuery(CasJobs_Query, chunksize=100, dtype={"objid": "float64", "y": "int8"}))
+        self.assertEqual(str(chunks[0].objid.dtype), "float64")
+        self.assertEqual(str(chunks[-1].y.dtype), "int8")
+
+    def test_CasJobs_getDataFrame_schema(self):
+        # dtypes of the first batch are kept for later batches when the values fit them.
+        content = json.dumps({"Result": [{"Columns": ["i", "f", "n"], "Data": [[1, 1.0, 1], [2, 2.5, 2], [3, 3.5, None], [4, 4, 4]]}]}).encode()
+        Config.QueryBatchSize = 2
+        df = CasJobs._getDataFramesFromJson([content])
+        self.assertEqual([str(t) for t in df.dtypes], ["int64", "float64", "float64"])
+        self.assertEqual(df.f.tolist(), [1.0, 2.5, 3.5, 4.0])
+        self.assertTrue(pandas.isna(df.n[2]))
+
+    def test_CasJobs_getDataFrame_typedColumns(self):
+        # columns of numbers or booleans are built as NumPy arrays without the type inference of pandas, also when they have NULL values.
+        rows = [[i, i * 0.5, i % 2 == 0, None if i % 3 == 0 else i, "obj" + str(i)] for i in range(1000)]
+        inferred = []
+        inferColumn = CasJobs._inferColumn
+        with mock.patch.object(CasJobs, "_inferColumn", lambda values, columnType: inferred.append(values[0]) or inferColumn(values, columnType)):
+            df = CasJobs._getDataFrame(["i", "f", "b", "n", "s"], rows)
+            self.assertEqual(inferred, ["obj0"])
+            self.assertEqual([str(t) for t in df.dtypes], ["int64", "float64", "bool", "float64", "str"])
+            self.assertEqual(df.values.tolist()[1:3], [row for row in rows[1:3]])
+            self.assertTrue(pandas.isna(df.n[0]))
+
+            df = CasJobs._getDataFrame(["i", "f", "b", "n", "s"], rows, list(df.dtypes))
+            self.assertEqual(inferred, ["obj0", "obj0"])
+            self.assertEqual([str(t) for t in df.dtypes], ["int64", "float64", "bool", "float64", "str"])
+
+    def test_CasJobs_executeQuery_arrow_parquet(self):
+        tables = CasJobs.executeQuery(CasJobs_Query, format="arrow")
+        self.assertDataFramesEqual([table.to_pandas() for table in tables])
+        self.assertEqual(str(tables[0].schema.field("objid").type), "int64")
+        bytesios = CasJobs.executeQuery(CasJobs_Query, format="parquet")
+        self.assertDataFramesEqual([pandas.read_parquet(bytesio) for bytesio in bytesios])
+
+    def test_CasJobs_writeParquetFileFromQuery(self):
+        localDir = tempfile.mkdtemp()
+        try:
+            fileName = os.path.join(localDir, "result.parquet")
+            self.assertEqual(CasJobs.writeParquetFileFromQuery(fileName, CasJobs_Query), True)
+            self.assertEqual(os.listdir(localDir), ["result.parquet"])
+            df = pandas.read_parquet(fileName)
+            self.assertEqual(df.values.tolist(), pandas.DataFrame(CasJobs_Result["Result"][0]["Data"]).values.tolist())
+        finally:
+            shutil.rmtree(localDir, ignore_errors=True)
+
+    def test_CasJobs_writeParquetFileFromQuery_promotion(self):
+        # the first batch has only NULL values in column 'name' and integer values in column 'ra'.
+        Config.QueryBatchSize = 2
+        rows = [[0, None, 0.0], [1, None, 1.0], [2, "objé2", 1.5], [3, None, 3.0], [4, "objé4", 4.25]]
+        self.casJobs.setResult("select objid, name, ra from Promoted", [{"TableName": "Table1", "Columns": ["objid", "name", "ra"], "Data": rows}])
+        localDir = tempfile.mkdtemp()
+        try:
+            fileName = os.path.join(localDir, "result.parquet")
+            self.assertEqual(CasJobs.writeParquetFileFromQuery(fileName, "select objid, name, ra from Promoted"), True)
+            self.assertEqual(os.listdir(localDir), ["result.parquet"])
+            df = pandas.read_parquet(fileName)
+            self.assertEqual(str(df.ra.dtype), "float64")
+            self.assertEqual(df.ra.tolist(), [row[2] for row in rows])
+            self.assertEqual([None if pandas.isna(name) else name for name in df.name], [row[1] for row in rows])
+        finally:
+            shutil.rmtree(localDir, ignore_errors=True)
+
+    def test_CasJobs_writeFitsFileFromQuery(self):
+        localDir = tempfile.mkdtemp()
+        try:
+            # FITS tables only hold ASCII strings.
+            self.casJobs.setResult("select objid, ra from MyTable", [{"TableName": "Table1", "Columns": ["objid", "ra"], "Data": [[i, 0.5 * i] for i in range(1000)]}])
+            fileName = os.path.join(localDir, "result.fits")
+            self.assertEqual(CasJobs.writeFitsFileFromQuery(fileName, "select objid, ra from MyTable"), True)
+            self.assertEqual(os.listdir(localDir), ["result.fits"])
+            table = CasJobs.writeFitsFileFromQuery(fileName, "select objid, ra from MyTable", memmap=True)
+            self.assertEqual(list(table["objid"]), list(range(1000)))
+            self.assertEqual(list(table.colnames), ["objid", "ra"])
+        finally:
+            shutil.rmtree(localDir, ignore_errors=True)
+
+    def test_CasJobs_getNumpyArrayFromQuery(self):
+        array = CasJobs.getNumpyArrayFromQuery(CasJobs_Query)
+        self.assertEqual(array.dtype.names, ("objid", "name", "ra"))
+        self.assertEqual([array.dtype[i].kind for i in range(3)], ["i", "U", "f"])
+        self.assertEqual(array["name"].tolist(), [row[1] for row in CasJobs_Result["Result"][0]["Data"]])
+        localDir = tempfile.mkdtemp()
+        try:
+            fileName = os.path.join(localDir, "result.npy")
+            memmap = CasJobs.getNumpyArrayFromQuery(CasJobs_Query, fileName=fileName)
+            self.assertTrue(isinstance(memmap, numpy.memmap))
+            self.assertEqual(os.listdir(localDir), ["result.npy"])
+            self.assertEqual(memmap.tolist(), array.tolist())
+        finally:
+            shutil.rmtree(localDir, ignore_errors=True)
+
+    def test_CasJobs_uploadPandasDataFrameToTable(self):
+        dataFrame = pandas.DataFrame({"objid": range(1050), "ra": [0.5 * i for i in range(1050)]})
+        self.casJobs.failRequests(2)
+        self.assertEqual(CasJobs.uploadPandasDataFrameToTable(dataFrame, "NewTable", batchSize=100, numThreads=4, retries=2), True)
+        rows = self.casJobs.tables["NewTable"]
+        self.assertEqual(rows[0], ["objid", "ra"])
+        self.assertEqual(sorted(int(row[0]) for row in rows[1:]), list(range(1050)))
+        self.assertEqual(len(self.casJobs.requests), 11 + 2)
+
+        self.casJobs.failRequests(10)
+        self.assertRaises(Exception, CasJobs.uploadPandasDataFrameToTable, dataFrame, "OtherTable", batchSize=100, retries=1)
+
+        # by default, batches of Config.UploadBatchSize rows are uploaded, and failed requests are retried.
+        self.casJobs.failRequests(1)
+        self.casJobs.requests.clear()
+        self.assertEqual(CasJobs.uploadPandasDataFrameToTable(dataFrame, "SingleTable"), True)
+        self.assertEqual(len(self.casJobs.requests), 2)
+        self.assertEqual(len(self.casJobs.tables["SingleTable"]), 1051)
+
+        # batches and retries are turned off with 0.
+        self.casJobs.requests.clear()
+        self.assertEqual(CasJobs.uploadPandasDataFrameToTable(dataFrame, "WholeTable", batchSize=0, retries=0), True)
+        self.assertEqual(len(self.casJobs.requests), 1)
+        self.casJobs.failRequests(1)
+        self.assertRaises(Exception, CasJobs.uploadPandasDataFrameToTable, dataFrame, "FailedTable", batchSize=0, retries=0)
+
+    def test_CasJobs_task_concurrent(self):
+        # task names set by wrapper functions are local to each thread.
+        self.casJobs.setResult("select 1 as foo", [{"TableName": "Table1", "Columns": ["foo"], "Data": [[1]]}])
+        with ThreadPoolExecutor(max_workers=8) as executor:
+            futures = [executor.submit(CasJobs.getPandasDataFrameFromQuery, "select 1 as foo") if i % 2 == 0 else
+                       executor.submit(CasJobs.executeQuery, CasJobs_Query) for i in range(40)]
+            for future in futures:
+                future.result()
+        for (method, path, headers, body) in self.casJobs.requests:
+            if body["Query"] == "select 1 as foo":
+                self.assertTrue(body["TaskName"].endswith("CasJobs.getPandasDataFrameFromQuery"))
+            else:
+                self.assertTrue(body["TaskName"].endswith("CasJobs.executeQuery"))
+        CasJobs.task.name = "MyTask"
+        with ThreadPoolExecutor(max_workers=1) as executor:
+            self.assertEqual(executor.submit(lambda: CasJobs.task.name).result(), None)
+        CasJobs.executeQuery(CasJobs_Query)
+        self.assertEqual(self.casJobs.requests[-1][3]["TaskName"], "MyTask")
+        self.assertEqual(CasJobs.task.name, None)
+
+    def test_CasJobs_queryCache(self):
+        previous = (Config.QueryCacheEnabled, Config.CacheDir, Config.QueryCacheContextTTL)
+        Config.QueryCacheEnabled = True
+        Config.CacheDir = tempfile.mkdtemp()
+        try:
+            CasJobs.clearQueryCache()
+            countQueries = lambda: len([request for request in self.casJobs.requests if request[1].endswith("/query")])
+            dfs = CasJobs.executeQuery(CasJobs_Query, context="DR16")
+            dfs[0].loc[0, "objid"] = -1
+            self.assertDataFramesEqual(CasJobs.executeQuery(CasJobs_Query.replace(" ", "\n  ") + " ;", context="DR16"))
+            self.assertEqual(CasJobs.executeQuery(CasJobs_Query, context="DR16", format="arrow")[0].num_rows, 1000)
+            self.assertEqual(countQueries(), 2)
+
+            # results are kept on disk across sessions.
+            CasJobs._QueryCache._memory = None
+            self.assertDataFramesEqual(CasJobs.executeQuery(CasJobs_Query, context="DR16"))
+            self.assertEqual(len(CasJobs.executeQuery(CasJobs_Query, context="DR16", format="csv")), len(CasJobs.executeQuery(CasJobs_Query, context="DR16", format="csv")))
+            self.assertEqual(countQueries(), 3)
+            self.assertTrue(len(os.listdir(os.path.join(Config.CacheDir, "queries", CasJobs._QueryCache._getUser(), "dr16"))) > 0)
+
+            # writes and mutable contexts are not cached.
+            CasJobs.executeQuery(CasJobs_Query, context="MyDB")
+            CasJobs.executeQuery(CasJobs_Query, context="MyDB")
+            self.assertEqual(countQueries(), 5)
+            CasJobs.uploadCSVDataToTable(b"a\n1\n", "NewTable", context="DR16")
+            CasJobs.executeQuery(CasJobs_Query, context="DR16")
+            self.assertEqual(countQueries(), 6)
+            CasJobs.clearQueryCache("DR16")
+            CasJobs.executeQuery(CasJobs_Query, context="DR16")
+            self.assertEqual(countQueries(), 7)
+            Config.QueryCacheContextTTL = {"dr16": 0}
+            CasJobs.executeQuery(CasJobs_Query, context="DR16")
+            self.assertEqual(countQueries(), 8)
+
+            # batches and statements that modify data or schema are not read-only, unless the keywords are in literals.
+            self.assertTrue(CasJobs._QueryCache.isReadOnly("select 'drop table x; delete' as [update] from t;"))
+            self.assertFalse(CasJobs._QueryCache.isReadOnly("select 1; drop table x"))
+            self.assertFalse(CasJobs._QueryCache.isReadOnly("with t as (select 1 as a) delete from x"))
+            self.assertFalse(CasJobs._QueryCache.isReadOnly("select 1 exec sp_who"))
+        finally:
+            CasJobs.clearQueryCache()
+            shutil.rmtree(Config.CacheDir, ignore_errors=True)
+            (Config.QueryCacheEnabled, Config.CacheDir, Config.QueryCacheContextTTL) = previous
+
+    def test_CasJobs_queryCache_usersAndWrites(self):
+        previous = (Config.QueryCacheEnabled, Config.CacheDir, Config.QueryCacheMaxMemory)
+        (Config.QueryCacheEnabled, Config.CacheDir) = (True, tempfile.mkdtemp())
+        try:
+            CasJobs.clearQueryCache()
+            countQueries = lambda: len([request for request in self.casJobs.requests if request[1].endswith("/query")])
+            CasJobs.executeQuery(CasJobs_Query, context="DR16")
+            CasJobs.executeQuery(CasJobs_Query, context="DR16")
+            self.assertEqual(countQueries(), 1)
+
+            # results are cached per user token.
+            Authentication.token.value = "other-token"
+            CasJobs.executeQuery(CasJobs_Query, context="DR16")
+            self.assertEqual(countQueries(), 2)
+            self.assertEqual(len(os.listdir(os.path.join(Config.CacheDir, "queries"))), 2)
+            Authentication.token.value = "local-token"
+            CasJobs.executeQuery(CasJobs_Query, context="DR16")
+            self.assertEqual(countQueries(), 2)
+
+            # the in-memory cache follows changes of Config.QueryCacheMaxMemory, keeping the entries that fit.
+            Config.QueryCacheMaxMemory = 2 * Config.QueryCacheMaxMemory
+            self.assertEqual(CasJobs._QueryCache._getMemory().maxsize, Config.QueryCacheMaxMemory)
+            self.assertEqual(len(CasJobs._QueryCache._getMemory()), 2)
+
+            # a query that writes into a context it names removes the cached results of that context, for all users.
+            self.casJobs.setResult("insert into [DR16].dbo.MyTable select 1", [])
+            CasJobs.executeQuery("insert into [DR16].dbo.MyTable select 1", context="MyDB", format="json")
+            self.assertEqual(len(CasJobs._QueryCache._getMemory()), 0)
+            CasJobs.executeQuery(CasJobs_Query, context="DR16")
+            self.assertEqual(countQueries(), 4)
+            self.assertEqual(CasJobs._QueryCache.getReferencedContexts("select * from mydb.t join \"MyScratch\" . dbo.u on t.a = 'x.y'"), set(["mydb", "myscratch", "dbo", "t"]))
+
+            # MyScratch is also a mutable context.
+            CasJobs.executeQuery(CasJobs_Query, context="MyScratch")
+            CasJobs.executeQuery(CasJobs_Query, context="MyScratch")
+            self.assertEqual(countQueries(), 6)
+        finally:
+            Authentication.token.value = "local-token"
+            CasJobs.clearQueryCache()
+            shutil.rmtree(Config.CacheDir, ignore_errors=True)
+            (Config.QueryCacheEnabled, Config.CacheDir, Config.QueryCacheMaxMemory) = previous
+
+    def test_CasJobs_queryCache_expiry(self):
+        previous = (Config.QueryCacheEnabled, Config.CacheDir, Config.QueryCacheTTL)
+        (Config.QueryCacheEnabled, Config.CacheDir, Config.QueryCacheTTL) = (True, tempfile.mkdtemp(), 100)
+        try:
+            CasJobs.clearQueryCache()
+            CasJobs._QueryCache.put(CasJobs_Query, "DR16", "csv", b"a\n1\n")
+            directory = os.path.join(Config.CacheDir, "queries", CasJobs._QueryCache._getUser(), "dr16")
+            metaFilePath = os.path.join(directory, [fileName for fileName in os.listdir(directory) if fileName.endswith(".json")][0])
+            with open(metaFilePath) as f:
+                meta = json.load(f)
+            meta["time"] = time.time() - 99
+            with open(metaFilePath, "w") as f:
+                json.dump(meta, f)
+
+            # an entry read from disk keeps the time when it was received, instead of getting a full TTL in memory.
+            CasJobs._QueryCache._memory = None
+            self.assertEqual(CasJobs._QueryCache.get(CasJobs_Query, "DR16", "csv"), b"a\n1\n")
+            time.sleep(1.1)
+            self.assertIsNone(CasJobs._QueryCache.get(CasJobs_Query, "DR16", "csv"))
+        finally:
+            CasJobs.clearQueryCache()
+            shutil.rmtree(Config.CacheDir, ignore_errors=True)
+            (Config.QueryCacheEnabled, Config.CacheDir, Config.QueryCacheTTL) = previous
+
+    def test_CasJobs_executeQueryPartitioned(self):
+        rows = CasJobs_Result["Result"][0]["Data"] + [[None, "null", 1.0]]
+        self.casJobs.setResult("select min(objid) as minValue, max(objid) as maxValue from (" + CasJobs_Query + ") as _partitioned",
+                               [{"TableName": "Table1", "Columns": ["minValue", "maxValue"], "Data": [[0, 999]]}])
+        conditions = CasJobs._getPartitionConditions("objid", (0, 999), 3)
+        self.assertEqual(conditions[0], "(objid >= 0 and objid < 333) or objid is null")
+        self.assertEqual(conditions[2], "(objid >= 666 and objid <= 999)")
+        for (condition, (low, high)) in zip(conditions, [(0, 333), (333, 666), (666, 1000)]):
+            data = [row for row in rows if (row[0] is None and low == 0) or (row[0] is not None and low <= row[0] < high)]
+            self.casJobs.setResult("select * from (" + CasJobs_Query + ") as _partitioned where " + condition,
+                                   [{"TableName": "Table1", "Columns": ["objid", "name", "ra"], "Data": data}])
+
+        df = CasJobs.executeQueryPartitioned(CasJobs_Query + ";", "DR16", "objid", numParts=3, numThreads=2)
+        self.assertEqual(len(df), 1001)
+        self.assertEqual(sorted(df.name.tolist()), sorted(row[1] for row in rows))
+        self.assertEqual(str(df.ra.dtype), "float64")
+        self.assertEqual(len([request for request in self.casJobs.requests if request[1].endswith("/query")]), 4)
+        self.assertTrue(all(request[3]["TaskName"].endswith("CasJobs.executeQueryPartitioned") for request in self.casJobs.requests))
+
+        table = CasJobs.executeQueryPartitioned(CasJobs_Query, "DR16", "objid", numParts=3, format="arrow", bounds=(0, 999))
+        self.assertEqual(table.num_rows, 1001)
+        self.assertEqual(CasJobs._getPartitionConditions("x", (0.0, 1.0), 2), ["(x >= 0.0 and x < 0.5) or x is null", "(x >= 0.5 and x <= 1.0)"])
+        self.assertEqual(len(CasJobs._getPartitionConditions("x", (5, 6), 10)), 2)
+        self.assertRaises(Exception, CasJobs._getPartitionConditions, "x", ("a", "b"), 2)
+
+    def test_CasJobs_extract(self):
+        previousCacheDir = Config.CacheDir
+        Config.CacheDir = tempfile.mkdtemp()
+        localDir = tempfile.mkdtemp()
+        try:
+            tableName = "myTable"
+            rows = [[i + 1, i, "objé" + str(i), 0.5 * i] for i in range(250)]
+            self.casJobs.setJobPolls("select identity(bigint, 1, 1) as extractRowId, * into mydb.myTable from (" + CasJobs_Query + ") as _extract", 2)
+            self.casJobs.setResult("select count_big(*) as numRows from myTable", [{"TableName": "Table1", "Columns": ["numRows"], "Data": [[250]]}])
+            self.casJobs.setResult("drop table myTable", [])
+            for page in range(3):
+                sql = "select * from myTable where extractRowId between " + str(page * 100 + 1) + " and " + str((page + 1) * 100) + " order by extractRowId"
+                if page != 2:
+                    self.casJobs.setResult(sql, [{"TableName": "Table1", "Columns": ["extractRowId", "objid", "name", "ra"], "Data": rows[page * 100:(page + 1) * 100]}])
+            dest = os.path.join(localDir, "extract")
+            self.assertRaises(Exception, CasJobs.extract, CasJobs_Query + ";", "DR16", dest, tableName=tableName, pageSize=100, pollTime=0.01)
+            self.assertEqual(sorted(os.listdir(dest)), ["part-00000.parquet", "part-00001.parquet"])
+
+            # the restarted extract only downloads the missing page.
+            self.casJobs.setResult(sql, [{"TableName": "Table1", "Columns": ["extractRowId", "objid", "name", "ra"], "Data": rows[200:]}])
+            numRequests = len(self.casJobs.requests)
+            fileNames = CasJobs.extract(CasJobs_Query, "DR16", dest, tableName=tableName, pageSize=100, pollTime=0.01)
+            self.assertEqual([request[3]["Query"] for request in self.casJobs.requests[numRequests:]], [sql, "drop table myTable"])
+            self.assertEqual(fileNames, [os.path.join(dest, "part-0000" + str(i) + ".parquet") for i in range(3)])
+            df = pandas.read_parquet(dest)
+            self.assertEqual(df.values.tolist(), [row[1:] for row in rows])
+            self.assertEqual(len([request for request in self.casJobs.requests if request[0] == "PUT"]), 2)
+
+            # once the staging table is dropped, missing pages are written by running the extract again from the start.
+            os.remove(fileNames[1])
+            fileNames = CasJobs.extract(CasJobs_Query, "DR16", dest, tableName=tableName, pageSize=100, pollTime=0.01)
+            self.assertEqual(pandas.read_parquet(dest).values.tolist(), [row[1:] for row in rows])
+            self.assertEqual(len([request for request in self.casJobs.requests if request[0] == "PUT"]), 4)
+
+            # a failed job is submitted again after dropping the table it might have created.
+            self.casJobs.setJobFailures("select identity(bigint, 1, 1) as extractRowId, * into mydb.myTable from (" + CasJobs_Query + ") as _extract", 1)
+            self.casJobs.setResult("if object_id('myTable', 'U') is not null drop table myTable", [])
+            csvDir = os.path.join(localDir, "csv")
+            self.assertRaises(Exception, CasJobs.extract, CasJobs_Query, "DR16", csvDir, format="csv", tableName=tableName, pageSize=100, dropTable=False)
+            numRequests = len(self.casJobs.requests)
+            fileNames = CasJobs.extract(CasJobs_Query, "DR16", csvDir, format="csv", tableName=tableName, pageSize=100, dropTable=False)
+            self.assertEqual(self.casJobs.requests[numRequests][3]["Query"], "if object_id('myTable', 'U') is not null drop table myTable")
+            self.assertEqual(pandas.concat([pandas.read_csv(fileName) for fileName in fileNames]).values.tolist(), [row[1:] for row in rows])
+            self.assertRaises(Exception, CasJobs.extract, "select 1", "DR16", dest)
+        finally:
+            shutil.rmtree(localDir, ignore_errors=True)
+            shutil.rmtree(Config.CacheDir, ignore_errors=True)
+            Config.CacheDir = previousCacheDir
+
+    def test_CasJobs_extract_promotion(self):
+        previousCacheDir = Config.CacheDir
+        Config.CacheDir = tempfile.mkdtemp()
+        localDir = tempfile.mkdtemp()
+        try:
+            # the first page has only NULL values in column 'name' and integer values in column 'ra'.
+            rows = [[1, 0, None, 0], [2, 1, None, 1], [3, 2, "objé2", 1.5], [4, 3, None, 3.0]]
+            self.casJobs.setResult("select count_big(*) as numRows from myTable", [{"TableName": "Table1", "Columns": ["numRows"], "Data": [[4]]}])
+            self.casJobs.setResult("drop table myTable", [])
+            for page in range(2):
+                sql = "select * from myTable where extractRowId between " + str(page * 2 + 1) + " and " + str((page + 1) * 2) + " order by extractRowId"
+                self.casJobs.setResult(sql, [{"TableName": "Table1", "Columns": ["extractRowId", "objid", "name", "ra"], "Data": rows[page * 2:(page + 1) * 2]}])
+            fileNames = CasJobs.extract(CasJobs_Query, "DR16", localDir, tableName="myTable", pageSize=2)
+            df = pandas.read_parquet(localDir)
+            self.assertEqual(str(df.ra.dtype), "float64")
+            self.assertEqual(df.ra.tolist(), [row[3] for row in rows])
+            self.assertEqual([None if pandas.isna(name) else name for name in df.name], [row[2] for row in rows])
+            self.assertEqual(sorted(os.listdir(localDir)), [os.path.basename(fileName) for fileName in fileNames])
+        finally:
+            shutil.rmtree(localDir, ignore_errors=True)
+            shutil.rmtree(Config.CacheDir, ignore_errors=True)
+            Config.CacheDir = previousCacheDir
+
+    def test_CasJobs_metadataCache(self):
+        previous = (Config.CacheDir, Config.CasJobsMetadataTTL)
+        (Config.CacheDir, Config.CasJobsMetadataTTL) = (tempfile.mkdtemp(), 300)
+        try:
+            CasJobs._metadataCache.clear()
+            countGets = lambda: len([request for request in self.casJobs.requests if request[0] == "GET"])
+            self.assertEqual(CasJobs.getTables("MyDB"), [])
+            self.assertEqual(CasJobs.getTables("MyDB"), [])
+            self.assertEqual(countGets(), 1)
+
+            # uploads and jobs invalidate the table list of MyDB.
+            CasJobs.uploadCSVDataToTable(b"a\n1\n", "NewTable")
+            self.assertEqual([table["Name"] for table in CasJobs.getTables("MyDB")], ["NewTable"])
+            self.assertEqual(countGets(), 2)
+            jobId = CasJobs.submitJob("select 1 as a into mydb.OtherTable", "DR16")
+            CasJobs.getTables("MyDB")
+            self.assertEqual(countGets(), 3)
+
+            # the tables are written while the job runs, so they are invalidated again once it is complete.
+            CasJobs.waitForJob(jobId, pollTime=0.01)
+            CasJobs.getTables("MyDB")
+            self.assertEqual(countGets(), 5)
+
+            # the metadata is kept on disk across sessions, and changes made by other processes are read again.
+            CasJobs._metadataCache.clear()
+            CasJobs.getTables("MyDB")
+            self.assertEqual(countGets(), 5)
+            CasJobs.clearMetadataCache()
+            CasJobs.getTables("MyDB")
+            self.assertEqual(countGets(), 6)
+            CasJobs._Http.writeStateFile(CasJobs._getMetadataFilePath("local-token"), {})
+            CasJobs.getTables("MyDB")
+            self.assertEqual(countGets(), 7)
+
+            CasJobs._setCachedMetadata("local-token", "schemaName", "wsid_123")
+            self.assertEqual(CasJobs.getSchemaName(), "wsid_123")
+        finally:
+            CasJobs._metadataCache.clear()
+            shutil.rmtree(Config.CacheDir, ignore_errors=True)
+            (Config.CacheDir, Config.CasJobsMetadataTTL) = previous
+
+    def test_CasJobs_submitJobs_waitForJobs(self):
+        queries = ["select " + str(i) for i in range(6)]
+        for i in range(6):
+            self.casJobs.setJobPolls(queries[i], 5 - i)
+        jobIds = CasJobs.submitJobs(queries[:5] + [(queries[5], "DR14")])
+        self.assertEqual(sorted(jobIds), list(range(1, 7)))
+        self.assertTrue(self.casJobs.requests[-1][1].startswith("/contexts/"))
+        jobDescs = list(CasJobs.waitForJobs(jobIds, pollTime=0.01))
+        self.assertEqual([jobDesc["JobID"] for jobDesc in jobDescs], list(reversed(jobIds)))
+        self.assertTrue(all(jobDesc["Status"] == 5 for jobDesc in jobDescs))
+
+        self.casJobs.setJobPolls("select 100", 1000)
+        jobIds = CasJobs.submitJobs(["select 100"])
+        self.assertRaises(Exception, list, CasJobs.waitForJobs(jobIds, pollTime=0.01, timeout=0.1))
+
+    def test_CasJobs_waitForJob(self):
+        self.casJobs.setJobPolls("select 1", 3)
+        jobId = CasJobs.submitJob("select 1")
+        progress = []
+        jobDesc = CasJobs.waitForJob(jobId, pollTime=0.01, callback=lambda jobDesc, elapsed: progress.append(jobDesc["Status"]))
+        self.assertEqual(jobDesc["Status"], 5)
+        self.assertEqual(progress, [1, 1, 1])
+
+        self.casJobs.setJobPolls("select 2", 1000)
+        jobId = CasJobs.submitJob("select 2")
+        self.assertRaises(Exception, CasJobs.waitForJob, jobId, pollTime=0.01, maxPollTime=0.02, timeout=0.1)
+
+
+if __name__ == "__main__":
+    unittest.main()
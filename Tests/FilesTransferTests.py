@@ -0,0 +1,325 @@
+#!/usr/bin/python
+from SciServer import Config, Files
+try:
+    import unittest2 as unittest
+except ImportError:
+    import unittest
+import asyncio;
+import os;
+import shutil;
+import tempfile;
+from unittest import mock
+from LocalFileService import LocalFileService
+
+# Runs the SciServer.Files transfer functions against a local stand-in FileService, so no SciServer account is needed.
+
+Files_LocalFileSize = 5 * 1024 * 1024 + 321
+Files_PartSize = 1024 * 1024
+
+
+class TestFilesTransfers(unittest.TestCase):
+
+    def setUp(self):
+        self.fileService = LocalFileService().start()
+        self.localDir = tempfile.mkdtemp()
+        self.previousCacheDir = Config.CacheDir
+        self.previousPartSize = Config.FileTransferPartSize
+        self.previousRangedUploads = Config.FileServiceRangedUploads
+        Config.FileServiceRangedUploads = True
+        Config.CacheDir = os.path.join(self.localDir, "cache")
+        Config.FileTransferPartSize = Files_PartSize
+        self.content = os.urandom(Files_LocalFileSize)
+        self.localFilePath = os.path.join(self.localDir, "MyNewFile.bin")
+        with open(self.localFilePath, "wb") as f:
+            f.write(self.content)
+        self.remotePath = self.fileService.userVolumePath + "/MyNewFile.bin"
+
+    def tearDown(self):
+        Config.CacheDir = self.previousCacheDir
+        Config.FileTransferPartSize = self.previousPartSize
+        Config.FileServiceRangedUploads = self.previousRangedUploads
+        self.fileService.stop()
+        shutil.rmtree(self.localDir, ignore_errors=True)
+
+    def readRemoteFile(self):
+        with open(self.fileService.localPath(self.remotePath), "rb") as f:
+            return f.read()
+
+    # *******************************************************************************************************
+    # Files section
+
+    def test_Files_upload_download(self):
+        Files.upload(self.fileService.name, self.remotePath, localFilePath=self.localFilePath)
+        self.assertEqual(self.content, self.readRemoteFile())
+
+        downloadedFilePath = os.path.join(self.localDir, "downloaded.bin")
+        self.assertTrue(Files.download(self.fileService.name, self.remotePath, localFilePath=downloadedFilePath, chunkSize=Files_PartSize))
+        with open(downloadedFilePath, "rb") as f:
+            self.assertEqual(self.content, f.read())
+        self.assertEqual(sorted(os.listdir(self.localDir)), sorted(["MyNewFile.bin", "downloaded.bin"]))
+
+    def test_Files_upload_partSize_numConnections(self):
+        Files.upload(self.fileService.name, self.remotePath, localFilePath=self.localFilePath, partSize=Files_PartSize, numConnections=4)
+        self.assertEqual(self.content, self.readRemoteFile())
+        puts = [headers for (method, path, headers) in self.fileService.requests if method == "PUT"]
+        self.assertEqual(puts.__len__(), 6)
+        self.assertTrue(all("Content-Range" in headers for headers in puts))
+        self.assertEqual(os.listdir(os.path.dirname(self.fileService.localPath(self.remotePath))), ["MyNewFile.bin"])
+
+        Files.upload(self.fileService.name, self.remotePath + ".txt", data="#ID,Column1,Column2\n1,4.5,5.5", partSize=7, numConnections=2)
+        self.assertEqual(Files.download(self.fileService.name, self.remotePath + ".txt"), "#ID,Column1,Column2\n1,4.5,5.5")
+
+    def test_Files_upload_numConnections_withoutRangedUploads(self):
+        Config.FileServiceRangedUploads = False
+        with self.assertWarns(Warning):
+            Files.upload(self.fileService.name, self.remotePath, localFilePath=self.localFilePath, partSize=Files_PartSize, numConnections=4)
+        self.assertEqual(self.content, self.readRemoteFile())
+        puts = [headers for (method, path, headers) in self.fileService.requests if method == "PUT"]
+        self.assertEqual(puts.__len__(), 1)
+        self.assertFalse("Content-Range" in puts[0])
+
+    def test_Files_upload_numConnections_sizeMismatch(self):
+        # the FileService ignores the Content-Range headers, so the file is uploaded again in a single request, and so are the next ones.
+        self.fileService.rangedUploads = False
+        Files.upload(self.fileService.name, self.remotePath, localFilePath=self.localFilePath, partSize=Files_PartSize, numConnections=4)
+        self.assertEqual(self.content, self.readRemoteFile())
+        self.assertFalse("Content-Range" in [headers for (method, path, headers) in self.fileService.requests if method == "PUT"][-1])
+        self.assertFalse(Files._supportsRangedUploads(Files.getFileServiceFromName(self.fileService.name)))
+
+    def test_Files_upload_quiet(self):
+        Files.upload(self.fileService.name, self.remotePath, data="abc")
+        with self.assertRaises(Exception):
+            Files.upload(self.fileService.name, self.remotePath, localFilePath=self.localFilePath, partSize=Files_PartSize, quiet=False)
+
+    def test_Files_upload_resume(self):
+        # the first two parts are uploaded, and the rest fail.
+        self.fileService.failRequests("PUT", 100, after=2)
+        with self.assertRaises(Exception):
+            Files.upload(self.fileService.name, self.remotePath, localFilePath=self.localFilePath, numConnections=1, resume=True)
+        self.assertEqual(os.listdir(os.path.join(Config.CacheDir, "uploads")).__len__(), 1)
+
+        self.fileService.failRequests("PUT", 0)
+        self.fileService.requests.clear()
+        Files.upload(self.fileService.name, self.remotePath, localFilePath=self.localFilePath, numConnections=2, resume=True)
+        self.assertEqual(self.content, self.readRemoteFile())
+        self.assertEqual([method for (method, path, headers) in self.fileService.requests].count("PUT"), 4)
+        self.assertEqual(os.listdir(os.path.join(Config.CacheDir, "uploads")), [])
+
+    def test_Files_upload_resume_remoteFileRemoved(self):
+        self.fileService.failRequests("PUT", 100, after=2)
+        with self.assertRaises(Exception):
+            Files.upload(self.fileService.name, self.remotePath, localFilePath=self.localFilePath, numConnections=1, resume=True)
+
+        # the parts uploaded before are no longer in the remote file, so all of them are uploaded again.
+        os.remove(self.fileService.localPath(self.remotePath))
+        self.fileService.failRequests("PUT", 0)
+        self.fileService.requests.clear()
+        Files.upload(self.fileService.name, self.remotePath, localFilePath=self.localFilePath, numConnections=2, resume=True)
+        self.assertEqual(self.content, self.readRemoteFile())
+        self.assertEqual([method for (method, path, headers) in self.fileService.requests].count("PUT"), 6)
+
+    def test_Files_download_numConnections_resume(self):
+        Files.upload(self.fileService.name, self.remotePath, localFilePath=self.localFilePath)
+        downloadedFilePath = os.path.join(self.localDir, "downloaded.bin")
+
+        self.assertTrue(Files.download(self.fileService.name, self.remotePath, localFilePath=downloadedFilePath, numConnections=4))
+        with open(downloadedFilePath, "rb") as f:
+            self.assertEqual(self.content, f.read())
+        os.remove(downloadedFilePath)
+
+        # the range probe and the first two byte ranges are downloaded, and the rest fail.
+        self.fileService.failRequests("GET", 100, after=3)
+        with self.assertRaises(Exception):
+            Files.download(self.fileService.name, self.remotePath, localFilePath=downloadedFilePath, numConnections=1, resume=True)
+        self.assertTrue(os.path.isfile(downloadedFilePath + ".part"))
+        self.assertTrue(os.path.isfile(downloadedFilePath + ".part.json"))
+
+        self.fileService.failRequests("GET", 0)
+        self.fileService.requests.clear()
+        self.assertTrue(Files.download(self.fileService.name, self.remotePath, localFilePath=downloadedFilePath, numConnections=2, resume=True))
+        with open(downloadedFilePath, "rb") as f:
+            self.assertEqual(self.content, f.read())
+        self.assertEqual([method for (method, path, headers) in self.fileService.requests].count("GET"), 5)
+        self.assertEqual(sorted(os.listdir(self.localDir)), sorted(["MyNewFile.bin", "downloaded.bin"]))
+
+    def test_Files_uploadFiles_downloadFiles(self):
+        localFiles = []
+        for i in range(20):
+            localFiles.append(os.path.join(self.localDir, "cutout" + str(i) + ".fits"))
+            with open(localFiles[i], "w") as f:
+                f.write("cutout" + str(i))
+
+        self.fileService.failRequests("PUT", 2, after=5)
+        report = Files.uploadFiles(self.fileService.name, [(localFile, self.fileService.userVolumePath + "/cutouts/" + os.path.basename(localFile)) for localFile in localFiles], numThreads=4)
+        self.assertEqual(report["failed"], 0)
+        self.assertEqual(report["retries"], 2)
+        self.assertEqual(report["files"].__len__(), 20)
+        self.assertEqual(report["bytes"], sum(os.path.getsize(localFile) for localFile in localFiles))
+
+        report = Files.downloadFiles(Files.getFileServiceFromName(self.fileService.name), [(os.path.join(self.localDir, "downloaded", os.path.basename(localFile)), self.fileService.userVolumePath + "/cutouts/" + os.path.basename(localFile)) for localFile in localFiles] +
+                                     [(os.path.join(self.localDir, "downloaded", "missing.fits"), self.fileService.userVolumePath + "/cutouts/missing.fits")], retries=3)
+        # a missing file is not retried, unlike connection errors, timeouts and status codes of 429 or 5xx.
+        self.assertEqual(report["failed"], 1)
+        self.assertIsNotNone(report["files"][20]["error"])
+        self.assertEqual(report["files"][20]["retries"], 0)
+        with open(os.path.join(self.localDir, "downloaded", "cutout7.fits")) as f:
+            self.assertEqual(f.read(), "cutout7")
+
+    def test_Files_uploadDirectory_downloadDirectory(self):
+        os.makedirs(os.path.join(self.localDir, "results", "a", "b"))
+        relativePaths = ["x.txt", "a/y.txt", "a/b/z.txt"]
+        for relativePath in relativePaths:
+            with open(os.path.join(self.localDir, "results", *relativePath.split("/")), "w") as f:
+                f.write(relativePath)
+
+        report = Files.uploadDirectory(self.fileService.name, os.path.join(self.localDir, "results"), self.fileService.userVolumePath + "/results")
+        self.assertEqual(report["failed"], 0)
+        self.assertEqual(report["files"].__len__(), 3)
+
+        report = Files.downloadDirectory(self.fileService.name, self.fileService.userVolumePath + "/results", os.path.join(self.localDir, "downloaded"))
+        self.assertEqual(report["failed"], 0)
+        for relativePath in relativePaths:
+            with open(os.path.join(self.localDir, "downloaded", *relativePath.split("/"))) as f:
+                self.assertEqual(f.read(), relativePath)
+
+    def test_Files_sync(self):
+        resultsDirectory = os.path.join(self.localDir, "results")
+        os.makedirs(os.path.join(resultsDirectory, "a"))
+        for relativePath in ["x.txt", "a/y.txt", "a/z.txt"]:
+            with open(os.path.join(resultsDirectory, *relativePath.split("/")), "w") as f:
+                f.write(relativePath)
+        remotePath = self.fileService.userVolumePath + "/results"
+
+        # only a remote directory that is not found is treated as empty.
+        self.fileService.failRequests("GET", 1, statusCode=503, api="jsontree")
+        with self.assertRaises(Exception):
+            Files.sync(resultsDirectory, self.fileService.name, remotePath, direction="upload")
+
+        report = Files.sync(resultsDirectory, self.fileService.name, remotePath, direction="upload")
+        self.assertEqual((report["files"].__len__(), report["skipped"], report["failed"]), (3, 0, 0))
+        report = Files.sync(resultsDirectory, self.fileService.name, remotePath, direction="upload")
+        self.assertEqual((report["files"].__len__(), report["skipped"]), (0, 3))
+
+        with open(os.path.join(resultsDirectory, "a", "y.txt"), "w") as f:
+            f.write("changed content")
+        os.remove(os.path.join(resultsDirectory, "x.txt"))
+        report = Files.sync(resultsDirectory, self.fileService.name, remotePath, direction="upload", delete=True)
+        self.assertEqual([result["path"] for result in report["files"]], [remotePath + "/a/y.txt"])
+        self.assertEqual(report["deleted"], ["x.txt"])
+        self.assertFalse(os.path.exists(self.fileService.localPath(remotePath + "/x.txt")))
+
+        downloadedDirectory = os.path.join(self.localDir, "downloaded")
+        report = Files.sync(downloadedDirectory, self.fileService.name, remotePath, direction="download")
+        self.assertEqual((report["files"].__len__(), report["skipped"]), (2, 0))
+        with open(os.path.join(downloadedDirectory, "a", "y.txt")) as f:
+            self.assertEqual(f.read(), "changed content")
+        report = Files.sync(downloadedDirectory, self.fileService.name, remotePath, direction="download")
+        self.assertEqual((report["files"].__len__(), report["skipped"]), (0, 2))
+
+    def test_Files_sync_checksum(self):
+        resultsDirectory = os.path.join(self.localDir, "results")
+        os.makedirs(resultsDirectory)
+        localFilePath = os.path.join(resultsDirectory, "x.txt")
+        with open(localFilePath, "w") as f:
+            f.write("same content")
+        remotePath = self.fileService.userVolumePath + "/results"
+
+        report = Files.sync(resultsDirectory, self.fileService.name, remotePath, checksum=True)
+        self.assertEqual(report["files"].__len__(), 1)
+
+        # re-writing a file with the same content makes it newer, but does not change its hash.
+        os.utime(localFilePath, (os.path.getatime(localFilePath) + 3600, os.path.getmtime(localFilePath) + 3600))
+        report = Files.sync(resultsDirectory, self.fileService.name, remotePath, checksum=True)
+        self.assertEqual((report["files"].__len__(), report["skipped"]), (0, 1))
+        report = Files.sync(resultsDirectory, self.fileService.name, remotePath)
+        self.assertEqual(report["files"].__len__(), 1)
+
+    def test_Files_computeLocalFileAccess(self):
+        # simulates SciServer-Compute, where the user volumes of the local FileService are mounted under Config.ComputeWorkDir.
+        previousKeystoneTokenPath = Config.KeystoneTokenPath
+        previousComputeWorkDir = Config.ComputeWorkDir
+        Config.KeystoneTokenPath = os.path.join(self.localDir, "keystone.token")
+        Config.ComputeWorkDir = self.fileService.rootDir + "/"
+        with open(Config.KeystoneTokenPath, "w") as f:
+            f.write("local-token")
+        try:
+            Files.getFileServiceFromName(self.fileService.name)
+            self.fileService.requests.clear()
+
+            Files.upload(self.fileService.name, self.remotePath, localFilePath=self.localFilePath)
+            self.assertEqual(self.content, self.readRemoteFile())
+            Files.upload(self.fileService.name, self.remotePath + ".txt", data="hello")
+            with self.assertRaises(Exception):
+                Files.upload(self.fileService.name, self.remotePath + ".txt", data="hello", quiet=False)
+            self.assertEqual(Files.download(self.fileService.name, self.remotePath + ".txt"), "hello")
+
+            downloadedFilePath = os.path.join(self.localDir, "downloaded.bin")
+            self.assertTrue(Files.download(self.fileService.name, self.remotePath, localFilePath=downloadedFilePath))
+            with open(downloadedFilePath, "rb") as f:
+                self.assertEqual(self.content, f.read())
+
+            Files.move(self.fileService.name, self.remotePath, self.fileService.name, self.remotePath + ".copy")
+            self.assertEqual(os.path.getsize(self.fileService.localPath(self.remotePath + ".copy")), Files_LocalFileSize)
+
+            dirList = Files.dirList(self.fileService.name, self.fileService.userVolumePath)
+            self.assertEqual([file.get("name") for file in dirList.get("root").get("files")], ["MyNewFile.bin", "MyNewFile.bin.copy", "MyNewFile.bin.txt"])
+            self.assertEqual(self.fileService.requests, [])
+        finally:
+            Config.KeystoneTokenPath = previousKeystoneTokenPath
+            Config.ComputeWorkDir = previousComputeWorkDir
+
+    def test_Files_downloadAsync(self):
+        Files.upload(self.fileService.name, self.remotePath, localFilePath=self.localFilePath)
+        downloadedFilePath = os.path.join(self.localDir, "downloaded.bin")
+        previousChunkSize = Config.FileTransferChunkSize
+        Config.FileTransferChunkSize = 64 * 1024
+        try:
+            self.assertTrue(asyncio.run(Files.downloadAsync(self.fileService.name, self.remotePath, localFilePath=downloadedFilePath)))
+            with open(downloadedFilePath, "rb") as f:
+                self.assertEqual(self.content, f.read())
+
+            # a failed download leaves neither the file nor a temporary file behind.
+            os.remove(downloadedFilePath)
+            with self.assertRaises(Exception):
+                asyncio.run(Files.downloadAsync(self.fileService.name, self.remotePath + ".missing", localFilePath=downloadedFilePath))
+            self.assertFalse(any(fileName.startswith(".") or fileName == "downloaded.bin" for fileName in os.listdir(self.localDir)))
+            self.assertEqual(asyncio.run(Files.downloadAsync(self.fileService.name, self.remotePath, format="BytesIO")).read(), self.content)
+        finally:
+            Config.FileTransferChunkSize = previousChunkSize
+
+    def test_Files_isTransientError(self):
+        self.assertTrue(Files._isTransientError(Files._FileServiceError("Error", 503)))
+        self.assertTrue(Files._isTransientError(Files._FileServiceError("Error", 429)))
+        self.assertFalse(Files._isTransientError(Files._FileServiceError("Error", 404)))
+        # the status code is taken from the error, and not from its message.
+        self.assertFalse(Files._isTransientError(Exception("Http Response from FileService API returned status code 500")))
+        try:
+            try:
+                raise Files._FileServiceError("Error", 502)
+            except Exception as e:
+                raise Exception("Error when uploading file.\n" + str(e))
+        except Exception as e:
+            self.assertTrue(Files._isTransientError(e))
+
+    def test_Files_copyLocalFile_fallback(self):
+        # some file systems copy nothing with copy_file_range or sendfile instead of failing, so the next method is used.
+        destinationPath = os.path.join(self.localDir, "copies", "copy.bin")
+        with mock.patch.object(os, "copy_file_range", lambda *args: 0, create=True):
+            self.assertEqual(Files._copyLocalFile(self.localFilePath, destinationPath), Files_LocalFileSize)
+            with open(destinationPath, "rb") as f:
+                self.assertEqual(self.content, f.read())
+            with mock.patch.object(os, "sendfile", lambda *args: 0, create=True):
+                self.assertEqual(Files._copyLocalFile(self.localFilePath, destinationPath), Files_LocalFileSize)
+                with open(destinationPath, "rb") as f:
+                    self.assertEqual(self.content, f.read())
+
+        # a copy that stops before the end of the file is an error, and leaves no file behind.
+        os.remove(destinationPath)
+        copyFileRange = lambda sourceFd, destinationFd, count: 0 if os.fstat(destinationFd).st_size > 0 else os.write(destinationFd, os.read(sourceFd, 1024))
+        with mock.patch.object(os, "copy_file_range", copyFileRange, create=True):
+            self.assertRaises(Exception, Files._copyLocalFile, self.localFilePath, destinationPath)
+        self.assertEqual(os.listdir(os.path.dirname(destinationPath)), [])
+
+
+if __name__ == "__main__":
+    unittest.main()
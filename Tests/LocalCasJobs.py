@@ -0,0 +1,183 @@
+#!/usr/bin/python
+"""
+Local stand-in for the CasJobs REST API, so that the query functions of SciServer.CasJobs can be tested without a
+SciServer account. Queries are not executed: each query is answered with the result registered for its SQL text,
+in JSON, CSV or (for the first table, using astropy) FITS format depending on the 'Accept' header.
+It implements only what those functions use:
+
+- POST contexts/<context>/query
+- POST contexts/<context>/Tables/<tableName> (the uploaded CSV rows are kept in 'tables')
+- GET  contexts/<context>/Tables (lists the tables in 'tables')
+- PUT  contexts/<context>/jobs (jobs are finished, or failed if set with 'setJobFailures', after the number of status requests set with 'setJobPolls')
+- GET  jobs/<jobId>
+
+Usage:
+
+    with LocalCasJobs() as casJobs:
+        casJobs.setResult("select 1 as foo", [{"TableName": "Table1", "Columns": ["foo"], "Data": [[1]]}])
+        CasJobs.executeQuery("select 1 as foo")
+"""
+from SciServer import Authentication, Config
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+from urllib.parse import urlsplit, unquote
+import csv
+import io
+import json
+import re
+import threading
+
+
+class LocalCasJobs:
+
+    def __init__(self):
+        self.server = None
+        self.results = {}
+        self.requests = []
+        self.tables = {}
+        self.failures = 0
+        self.jobs = {}
+        self.jobPolls = {}
+        self.jobFailures = {}
+        self.lock = threading.Lock()
+
+    def start(self):
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), _Handler)
+        self.server.daemon_threads = True
+        self.server.casJobs = self
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+
+        self._previousCasJobsRESTUri = Config.CasJobsRESTUri
+        self._previousToken = Authentication.token.value
+        Config.CasJobsRESTUri = self.url.rstrip("/")
+        Authentication.token.value = "local-token"
+        return self
+
+    def stop(self):
+        self.server.shutdown()
+        self.server.server_close()
+        Config.CasJobsRESTUri = self._previousCasJobsRESTUri
+        Authentication.token.value = self._previousToken
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *args):
+        self.stop()
+
+    @property
+    def url(self):
+        return "http://127.0.0.1:" + str(self.server.server_port) + "/"
+
+    def setResult(self, sql, tables):
+        """
+        Registers the result of a query, as a list of {"TableName": ..., "Columns": [...], "Data": [[...], ...]} tables.
+        """
+        self.results[sql] = tables
+
+    def setJobPolls(self, sql, polls):
+        """
+        Makes the jobs of a query be reported as started (Status 1) in the first 'polls' status requests, and finished (Status 5) afterwards.
+        """
+        self.jobPolls[sql] = polls
+
+    def setJobFailures(self, sql, count):
+        """
+        Makes the next 'count' jobs of a query finish with Status 4 (failed) instead of 5.
+        """
+        self.jobFailures[sql] = count
+
+    def failRequests(self, count):
+        """
+        Makes the next 'count' table uploads fail with status code 500.
+        """
+        self.failures = count
+
+
+class _Handler(BaseHTTPRequestHandler):
+
+    protocol_version = "HTTP/1.1"
+
+    def log_message(self, *args):
+        pass
+
+    def _send(self, statusCode, body=b"", contentType="text/plain"):
+        if isinstance(body, str):
+            body = body.encode()
+        self.send_response(statusCode)
+        self.send_header("Content-Type", contentType)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_PUT(self):
+        casJobs = self.server.casJobs
+        body = json.loads(self.rfile.read(int(self.headers.get("Content-Length", 0))).decode())
+        path = unquote(urlsplit(self.path).path)
+        casJobs.requests.append(("PUT", path, dict(self.headers), body))
+        match = re.match(r"^/contexts/([^/]+)/jobs$", path)
+        if not match:
+            return self._send(404, "Not found")
+        with casJobs.lock:
+            jobId = len(casJobs.jobs) + 1
+            failed = casJobs.jobFailures.get(body["Query"], 0) > 0
+            casJobs.jobFailures[body["Query"]] = casJobs.jobFailures.get(body["Query"], 0) - 1
+            casJobs.jobs[jobId] = {"JobID": jobId, "Query": body["Query"], "Target": match.group(1), "Status": 0, "polls": casJobs.jobPolls.get(body["Query"], 0), "finalStatus": 4 if failed else 5}
+        return self._send(200, str(jobId))
+
+    def do_GET(self):
+        casJobs = self.server.casJobs
+        path = unquote(urlsplit(self.path).path)
+        casJobs.requests.append(("GET", path, dict(self.headers), None))
+        if re.match(r"^/contexts/([^/]+)/Tables$", path):
+            with casJobs.lock:
+                tables = [{"Name": name, "Rows": len(rows) - 1, "Size": 0, "Date": 0} for (name, rows) in casJobs.tables.items()]
+            return self._send(200, json.dumps(tables), "application/json")
+        match = re.match(r"^/jobs/(\d+)$", path)
+        if not match or int(match.group(1)) not in casJobs.jobs:
+            return self._send(404, "Not found")
+        with casJobs.lock:
+            job = casJobs.jobs[int(match.group(1))]
+            job["Status"] = 1 if job["polls"] > 0 else job["finalStatus"]
+            job["polls"] -= 1
+            return self._send(200, json.dumps({"JobID": job["JobID"], "Query": job["Query"], "Target": job["Target"], "Status": job["Status"]}), "application/json")
+
+    def do_POST(self):
+        casJobs = self.server.casJobs
+        content = self.rfile.read(int(self.headers.get("Content-Length", 0))).decode()
+        path = unquote(urlsplit(self.path).path)
+        match = re.match(r"^/contexts/([^/]+)/Tables/([^/]+)$", path)
+        if match:
+            casJobs.requests.append(("POST", path, dict(self.headers), content))
+            with casJobs.lock:
+                if casJobs.failures > 0:
+                    casJobs.failures -= 1
+                    return self._send(500, "Injected failure")
+                rows = list(csv.reader(io.StringIO(content)))
+                if match.group(2) not in casJobs.tables:
+                    casJobs.tables[match.group(2)] = rows
+                elif rows[0] != casJobs.tables[match.group(2)][0]:
+                    return self._send(400, "Columns do not match")
+                else:
+                    casJobs.tables[match.group(2)].extend(rows[1:])
+            return self._send(200)
+        body = json.loads(content)
+        casJobs.requests.append(("POST", path, dict(self.headers), body))
+        match = re.match(r"^/contexts/([^/]+)/query$", path)
+        if not match:
+            return self._send(404, "Not found")
+        if body["Query"] not in casJobs.results:
+            return self._send(500, "Unknown query: " + body["Query"])
+        tables = casJobs.results[body["Query"]]
+        if self.headers.get("Accept") == "application/json+array":
+            return self._send(200, json.dumps({"Result": tables}), "application/json")
+        if self.headers.get("Accept") == "application/fits":
+            from astropy.table import Table
+            output = io.BytesIO()
+            Table(rows=[tuple(row) for row in tables[0]["Data"]], names=tables[0]["Columns"]).write(output, format="fits")
+            return self._send(200, output.getvalue(), "application/fits")
+        output = io.StringIO()
+        for table in tables:
+            writer = csv.writer(output, lineterminator="\n")
+            writer.writerow(table["Columns"])
+            writer.writerows(table["Data"])
+        return self._send(200, output.getvalue())
@@ -0,0 +1,230 @@
+#!/usr/bin/python
+"""
+Local stand-in for the RACM and FileService APIs, backed by a temporary directory, so that the transfer functions of
+SciServer.Files can be tested without a SciServer account. It implements only what those functions use:
+
+- GET  racm/storem/fileservices
+- GET  api/volumes/
+- GET  api/file/<path> (with support for 'Range' headers)
+- PUT  api/file/<path> (with support for 'Content-Range' headers, unless rangedUploads is set to False)
+- PUT  api/folder/<path>
+- GET  api/jsontree/<path>
+- DELETE api/data/<path>
+
+Usage:
+
+    with LocalFileService() as fileService:
+        Files.upload(fileService.name, "Storage/myUserName/persistent/file.txt", data="hello")
+"""
+from SciServer import Authentication, Config, Files
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+from urllib.parse import urlsplit, parse_qs, unquote
+from datetime import datetime, timezone
+import json
+import os
+import re
+import shutil
+import tempfile
+import threading
+
+
+class LocalFileService:
+
+    def __init__(self, name="LocalFileService", rootVolumeName="Storage", userName="myUserName", userVolumeName="persistent"):
+        self.name = name
+        self.identifier = name + "-identifier"
+        self.rootVolumeName = rootVolumeName
+        self.userName = userName
+        self.userVolumeName = userVolumeName
+        self.rootDir = None
+        self.server = None
+        self.requests = []
+        self.failures = {}
+        self.rangedUploads = True
+        self.lock = threading.Lock()
+
+    def start(self):
+        self.rootDir = tempfile.mkdtemp(prefix="sciserver-fileservice-")
+        os.makedirs(os.path.join(self.rootDir, self.rootVolumeName, self.userName, self.userVolumeName))
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), _Handler)
+        self.server.daemon_threads = True
+        self.server.fileService = self
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+
+        self._previousRacmApiURL = Config.RacmApiURL
+        self._previousToken = Authentication.token.value
+        Config.RacmApiURL = self.url + "racm"
+        Authentication.token.value = "local-token"
+        Files.invalidateFileServices()
+        return self
+
+    def stop(self):
+        self.server.shutdown()
+        self.server.server_close()
+        shutil.rmtree(self.rootDir, ignore_errors=True)
+        Config.RacmApiURL = self._previousRacmApiURL
+        Authentication.token.value = self._previousToken
+        Files.invalidateFileServices()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *args):
+        self.stop()
+
+    @property
+    def url(self):
+        return "http://127.0.0.1:" + str(self.server.server_port) + "/"
+
+    @property
+    def userVolumePath(self):
+        return "/".join([self.rootVolumeName, self.userName, self.userVolumeName])
+
+    def localPath(self, path):
+        return os.path.join(self.rootDir, *[p for p in path.split("/") if p != ""])
+
+    def failRequests(self, method, count, statusCode=500, after=0, api="file"):
+        """
+        Makes 'count' requests of the given HTTP method to api/<api> fail with 'statusCode', after letting the next 'after' ones succeed.
+        """
+        self.failures[method] = (after, count, statusCode, api)
+
+    def _description(self):
+        return {"name": self.name, "identifier": self.identifier, "apiEndpoint": self.url, "description": "Local FileService",
+                "rootVolumes": [{"name": self.rootVolumeName, "description": "",
+                                 "userVolumes": [{"name": self.userVolumeName, "owner": self.userName, "description": ""}]}],
+                "dataVolumes": []}
+
+
+def _lastModified(localPath):
+    return datetime.fromtimestamp(os.path.getmtime(localPath), tz=timezone.utc).strftime("%Y-%m-%dT%H:%M:%S.%fZ")
+
+
+def _jsonTree(localPath, level):
+    node = {"name": os.path.basename(localPath), "lastModified": _lastModified(localPath)}
+    folders = []
+    files = []
+    if level > 0:
+        for entry in sorted(os.listdir(localPath)):
+            entryPath = os.path.join(localPath, entry)
+            if os.path.isdir(entryPath):
+                folders.append(_jsonTree(entryPath, level - 1))
+            else:
+                files.append({"name": entry, "size": os.path.getsize(entryPath), "lastModified": _lastModified(entryPath)})
+    if folders:
+        node["folders"] = folders
+    if files:
+        node["files"] = files
+    return node
+
+
+class _Handler(BaseHTTPRequestHandler):
+
+    protocol_version = "HTTP/1.1"
+
+    def log_message(self, *args):
+        pass
+
+    def _send(self, statusCode, body=b"", headers=None):
+        if isinstance(body, str):
+            body = body.encode()
+        self.send_response(statusCode)
+        for key, value in (headers or {}).items():
+            self.send_header(key, value)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        if self.command != "HEAD":
+            self.wfile.write(body)
+
+    def _route(self):
+        fileService = self.server.fileService
+        parts = urlsplit(self.path)
+        query = parse_qs(parts.query)
+        fileService.requests.append((self.command, parts.path, dict(self.headers)))
+        match = re.match(r"^/api/(file|folder|jsontree|data)/(.*)$", unquote(parts.path))
+        if match:
+            return fileService, match.group(1), fileService.localPath(match.group(2)), query
+        return fileService, parts.path, None, query
+
+    def _failed(self, fileService, api):
+        with fileService.lock:
+            (after, count, statusCode, failedApi) = fileService.failures.get(self.command, (0, 0, 0, "file"))
+            if api != failedApi:
+                return False
+            if after > 0:
+                fileService.failures[self.command] = (after - 1, count, statusCode, failedApi)
+                return False
+            if count <= 0:
+                return False
+            fileService.failures[self.command] = (0, count - 1, statusCode, failedApi)
+        self._send(statusCode, "Injected failure")
+        return True
+
+    def do_GET(self):
+        (fileService, api, localPath, query) = self._route()
+        if api == "/racm/storem/fileservices":
+            return self._send(200, json.dumps([{"name": fileService.name, "identifier": fileService.identifier, "apiEndpoint": fileService.url}]))
+        if api == "/api/volumes/":
+            return self._send(200, json.dumps(fileService._description()))
+        if self._failed(fileService, api):
+            return
+        if api == "jsontree":
+            if not os.path.isdir(localPath):
+                return self._send(404, "Not found")
+            level = int(query.get("level", ["1"])[0])
+            return self._send(200, json.dumps({"root": _jsonTree(localPath, level)}))
+        if api == "file":
+            if not os.path.isfile(localPath):
+                return self._send(404, "Not found")
+            with open(localPath, "rb") as f:
+                content = f.read()
+            headers = {"ETag": '"' + str(len(content)) + "-" + str(os.path.getmtime(localPath)) + '"'}
+            match = re.match(r"^bytes=(\d+)-(\d*)$", self.headers.get("Range", ""))
+            if match:
+                start = int(match.group(1))
+                end = min(int(match.group(2)) if match.group(2) else len(content) - 1, len(content) - 1)
+                if start >= len(content):
+                    headers["Content-Range"] = "bytes */" + str(len(content))
+                    return self._send(416, "", headers)
+                headers["Content-Range"] = "bytes " + str(start) + "-" + str(end) + "/" + str(len(content))
+                return self._send(206, content[start:end + 1], headers)
+            return self._send(200, content, headers)
+        self._send(404, "Not found")
+
+    def do_PUT(self):
+        (fileService, api, localPath, query) = self._route()
+        body = self.rfile.read(int(self.headers.get("Content-Length", 0)))
+        if self._failed(fileService, api):
+            return
+        quiet = query.get("quiet", ["True"])[0] == "True"
+        if api == "folder":
+            os.makedirs(localPath, exist_ok=True)
+            return self._send(200)
+        if api == "file":
+            match = re.match(r"^bytes (\d+)-(\d+)/(\d+)$", self.headers.get("Content-Range", "")) if fileService.rangedUploads else None
+            start = int(match.group(1)) if match else 0
+            if start == 0 and not quiet and os.path.exists(localPath):
+                return self._send(409, "File already exists")
+            os.makedirs(os.path.dirname(localPath), exist_ok=True)
+            if match:
+                with open(localPath, "r+b" if os.path.exists(localPath) else "w+b") as f:
+                    f.truncate(int(match.group(3)))
+                    f.seek(start)
+                    f.write(body)
+            else:
+                with open(localPath, "wb") as f:
+                    f.write(body)
+            return self._send(200)
+        self._send(404, "Not found")
+
+    def do_DELETE(self):
+        (fileService, api, localPath, query) = self._route()
+        if api == "data":
+            if os.path.isdir(localPath):
+                shutil.rmtree(localPath)
+            elif os.path.exists(localPath):
+                os.remove(localPath)
+            elif query.get("quiet", ["True"])[0] != "True":
+                return self._send(404, "Not found")
+            return self._send(200)
+        self._send(404, "Not found")
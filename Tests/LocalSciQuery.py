@@ -0,0 +1,103 @@
+#!/usr/bin/python
+"""
+Local stand-in for the SciQuery API, together with the Authentication and RACM endpoints used when creating a SciQuery
+object, so that the RDB compute domain functions of SciServer.SciQuery can be tested without a SciServer account.
+It implements only what those functions use:
+
+- GET  sciquery/api/info/domain (returns the domains in 'domains')
+- GET  auth/<token> (returns a Keystone user named 'userName')
+- GET  racm/storem/fileservices (returns no file services)
+
+Usage:
+
+    with LocalSciQuery() as sciQuery:
+        sciQuery.domains = [{"id": 1, "racmId": 11, "name": "Domain1", "description": "", "databases": {}}]
+        SciQuery.SciQuery.get_rdb_compute_domains()
+"""
+from SciServer import Authentication, Config, Files, SciQuery
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+from urllib.parse import urlsplit, unquote
+import json
+import re
+import threading
+
+
+class LocalSciQuery:
+
+    def __init__(self, userName="myUserName"):
+        self.server = None
+        self.userName = userName
+        self.domains = []
+        self.requests = []
+        self.lock = threading.Lock()
+
+    def start(self):
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), _Handler)
+        self.server.daemon_threads = True
+        self.server.sciQuery = self
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+
+        self._previousURLs = (Config.SciqueryURL, Config.AuthenticationURL, Config.RacmApiURL)
+        self._previousToken = Authentication.token.value
+        (Config.SciqueryURL, Config.AuthenticationURL, Config.RacmApiURL) = (self.url + "sciquery", self.url + "auth", self.url + "racm")
+        Authentication.token.value = "local-token"
+        Authentication.keystoneUser.token = None
+        SciQuery._invalidate_rdb_compute_domains()
+        Files.invalidateFileServices()
+        return self
+
+    def stop(self):
+        self.server.shutdown()
+        self.server.server_close()
+        (Config.SciqueryURL, Config.AuthenticationURL, Config.RacmApiURL) = self._previousURLs
+        Authentication.token.value = self._previousToken
+        Authentication.keystoneUser.token = None
+        SciQuery._invalidate_rdb_compute_domains()
+        Files.invalidateFileServices()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *args):
+        self.stop()
+
+    @property
+    def url(self):
+        return "http://127.0.0.1:" + str(self.server.server_port) + "/"
+
+    def countRequests(self, path):
+        """
+        Returns the number of requests received for a path, such as "/sciquery/api/info/domain".
+        """
+        with self.lock:
+            return len([requestPath for requestPath in self.requests if requestPath == path])
+
+
+class _Handler(BaseHTTPRequestHandler):
+
+    protocol_version = "HTTP/1.1"
+
+    def log_message(self, *args):
+        pass
+
+    def _send(self, statusCode, body=b"", contentType="application/json"):
+        if isinstance(body, str):
+            body = body.encode()
+        self.send_response(statusCode)
+        self.send_header("Content-Type", contentType)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_GET(self):
+        sciQuery = self.server.sciQuery
+        path = unquote(urlsplit(self.path).path)
+        with sciQuery.lock:
+            sciQuery.requests.append(path)
+        if path == "/sciquery/api/info/domain":
+            return self._send(200, json.dumps(sciQuery.domains))
+        if re.match(r"^/auth/[^/]+$", path):
+            return self._send(200, json.dumps({"token": {"user": {"name": sciQuery.userName, "id": sciQuery.userName + "-id"}}}))
+        if path == "/racm/storem/fileservices":
+            return self._send(200, json.dumps([]))
+        self._send(404, "Not found", "text/plain")
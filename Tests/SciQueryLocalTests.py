@@ -0,0 +1,78 @@
+#!/usr/bin/python
+from SciServer import Config, SciQuery
+try:
+    import unittest2 as unittest
+except ImportError:
+    import unittest
+from LocalSciQuery import LocalSciQuery
+
+# Runs the RDB compute domain functions of SciServer.SciQuery against a local stand-in SciQuery API, so no SciServer account is needed.
+
+SciQuery_Domains = [{"id": 1, "racmId": 11, "name": "Domain1", "description": "First domain",
+                     "databases": {"mydb": {"id": 5, "racmId": 55, "name": "mydb:myUserName", "description": "", "vendor": "sqlserver", "schemas": ["dbo"]},
+                                   "dr16": {"id": 6, "racmId": 66, "name": "DR16", "description": "", "vendor": "sqlserver", "schemas": ["dbo"]}}},
+                    {"id": 2, "racmId": 22, "name": "Domain2", "description": "Second domain",
+                     "databases": {"gaia": {"id": 7, "racmId": 77, "name": "Gaia", "description": "", "vendor": "postgres", "schemas": ["public"]}}}]
+SciQuery_DomainPath = "/sciquery/api/info/domain"
+
+
+class TestSciQueryLocal(unittest.TestCase):
+
+    def setUp(self):
+        self.previousTTL = Config.RDBComputeDomainRegistryTTL
+        Config.RDBComputeDomainRegistryTTL = 300
+        self.sciQuery = LocalSciQuery().start()
+        self.sciQuery.domains = SciQuery_Domains
+
+    def tearDown(self):
+        self.sciQuery.stop()
+        Config.RDBComputeDomainRegistryTTL = self.previousTTL
+
+    # *******************************************************************************************************
+    # SciQuery section
+
+    def test_SciQuery_get_rdb_compute_domains_registryTTL(self):
+        domains = SciQuery.SciQuery.get_rdb_compute_domains()
+        self.assertEqual([domain.name for domain in domains], ["Domain1", "Domain2"])
+        self.assertEqual(SciQuery.SciQuery.get_rdb_compute_domains("dict"), SciQuery_Domains)
+        self.assertEqual(self.sciQuery.countRequests(SciQuery_DomainPath), 1)
+
+        Config.RDBComputeDomainRegistryTTL = 0
+        SciQuery.SciQuery.get_rdb_compute_domains()
+        SciQuery.SciQuery.get_rdb_compute_domains()
+        self.assertEqual(self.sciQuery.countRequests(SciQuery_DomainPath), 3)
+
+    def test_SciQuery_RDBComputeDomain_lookups(self):
+        self.assertEqual(SciQuery.RDBComputeDomain("Domain2").id, 2)
+        self.assertEqual(SciQuery.RDBComputeDomain(1).name, "Domain1")
+        self.assertEqual(SciQuery.RDBComputeDomain({"id": 2}).name, "Domain2")
+        self.assertEqual(SciQuery.RDBComputeDomain({"racmId": 11}).get_database_names(), ["mydb:myUserName", "DR16"])
+        self.assertRaises(NameError, SciQuery.RDBComputeDomain, "Domain3")
+        self.assertRaises(NameError, SciQuery.RDBComputeDomain, {"racmId": 33})
+        self.assertEqual(self.sciQuery.countRequests(SciQuery_DomainPath), 1)
+
+    def test_SciQuery_get_rdb_compute_domains_copies(self):
+        # changes to the returned domains do not alter the cached ones.
+        SciQuery.SciQuery.get_rdb_compute_domains()[0].databases[0].schemas.append("other")
+        SciQuery.RDBComputeDomain("Domain1").databases[0].schemas.append("other")
+        SciQuery.SciQuery.get_rdb_compute_domains("dict")[0]["name"] = "Changed"
+        self.assertEqual(SciQuery.SciQuery.get_rdb_compute_domains("dict"), SciQuery_Domains)
+        self.assertEqual(SciQuery.SciQuery.get_rdb_compute_domains()[0].databases[0].schemas, ["dbo"])
+
+    def test_SciQuery_refresh(self):
+        sciQuery = SciQuery.SciQuery(verbose=False)
+        self.assertEqual(sciQuery.rdb_compute_domain.name, "Domain1")
+        self.assertEqual(sciQuery.database.name, "mydb:myUserName")
+        self.assertEqual(self.sciQuery.countRequests(SciQuery_DomainPath), 1)
+
+        # the domains are fetched again after a refresh, instead of being taken from the cache.
+        self.sciQuery.domains = SciQuery_Domains[1:]
+        SciQuery.SciQuery(verbose=False)
+        self.assertEqual(self.sciQuery.countRequests(SciQuery_DomainPath), 1)
+        sciQuery.refresh()
+        self.assertEqual(self.sciQuery.countRequests(SciQuery_DomainPath), 2)
+        self.assertEqual([domain.name for domain in sciQuery.rdb_compute_domains], ["Domain2"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -5,6 +5,7 @@ import os;
 import pandas;
 import sys;
 import json;
+import asyncio;
 from io import StringIO
 from io import BytesIO
 import skimage
@@ -36,6 +37,7 @@ CasJobs_TestQuery = "select 4 as Column1, 5 as Column2 "
 CasJobs_TestTableCSV = u"Column1,Column2\n4,5\n"
 CasJobs_TestFitsFile = "SciScriptTestFile.fits"
 CasJobs_TestCSVFile = "SciScriptTestFile.csv"
+CasJobs_TestParquetFile = "SciScriptTestFile.parquet"
 
 SciDrive_Directory = "/SciScriptPython"
 SciDrive_FileName = "TestFile.csv"
@@ -174,6 +176,17 @@ class TestCasJobs(unittest.TestCase):
         df = CasJobs.executeQuery(sql=CasJobs_TestQuery, context=CasJobs_TestDatabase, format="pandas")
         self.assertEqual(CasJobs_TestTableCSV, df.to_csv(index=False))
 
+    def test_CasJobs_iterQuery(self):
+        dfs = list(CasJobs.iterQuery(sql=CasJobs_TestQuery, context=CasJobs_TestDatabase, chunksize=1))
+        self.assertEqual(CasJobs_TestTableCSV, dfs[0].to_csv(index=False))
+
+    def test_CasJobs_executeQueryAsync(self):
+        async def run():
+            return await asyncio.gather(*[CasJobs.executeQueryAsync(sql=CasJobs_TestQuery, context=CasJobs_TestDatabase, format="pandas") for i in range(3)])
+        dfs = asyncio.run(run())
+        for df in dfs:
+            self.assertEqual(CasJobs_TestTableCSV, df.to_csv(index=False))
+
     def test_CasJobs_submitJob(self):
         jobId = CasJobs.submitJob(sql=CasJobs_TestQuery + " into MyDB." + CasJobs_TestTableName1, context=CasJobs_TestDatabase)
         jobDescription = CasJobs.waitForJob(jobId=jobId, verbose=True)
@@ -195,6 +208,13 @@ class TestCasJobs(unittest.TestCase):
         jobDescription = CasJobs.waitForJob(jobId=jobId, verbose=True)
         self.assertGreaterEqual(jobDescription["Status"], 3)
 
+    def test_CasJobs_submitJobs_waitForJobs(self):
+        jobIds = CasJobs.submitJobs([CasJobs_TestQuery] * 3, context=CasJobs_TestDatabase)
+        jobDescriptions = list(CasJobs.waitForJobs(jobIds, verbose=True))
+        self.assertEqual(sorted(jobDescription["JobID"] for jobDescription in jobDescriptions), sorted(jobIds))
+        for jobDescription in jobDescriptions:
+            self.assertGreaterEqual(jobDescription["Status"], 3)
+
     def test_CasJobs_writeFitsFileFromQuery(self):
         #CasJobs.getFitsFileFromQuery
         try:
@@ -207,6 +227,17 @@ class TestCasJobs(unittest.TestCase):
             except:
                 pass;
 
+    def test_CasJobs_writeParquetFileFromQuery(self):
+        try:
+            result = CasJobs.writeParquetFileFromQuery(fileName=CasJobs_TestParquetFile, queryString=CasJobs_TestQuery, context=CasJobs_TestDatabase)
+            self.assertEqual(result, True)
+            self.assertEqual(pandas.read_parquet(CasJobs_TestParquetFile).to_csv(index=False), CasJobs_TestTableCSV)
+        finally:
+            try:
+                os.remove(CasJobs_TestParquetFile)
+            except:
+                pass;
+
     def test_CasJobs_getPandasDataFrameFromQuery(self):
         #CasJobs.getPandasDataFrameFromQuery
         df = CasJobs.getPandasDataFrameFromQuery(queryString=CasJobs_TestQuery, context=CasJobs_TestDatabase)
@@ -215,8 +246,9 @@ class TestCasJobs(unittest.TestCase):
     def test_CasJobs_getNumpyArrayFromQuery(self):
         #CasJobs.getNumpyArrayFromQuery
         array = CasJobs.getNumpyArrayFromQuery(queryString=CasJobs_TestQuery, context=CasJobs_TestDatabase)
-        newArray = pandas.read_csv(StringIO(CasJobs_TestTableCSV), index_col=None).as_matrix()
-        self.assertEqual(array.all(), newArray.all())
+        newArray = pandas.read_csv(StringIO(CasJobs_TestTableCSV), index_col=None).to_records(index=False)
+        self.assertEqual(array.dtype.names, newArray.dtype.names)
+        self.assertEqual(array.tolist(), newArray.tolist())
 
     def test_CasJobs_uploadPandasDataFrameToTable_uploadCSVDataToTable(self):
         try:
@@ -257,6 +289,10 @@ class TestSkyServer(unittest.TestCase):
         df = SkyServer.sqlSearch(sql=SkyServer_TestQuery, dataRelease=SkyServer_DataRelease)
         self.assertEqual(SkyServer_QueryResultCSV, df.to_csv(index=False))
 
+    def test_SkyServer_sqlSearchAsync(self):
+        df = asyncio.run(SkyServer.sqlSearchAsync(sql=SkyServer_TestQuery, dataRelease=SkyServer_DataRelease))
+        self.assertEqual(SkyServer_QueryResultCSV, df.to_csv(index=False))
+
     def test_SkyServer_getJpegImgCutout(self):
         #image cutout
         img = SkyServer.getJpegImgCutout(ra=197.614455642896, dec=18.438168853724, width=512, height=512, scale=0.4, dataRelease=SkyServer_DataRelease,opt="OG",query="SELECT TOP 100 p.objID, p.ra, p.dec, p.r FROM fGetObjFromRectEq(197.6,18.4,197.7,18.5) n, PhotoPrimary p WHERE n.objID=p.objID")
@@ -466,6 +502,14 @@ class TestFileService(unittest.TestCase):
         fileService = Files.getFileServiceFromName(Files_FileServiceName);
         self.assertTrue(fileService.get('name') == Files_FileServiceName);
 
+    def test_Files_invalidateFileServices(self):
+        fileService = Files.getFileServiceFromName(Files_FileServiceName);
+        self.assertTrue(Files.getFileServiceFromName(Files_FileServiceName) is fileService);
+        Files.invalidateFileServices();
+        fileService2 = Files.getFileServiceFromName(Files_FileServiceName);
+        self.assertTrue(fileService2 is not fileService);
+        self.assertTrue(fileService2.get('name') == Files_FileServiceName);
+
     def test_Files_getRootVolumesInfo(self):
         fileService = Files.getFileServiceFromName(Files_FileServiceName);
         rootVolumes = Files.getRootVolumesInfo(fileService)
@@ -3,11 +3,10 @@ __author__ = 'gerard,mtaghiza'
 
 import json
 import sys
-import requests
 import os.path
 import warnings
 import getpass
-from SciServer import Config
+from SciServer import Config, _Http
 
 
 
@@ -57,7 +56,7 @@ def getKeystoneUserWithToken(token):
 
         loginURL = loginURL + token + "?TaskName=" + taskName;
 
-        getResponse = requests.get(loginURL)
+        getResponse = _Http.get(loginURL)
         if getResponse.status_code != 200:
             raise Exception("Error when getting the keystone user with token " + str(token) +".\nHttp Response from the Authentication API returned status code " + str(getResponse.status_code) + ":\n" + getResponse.content.decode());
 
@@ -111,7 +110,7 @@ def login(UserName=None, Password=None):
 
     headers={'Content-Type': "application/json"}
 
-    postResponse = requests.post(loginURL,data=data,headers=headers)
+    postResponse = _Http.post(loginURL,data=data,headers=headers)
     if postResponse.status_code != 200:
         raise Exception("Error when logging in. Http Response from the Authentication API returned status code " + str(postResponse.status_code) + ":\n" + postResponse.content.decode());
 
@@ -1,24 +1,50 @@
+import asyncio
+import contextvars
+import hashlib
 import json
+import os
+import threading
 import time
 
 import sys
 from io import StringIO, BytesIO
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+from concurrent.futures import as_completed
+from operator import itemgetter
 
-import requests as requests
+import numpy
 import pandas
 
-from SciServer import Authentication, Config
+from SciServer import Authentication, Config, _Http, _JsonStream, _Poller, _QueryCache
 
 
 class Task:
     """
     The class TaskName stores the name of the task that executes the API call.
+    The name is kept in a context variable, so that each thread and each asyncio task sees its own value, and concurrent calls do not mix up their task names.
     """
-    name = None
+    def __init__(self):
+        self._name = contextvars.ContextVar("SciServer.CasJobs.task.name", default=None)
+
+    @property
+    def name(self):
+        return self._name.get()
+
+    @name.setter
+    def name(self, name):
+        self._name.set(name)
 
 
 task = Task();
 
+# size in bytes of the chunks in which streamed query results are read.
+_RESPONSE_CHUNK_SIZE = 1024 * 1024
+_EXTRACT_ROW_ID = "extractRowId" # column numbering the rows of the staging tables of CasJobs.extract
+_PROBE_ROWS = 100 # rows from which the column types of a query result are taken
+
+_metadataCache = {}
+_metadataCacheLock = threading.RLock()
+
 
 def getSchemaName():
     """
@@ -28,11 +54,15 @@ def getSchemaName():
     :raises: Throws an exception if the user is not logged into SciServer (use Authentication.login for that purpose). Throws an exception if the HTTP request to the CasJobs API returns an error.
     :example: wsid = CasJobs.getSchemaName()
 
-    .. seealso:: CasJobs.getTables.
+    .. seealso:: CasJobs.getTables, CasJobs.clearMetadataCache.
     """
     token = Authentication.getToken()
     if token is not None and token != "":
 
+        schemaName = _getCachedMetadata(token, "schemaName")
+        if schemaName is not None:
+            return schemaName
+
         keystoneUserId = Authentication.getKeystoneUserWithToken(token).id
 
         taskName = ""
@@ -43,12 +73,14 @@ def getSchemaName():
 
         usersUrl = Config.CasJobsRESTUri + "/users/" + keystoneUserId + "?TaskName=" + taskName
         headers={'X-Auth-Token': token,'Content-Type': 'application/json'}
-        getResponse = requests.get(usersUrl,headers=headers)
+        getResponse = _Http.get(usersUrl,headers=headers)
         if getResponse.status_code != 200:
             raise Exception("Error when getting schema name. Http Response from CasJobs API returned status code " + str(getResponse.status_code) + ":\n" + getResponse.content.decode());
 
         jsonResponse = json.loads(getResponse.content.decode())
-        return "wsid_" + str(jsonResponse["WebServicesId"])
+        schemaName = "wsid_" + str(jsonResponse["WebServicesId"])
+        _setCachedMetadata(token, "schemaName", schemaName)
+        return schemaName
     else:
         raise Exception("User token is not defined. First log into SciServer.")
 
@@ -62,12 +94,16 @@ def getTables(context="MyDB"):
     :raises: Throws an exception if the user is not logged into SciServer (use Authentication.login for that purpose). Throws an exception if the HTTP request to the CasJobs API returns an error.
     :example: tables = CasJobs.getTables("MyDB")
 
-    .. seealso:: CasJobs.getSchemaName
+    .. seealso:: CasJobs.getSchemaName, CasJobs.clearMetadataCache
     """
 
     token = Authentication.getToken()
     if token is not None and token != "":
 
+        tables = _getCachedMetadata(token, "tables/" + context.lower())
+        if tables is not None:
+            return [dict(table) for table in tables]
+
         taskName = "";
         if Config.isSciServerComputeEnvironment():
             taskName = "Compute.SciScript-Python.CasJobs.getTables"
@@ -78,21 +114,113 @@ def getTables(context="MyDB"):
 
         headers={'X-Auth-Token': token,'Content-Type': 'application/json'}
 
-        getResponse = requests.get(TablesUrl,headers=headers)
+        getResponse = _Http.get(TablesUrl,headers=headers)
 
         if getResponse.status_code != 200:
             raise Exception("Error when getting table description from database context " + str(context) + ".\nHttp Response from CasJobs API returned status code " + str(getResponse.status_code) + ":\n" + getResponse.content.decode());
 
         jsonResponse = json.loads(getResponse.content.decode())
+        _setCachedMetadata(token, "tables/" + context.lower(), [dict(table) for table in jsonResponse])
 
         return jsonResponse
     else:
         raise Exception("User token is not defined. First log into SciServer.")
 
 
-def executeQuery(sql, context="MyDB", format="pandas"):
+def clearMetadataCache(context=None):
+    """
+    Clears the schema name and table lists cached for the logged-in user by CasJobs.getSchemaName and CasJobs.getTables, both in memory and under Config.CacheDir, so that they are fetched again from CasJobs. This is done automatically for a database context after uploading a table, submitting a job or executing a query that writes into it with the functions in this module.
+
+    :param context: database context (string) whose cached table list is cleared. If set to None, then all the cached metadata of the user is cleared.
+    :example: CasJobs.clearMetadataCache("MyDB");
+
+    .. seealso:: CasJobs.getTables, CasJobs.getSchemaName, Config.CasJobsMetadataTTL
+    """
+    token = Authentication.getToken()
+    if token is not None and token != "":
+        _invalidateMetadata(token, context)
+
+
+def _getMetadataFilePath(token):
+    key = json.dumps([Config.CasJobsRESTUri, token])
+    return os.path.join(Config.CacheDir, "casjobs", hashlib.sha256(key.encode()).hexdigest() + ".json")
+
+
+def _getMetadataFileVersion(filePath):
+    try:
+        stat = os.stat(filePath)
+        return (stat.st_mtime_ns, stat.st_size)
+    except OSError:
+        return None
+
+
+def _getMetadata(token):
+    # the metadata of a token is read again from disk whenever the file changed, e.g., after another process cleared it.
+    filePath = _getMetadataFilePath(token)
+    version = _getMetadataFileVersion(filePath)
+    cached = _metadataCache.get(token)
+    if cached is None or (version is not None and cached[0] != version):
+        cached = (version, _Http.readStateFile(filePath) or {})
+        _metadataCache[token] = cached
+    return cached[1]
+
+
+def _getCachedMetadata(token, key):
+    """
+    Returns the value cached for a user token under key ("schemaName", or "tables/<context>"), or None if it is not cached or is older than Config.CasJobsMetadataTTL seconds.
+    """
+    if Config.CasJobsMetadataTTL <= 0:
+        return None
+    with _metadataCacheLock:
+        entry = _getMetadata(token).get(key)
+    if entry is not None and time.time() - entry["time"] < Config.CasJobsMetadataTTL:
+        return entry["value"]
+    return None
+
+
+def _setCachedMetadata(token, key, value):
+    if Config.CasJobsMetadataTTL <= 0:
+        return
+    with _metadataCacheLock:
+        metadata = _getMetadata(token)
+        metadata[key] = {"value": value, "time": time.time()}
+        _writeMetadata(token, metadata)
+
+
+def _invalidateMetadata(token, context=None):
+    with _metadataCacheLock:
+        metadata = _getMetadata(token)
+        if context is None:
+            metadata.clear()
+        elif metadata.pop("tables/" + context.lower(), None) is None:
+            return
+        _writeMetadata(token, metadata)
+
+
+def _writeMetadata(token, metadata):
+    stateFilePath = _getMetadataFilePath(token)
+    try:
+        os.makedirs(os.path.dirname(stateFilePath), exist_ok=True)
+        _Http.writeStateFile(stateFilePath, metadata)
+    except OSError:
+        pass # the metadata is still cached in memory
+    _metadataCache[token] = (_getMetadataFileVersion(stateFilePath), metadata)
+
+
+def _invalidateContext(context):
+    """
+    Removes the cached query results and table list of a database context, after the functions in this module write into it.
+    """
+    _QueryCache.invalidate(context)
+    token = Authentication.getToken()
+    if token is not None and token != "":
+        _invalidateMetadata(token, context)
+
+
+def executeQuery(sql, context="MyDB", format="pandas", chunksize=None, dtype=None, downcast=False):
     """
     Executes a synchronous SQL query in a CasJobs database context.
+    If Config.QueryCacheEnabled is set to True, then the results of read-only queries (without 'chunksize', 'dtype' or 'downcast') run outside of the contexts in Config.QueryCacheExcludedContexts are cached in memory and under Config.CacheDir, and returned again without contacting CasJobs while they are not older than Config.QueryCacheTTL seconds.
 
     :param sql: sql query (string)
     :param context: database context (string)
@@ -105,23 +233,203 @@ def executeQuery(sql, context="MyDB", format="pandas"):
     \t\t'StringIO': an object of type io.StringIO, which has the .read() method and wraps a csv string that can be passed into pandas.read_csv for example.\n
     \t\t'fits': an object of type io.BytesIO, which has the .read() method and wraps the result in fits format.\n
     \t\t'BytesIO': an object of type io.BytesIO, which has the .read() method and wraps the result in fits format.\n
+    \t\t'arrow': pyarrow.Table (https://arrow.apache.org/docs/python). Requires the 'pyarrow' package.\n
+    \t\t'parquet': an object of type io.BytesIO, which has the .read() method and wraps the result in Apache Parquet format. Requires the 'pyarrow' package.\n
+    :param chunksize: if not set to None, then an iterator of pandas.DataFrame objects with at most this number of rows (integer) each is returned instead of the whole result, as in CasJobs.iterQuery. Only valid with format="pandas".
+    :param dtype: if not set to None, then the pandas.DataFrame columns are converted into this type, given either as a single numpy.dtype (or type name string) for all columns, or as a dictionary of column name to dtype. Only valid with format="pandas".
+    :param downcast: if set to True, then integer columns are converted into the smallest integer type that can hold their values, and float columns into 'float32' if that loses no precision, so that the result takes less memory. Only valid with format="pandas".
     :return: the query result table, in a format defined by the 'format' input parameter.
     :raises: Throws an exception if the user is not logged into SciServer (use Authentication.login for that purpose). Throws an exception if the HTTP request to the CasJobs API returns an error. Throws an exception if parameter 'format' is not correctly specified.
     :example: table = CasJobs.executeQuery(sql="select 1 as foo, 2 as bar",format="pandas", context="MyDB")
 
-    .. seealso:: CasJobs.submitJob, CasJobs.getTables, SkyServer.sqlSearch
+    .. seealso:: CasJobs.iterQuery, CasJobs.submitJob, CasJobs.getTables, CasJobs.clearQueryCache, SkyServer.sqlSearch
     """
+    if chunksize is not None:
+        if format != "pandas":
+            raise Exception("Error when executing query. Parameter 'chunksize' can only be used with format=\"pandas\".")
+        return _iterDataFrames(_postQuery(sql, context, format, "executeQuery"), chunksize, dtype, downcast)
+
+    cacheable = dtype is None and not downcast and _QueryCache.isCacheable(sql, context)
+    if cacheable:
+        value = _QueryCache.get(sql, context, format)
+        if value is not None:
+            task.name = None
+            return _getQueryResultFromValue(value, format, copy=True)
+
+    postResponse = _postQuery(sql, context, format, "executeQuery")
+
+    if format in ("pandas", "arrow", "parquet"):
+        # the JSON body is parsed while it is being received, instead of after holding all of it in memory.
+        try:
+            if format == "pandas":
+                dataFrames = _getDataFramesFromJson(postResponse.iter_content(chunk_size=_RESPONSE_CHUNK_SIZE), dtype, downcast)
+                value = dataFrames if isinstance(dataFrames, list) else [dataFrames]
+            else:
+                value = _getArrowTables(postResponse.iter_content(chunk_size=_RESPONSE_CHUNK_SIZE))
+        finally:
+            postResponse.close()
+    else:
+        value = postResponse.content
 
-    if (format == "pandas") or (format =="json") or (format =="dict"):
-        acceptHeader="application/json+array"
-    elif (format == "csv") or (format == "readable") or (format == "StringIO"):
-        acceptHeader = "text/plain"
-    elif format == "fits":
-        acceptHeader = "application/fits"
-    elif format == "BytesIO":
-        acceptHeader = "application/fits" # defined later using specific serialization
+    if cacheable:
+        _QueryCache.put(sql, context, format, value)
+    elif not _QueryCache.isReadOnly(sql):
+        _invalidateContextsForQuery(sql, context)
+
+    # cached DataFrames are copied, so that changing the returned ones does not change the cache.
+    return _getQueryResultFromValue(value, format, copy=cacheable)
+
+
+def _getQueryResultFromValue(value, format, copy=False):
+    """
+    Returns the query result in the requested format, given either the bytes of the response, or a list with the pandas.DataFrame (format="pandas") or pyarrow.Table (format="arrow" or "parquet") of each result table.
+    """
+    if isinstance(value, bytes):
+        return _getQueryResult(value, format)
+    if format == "pandas":
+        results = [dataFrame.copy() for dataFrame in value] if copy else value
     else:
-        raise Exception("Error when executing query. Illegal format parameter specification: " + str(format));
+        results = _getArrowResults(value, format)
+
+    if len(results) > 1:
+        return results
+    else:
+        return results[0]
+
+
+def clearQueryCache(context=None):
+    """
+    Clears the query results cached in memory and under Config.CacheDir when Config.QueryCacheEnabled is set to True, so that the queries are executed again by CasJobs. This is done automatically for a database context after uploading a table or submitting a job that writes into it with the functions in this module.
+
+    :param context: database context (string) whose cached query results are cleared. If set to None, then the cached results of all contexts are cleared.
+    :example: CasJobs.clearQueryCache("DR16");
+
+    .. seealso:: CasJobs.executeQuery, Config.QueryCacheEnabled
+    """
+    _QueryCache.invalidate(context)
+
+
+def iterQuery(sql, context="MyDB", chunksize=None, dtype=None, downcast=False):
+    """
+    Executes a synchronous SQL query in a CasJobs database context, and returns an iterator over the result as pandas.DataFrame chunks, which are parsed while the result is being received. This way, results that do not fit in memory can be processed (e.g., aggregated) chunk by chunk.
+    Each chunk has the index (integer) and name (string) of the result table it belongs to in its 'attrs' dictionary, under the keys 'tableIndex' and 'tableName'. At least one (possibly empty) chunk is returned per table.
+
+    :param sql: sql query (string)
+    :param context: database context (string)
+    :param chunksize: maximum number of rows (integer) in each pandas.DataFrame chunk. If set to None, then Config.QueryBatchSize is taken as the value.
+    :param dtype: if not set to None, then the columns are converted into this type, given either as a single numpy.dtype (or type name string) for all columns, or as a dictionary of column name to dtype.
+    :param downcast: if set to True, then integer and float columns are converted into smaller types when that loses no information, as in CasJobs.executeQuery. Each chunk is downcast on its own, so the column types might differ between chunks; use 'dtype' for fixed types.
+    :return: an iterator of pandas.DataFrame objects.
+    :raises: Throws an exception if the user is not logged into SciServer (use Authentication.login for that purpose). Throws an exception if the HTTP request to the CasJobs API returns an error.
+    :example: total = sum(chunk.r.sum() for chunk in CasJobs.iterQuery("select top 1000000 r from PhotoObj", context="DR14", chunksize=100000))
+
+    .. seealso:: CasJobs.executeQuery, CasJobs.submitJob
+    """
+    if chunksize is None:
+        chunksize = Config.QueryBatchSize
+    return _iterDataFrames(_postQuery(sql, context, "pandas", "iterQuery"), chunksize, dtype, downcast)
+
+
+def executeQueryPartitioned(sql, context, partitionColumn, numParts=None, numThreads=None, format="pandas", bounds=None, dtype=None, downcast=False):
+    """
+    Executes a synchronous SQL query in a CasJobs database context as several smaller queries, each returning the rows with values of a numeric column (such as objID or htmID) within a different range, which are executed concurrently and whose results are concatenated.
+    This way, a large query can stay within the row and time limits of each synchronous query, while being executed by several server workers at once.
+    The query is used as a subquery, so it must return a single table, the partition column must be one of its output columns, and it cannot have an 'order by' clause without 'top'.
+    The ranges have the same width, so the number of rows in each partition depends on the distribution of the column values. Rows where the column is NULL are part of the first partition.
+
+    :param sql: sql query (string)
+    :param context: database context (string)
+    :param partitionColumn: name (string) of the numeric output column of the query used to split it into ranges.
+    :param numParts: number (integer) of ranges into which the query is split. If not set, then 'numThreads' is taken as the value.
+    :param numThreads: maximum number (integer) of ranges queried at the same time. If not set, then Config.QueryMaxWorkers is used.
+    :param format: parameter (string) that specifies the return type: 'pandas' for a pandas.DataFrame, or 'arrow' for a pyarrow.Table (which requires the 'pyarrow' package).
+    :param bounds: minimum and maximum values (tuple of two numbers) of the partition column. If not set, then they are found with an additional query.
+    :param dtype: if not set to None, then the pandas.DataFrame columns are converted into this type, as in CasJobs.executeQuery. Only valid with format="pandas".
+    :param downcast: if set to True, then integer and float columns are converted into smaller types when that loses no information, as in CasJobs.executeQuery. Only valid with format="pandas".
+    :return: the query result table, in a format defined by the 'format' input parameter.
+    :raises: Throws an exception if the user is not logged into SciServer (use Authentication.login for that purpose). Throws an exception if the HTTP request to the CasJobs API returns an error for any of the ranges. Throws an exception if the partition column is not numeric, or if parameter 'format' is not correctly specified.
+    :example: df = CasJobs.executeQueryPartitioned("select objID, ra, dec from PhotoObj where r < 18", "DR16", "objID", numParts=16, numThreads=4)
+
+    .. seealso:: CasJobs.executeQuery, CasJobs.iterQuery, CasJobs.submitJobs
+    """
+    if format not in ("pandas", "arrow"):
+        raise Exception("Error when executing partitioned query. Illegal format parameter specification: " + str(format));
+    if format != "pandas" and (dtype is not None or downcast):
+        raise Exception("Error when executing partitioned query. Parameters 'dtype' and 'downcast' can only be used with format=\"pandas\".")
+    numThreads = numThreads if numThreads else Config.QueryMaxWorkers
+    numParts = numParts if numParts else numThreads
+    sql = sql.strip().rstrip(";")
+
+    if bounds is None:
+        task.name = _getTaskName("executeQueryPartitioned")
+        dataFrame = executeQuery("select min(" + partitionColumn + ") as minValue, max(" + partitionColumn + ") as maxValue from (" + sql + ") as _partitioned", context)
+        bounds = (dataFrame.minValue[0], dataFrame.maxValue[0])
+
+    queries = [(sql, context)]
+    if not pandas.isna(bounds[0]) and not pandas.isna(bounds[1]):
+        queries = [("select * from (" + sql + ") as _partitioned where " + condition, context) for condition in _getPartitionConditions(partitionColumn, bounds, numParts)]
+
+    with ThreadPoolExecutor(max_workers=max(1, min(numThreads, len(queries)))) as executor:
+        futures = [executor.submit(_executePartition, partSql, partContext, format, dtype) for (partSql, partContext) in queries]
+        try:
+            results = [future.result() for future in futures]
+        except BaseException:
+            for future in futures:
+                future.cancel()
+            raise
+
+    # empty partitions have no column types, so they are only kept if all partitions are empty.
+    nonEmptyResults = [result for result in results if result.shape[0] > 0] if format == "pandas" else [result for result in results if result.num_rows > 0]
+    results = nonEmptyResults if len(nonEmptyResults) > 0 else results[:1]
+    if format == "arrow":
+        return _concatArrowTables(results)
+    dataFrame = results[0] if len(results) == 1 else pandas.concat(results, ignore_index=True)
+    return _downcastDataFrame(dataFrame) if downcast else dataFrame
+
+
+def _getPartitionConditions(partitionColumn, bounds, numParts):
+    """
+    Returns the SQL conditions (strings) selecting disjoint ranges of values of the partition column, which together cover the values from bounds[0] to bounds[1], and NULL.
+    """
+    (minValue, maxValue) = bounds
+    if isinstance(minValue, (bool, numpy.bool_)) or not isinstance(minValue, (int, float, numpy.integer, numpy.floating)):
+        raise Exception("Error when executing partitioned query. Partition column " + str(partitionColumn) + " must be numeric, but has values of type " + type(minValue).__name__ + ".")
+    numParts = max(1, int(numParts))
+    if isinstance(minValue, (int, numpy.integer)) and isinstance(maxValue, (int, numpy.integer)):
+        (minValue, maxValue) = (int(minValue), int(maxValue))
+        limits = sorted(set(minValue + (maxValue - minValue + 1) * i // numParts for i in range(numParts)))
+        toLiteral = str
+    else:
+        (minValue, maxValue) = (float(minValue), float(maxValue))
+        limits = sorted(set(minValue + (maxValue - minValue) * i / numParts for i in range(numParts)))
+        toLiteral = repr
+
+    conditions = []
+    for i in range(len(limits)):
+        condition = partitionColumn + " >= " + toLiteral(limits[i]) + " and " + partitionColumn
+        condition += " < " + toLiteral(limits[i + 1]) if i + 1 < len(limits) else " <= " + toLiteral(maxValue)
+        conditions.append("(" + condition + ")" if i > 0 else "(" + condition + ") or " + partitionColumn + " is null")
+    return conditions
+
+
+def _executePartition(sql, context, format, dtype):
+    # each thread has its own task name.
+    task.name = _getTaskName("executeQueryPartitioned")
+    return executeQuery(sql, context, format=format, dtype=dtype)
+
+
+def _getTaskName(functionName):
+    if Config.isSciServerComputeEnvironment():
+        return "Compute.SciScript-Python.CasJobs." + functionName
+    else:
+        return "SciScript-Python.CasJobs." + functionName
+
+
+def _postQuery(sql, context, format, functionName):
+    """
+    Sends the HTTP request of a synchronous query, and returns the streamed response.
+    """
+    acceptHeader = _getQueryAcceptHeader(format)
 
     taskName = "";
     if task.name is not None:
@@ -129,9 +437,9 @@ def executeQuery(sql, context="MyDB", format="pandas"):
         task.name = None;
     else:
         if Config.isSciServerComputeEnvironment():
-            taskName = "Compute.SciScript-Python.CasJobs.executeQuery"
+            taskName = "Compute.SciScript-Python.CasJobs." + functionName
         else:
-            taskName = "SciScript-Python.CasJobs.executeQuery"
+            taskName = "SciScript-Python.CasJobs." + functionName
 
     QueryUrl = Config.CasJobsRESTUri + "/contexts/" + context + "/query"  + "?TaskName=" + taskName
 
@@ -144,36 +452,336 @@ def executeQuery(sql, context="MyDB", format="pandas"):
     if token is not None and token != "":
         headers['X-Auth-Token'] = token
 
-    postResponse = requests.post(QueryUrl,data=data,headers=headers, stream=True)
+    postResponse = _Http.post(QueryUrl,data=data,headers=headers, stream=True)
     if postResponse.status_code != 200:
         raise Exception("Error when executing query. Http Response from CasJobs API returned status code " + str(postResponse.status_code) + ":\n" + postResponse.content.decode());
 
+    return postResponse
+
+
+def _iterDataFrames(response, chunksize, dtype=None, downcast=False):
+    """
+    Yields the pandas.DataFrame chunks of a streamed JSON query result, and closes the response when done or when the iterator is closed.
+    """
+    try:
+        schemas = {}
+        for (tableIndex, tableName, columns, rows) in _JsonStream.iterResultBatches(response.iter_content(chunk_size=_RESPONSE_CHUNK_SIZE), chunksize):
+            dataFrame = _getDataFrame(columns, rows, schemas.get(tableIndex), dtype)
+            schemas.setdefault(tableIndex, list(dataFrame.dtypes))
+            if downcast:
+                dataFrame = _downcastDataFrame(dataFrame)
+            dataFrame.attrs["tableIndex"] = tableIndex
+            dataFrame.attrs["tableName"] = tableName
+            yield dataFrame
+    finally:
+        response.close()
+
+
+async def executeQueryAsync(sql, context="MyDB", format="pandas"):
+    """
+    Asynchronous version of CasJobs.executeQuery, which returns an awaitable object. Many queries can be executed concurrently from a single thread, e.g., by using asyncio.gather.
+
+    :param sql: sql query (string)
+    :param context: database context (string)
+    :param format: parameter (string) that specifies the return type. Takes the same values as in CasJobs.executeQuery.
+    :return: the query result table, in a format defined by the 'format' input parameter.
+    :raises: Throws an exception if the HTTP request to the CasJobs API returns an error. Throws an exception if parameter 'format' is not correctly specified. Throws an exception if the 'aiohttp' package is not installed.
+    :example: tables = await asyncio.gather(*[CasJobs.executeQueryAsync("select " + str(i) + " as foo") for i in range(10)])
+
+    .. seealso:: CasJobs.executeQuery, CasJobs.submitJobAsync
+    """
+    acceptHeader = _getQueryAcceptHeader(format)
+
+    if Config.isSciServerComputeEnvironment():
+        taskName = "Compute.SciScript-Python.CasJobs.executeQueryAsync"
+    else:
+        taskName = "SciScript-Python.CasJobs.executeQueryAsync"
+
+    QueryUrl = Config.CasJobsRESTUri + "/contexts/" + context + "/query"  + "?TaskName=" + taskName
+
+    query = {"Query": sql, "TaskName": taskName}
+
+    data = json.dumps(query).encode()
+
+    headers = {'Content-Type': 'application/json', 'Accept': acceptHeader}
+    token = await asyncio.to_thread(Authentication.getToken)
+    if token is not None and token != "":
+        headers['X-Auth-Token'] = token
+
+    postResponse = await _Http.requestAsync("POST", QueryUrl, data=data, headers=headers)
+    if postResponse.status_code != 200:
+        raise Exception("Error when executing query. Http Response from CasJobs API returned status code " + str(postResponse.status_code) + ":\n" + postResponse.content.decode());
+
+    return _getQueryResult(postResponse.content, format)
+
+
+def _getQueryAcceptHeader(format):
+    if (format == "pandas") or (format =="json") or (format =="dict") or (format == "arrow") or (format == "parquet"):
+        return "application/json+array"
+    elif (format == "csv") or (format == "readable") or (format == "StringIO"):
+        return "text/plain"
+    elif format == "fits":
+        return "application/fits"
+    elif format == "BytesIO":
+        return "application/fits" # defined later using specific serialization
+    else:
+        raise Exception("Error when executing query. Illegal format parameter specification: " + str(format));
+
+
+def _getQueryResult(content, format):
     if (format == "readable") or (format == "StringIO"):
-        return StringIO(postResponse.content.decode())
+        return StringIO(content.decode())
     elif format == "pandas":
-        r=json.loads(postResponse.content.decode())
-        if len(r['Result']) > 1:
-            res = []
-            for result in r['Result']:
-                res.append(pandas.DataFrame(result['Data'],columns=result['Columns']))
-
-            return res
-        else:
-            return pandas.DataFrame(r['Result'][0]['Data'],columns=r['Result'][0]['Columns'])
+        return _getDataFramesFromJson([content])
+    elif (format == "arrow") or (format == "parquet"):
+        return _getArrowQueryResult([content], format)
 
     elif format == "csv":
-        return postResponse.content.decode()
+        return content.decode()
     elif format == "dict":
-        return json.loads(postResponse.content.decode())
+        return json.loads(content.decode())
     elif format == "json":
-        return  postResponse.content.decode()
+        return  content.decode()
     elif format == "fits":
-        return BytesIO(postResponse.content)
+        return BytesIO(content)
     elif format == "BytesIO":
-        return BytesIO(postResponse.content)
+        return BytesIO(content)
     else: # should not occur
         raise Exception("Error when executing query. Illegal format parameter specification: " + str(format));
 
+
+def _getDataFramesFromJson(chunks, dtype=None, downcast=False):
+    """
+    Builds the pandas.DataFrame of each table in a JSON query result, given as an iterable of chunks of the response body.
+    Rows are converted into a DataFrame every Config.QueryBatchSize rows, and the DataFrames of each table are concatenated at the end.
+    Returns a list of DataFrames if the result has several tables, or a single DataFrame otherwise.
+    """
+    tables = []
+    for (tableIndex, tableName, columns, rows) in _JsonStream.iterResultBatches(chunks, Config.QueryBatchSize):
+        if tableIndex == len(tables):
+            tables.append([])
+            tables[tableIndex].append(_getDataFrame(columns, rows, None, dtype))
+        else:
+            tables[tableIndex].append(_getDataFrame(columns, rows, list(tables[tableIndex][0].dtypes), dtype))
+
+    dataFrames = []
+    while len(tables) > 0:
+        batches = tables.pop(0)
+        dataFrame = batches[0] if len(batches) == 1 else pandas.concat(batches, ignore_index=True)
+        dataFrames.append(_downcastDataFrame(dataFrame) if downcast else dataFrame)
+
+    if len(dataFrames) > 1:
+        return dataFrames
+    else:
+        return dataFrames[0]
+
+
+def _importPyArrow():
+    try:
+        import pyarrow
+        import pyarrow.parquet
+    except ImportError:
+        raise Exception("The 'arrow' and 'parquet' formats require the 'pyarrow' package. Install it with 'pip install pyarrow'.")
+    return pyarrow
+
+
+def _iterArrowTables(chunks, batchSize):
+    """
+    Parses a JSON query result given as an iterable of chunks of the response body, and yields tuples (tableIndex, pyarrow.Table) with at most batchSize rows each.
+    Numeric columns are converted into Arrow arrays without copying the data of the intermediate pandas.DataFrame.
+    """
+    pyarrow = _importPyArrow()
+    schemas = {}
+    for (tableIndex, tableName, columns, rows) in _JsonStream.iterResultBatches(chunks, batchSize):
+        dataFrame = _getDataFrame(columns, rows, schemas.get(tableIndex))
+        schemas.setdefault(tableIndex, list(dataFrame.dtypes))
+        yield (tableIndex, pyarrow.Table.from_pandas(dataFrame, preserve_index=False))
+
+
+def _concatArrowTables(tables):
+    pyarrow = _importPyArrow()
+    if len(tables) == 1:
+        return tables[0]
+    try:
+        # column types can differ between batches, e.g., if an integer column has NULL values only in some of them.
+        schema = tables[0].schema
+        return pyarrow.concat_tables([table if table.schema.equals(schema) else table.cast(schema) for table in tables])
+    except (pyarrow.ArrowInvalid, pyarrow.ArrowNotImplementedError):
+        return pyarrow.concat_tables(tables, promote_options="permissive")
+
+
+def _unifyArrowSchemas(schemas):
+    """
+    Returns the schema to which tables with the given schemas can all be cast, where the type of each column is promoted as needed, e.g., from int64 to double, or from null (a column with only NULL values) to string.
+    """
+    pyarrow = _importPyArrow()
+    return pyarrow.unify_schemas(schemas, promote_options="permissive")
+
+
+def _promoteParquetFile(filePath, schema):
+    """
+    Writes the row groups of a Parquet file into a new temporary file next to it, with the columns cast to 'schema', and removes the original file.
+    Returns a tuple (pyarrow.parquet.ParquetWriter, path) with the writer still open on the new file, so that more rows can be appended to it.
+    """
+    pyarrow = _importPyArrow()
+    newFilePath = _Http.getTempFilePath(filePath)
+    writer = pyarrow.parquet.ParquetWriter(newFilePath, schema)
+    try:
+        parquetFile = pyarrow.parquet.ParquetFile(filePath)
+        for i in range(parquetFile.num_row_groups):
+            writer.write_table(parquetFile.read_row_group(i).cast(schema))
+        parquetFile.close()
+    except BaseException:
+        writer.close()
+        os.remove(newFilePath)
+        raise
+    os.remove(filePath)
+    return (writer, newFilePath)
+
+
+def _getArrowQueryResult(chunks, format):
+    """
+    Builds a pyarrow.Table (format="arrow") or an io.BytesIO with the Parquet serialization (format="parquet") of each table in a JSON query result.
+    Returns a list if the result has several tables, or a single object otherwise.
+    """
+    return _getQueryResultFromValue(_getArrowTables(chunks), format)
+
+
+def _getArrowTables(chunks):
+    """
+    Builds the list of pyarrow.Table objects of the tables in a JSON query result, given as an iterable of chunks of the response body.
+    """
+    tables = []
+    for (tableIndex, table) in _iterArrowTables(chunks, Config.QueryBatchSize):
+        if tableIndex == len(tables):
+            tables.append([])
+        tables[tableIndex].append(table)
+
+    results = []
+    while len(tables) > 0:
+        results.append(_concatArrowTables(tables.pop(0)))
+    return results
+
+
+def _getArrowResults(tables, format):
+    if format != "parquet":
+        return tables
+    pyarrow = _importPyArrow()
+    results = []
+    for table in tables:
+        bytesio = BytesIO()
+        pyarrow.parquet.write_table(table, bytesio)
+        bytesio.seek(0)
+        results.append(bytesio)
+    return results
+
+
+def _getDataFrame(columns, rows, schema=None, dtype=None):
+    """
+    Builds a pandas.DataFrame from a list of rows, one column at a time.
+    The type of each column is taken from 'schema' (list of dtypes, one per column), which comes from the first batch of rows of the same table, or otherwise from the values in the first
+    _PROBE_ROWS rows. Columns of numbers or booleans are converted directly into NumPy arrays of that type when the values fit it, which keeps the types the same across batches,
+    and only the other columns have their types inferred by pandas.
+    Columns are then converted with 'dtype', as in pandas.DataFrame.astype.
+    """
+    if schema is None:
+        schema = _getColumnTypes(rows[:_PROBE_ROWS], len(columns))
+    dataFrame = pandas.DataFrame({i: _getColumn(list(map(itemgetter(i), rows)), schema[i]) for i in range(len(columns))})
+    dataFrame.columns = columns
+    if dtype is not None:
+        if isinstance(dtype, dict):
+            dtype = {column: columnType for (column, columnType) in dtype.items() if column in dataFrame.columns}
+        dataFrame = dataFrame.astype(dtype)
+    return dataFrame
+
+
+def _getColumnTypes(rows, numColumns):
+    """
+    Returns the dtype of each column of a list of rows, from the types of their values that are not NULL: numpy.bool_, numpy.int64 or numpy.float64 for columns of booleans, integers,
+    or integers and floats, and None for any other column (e.g., of strings, or with only NULL values).
+    """
+    columnTypes = []
+    for i in range(numColumns):
+        types = set(type(row[i]) for row in rows if row[i] is not None)
+        if len(types) == 0:
+            columnTypes.append(None)
+        elif types == {bool}:
+            columnTypes.append(numpy.dtype(numpy.bool_))
+        elif types <= {int}:
+            columnTypes.append(numpy.dtype(numpy.int64))
+        elif types <= {int, float}:
+            columnTypes.append(numpy.dtype(numpy.float64))
+        else:
+            columnTypes.append(None)
+    return columnTypes
+
+
+def _getColumn(values, columnType):
+    """
+    Converts a list of values into a NumPy array of type 'columnType' if the values fit it, or into a column of the type inferred from the values by pandas otherwise.
+    """
+    if isinstance(columnType, numpy.dtype) and columnType.kind in "biuf":
+        hasNulls = False
+        try:
+            array = numpy.array(values)
+            if array.dtype == object and columnType.kind in "iuf" and None in values:
+                # NULL values are converted into NaN, so integer columns with NULL values become float columns, as with pandas.
+                hasNulls = True
+                array = numpy.array(values, dtype=numpy.float64)
+        except (TypeError, ValueError, OverflowError):
+            array = None
+        if array is not None and array.ndim == 1:
+            if array.dtype.kind == "b" and columnType.kind == "b":
+                return array
+            if array.dtype.kind in "iu" and columnType.kind in "iuf":
+                converted = array.astype(columnType)
+                if columnType.kind == "f" or numpy.array_equal(converted, array):
+                    return converted
+                return array
+            if array.dtype.kind == "f" and columnType.kind == "f":
+                return array.astype(columnType, copy=False)
+            if array.dtype.kind == "f" and hasNulls:
+                return array
+    # the values might not fit the type, e.g., if a column has NULL values only in later batches.
+    return _inferColumn(values, columnType)
+
+
+def _inferColumn(values, columnType):
+    objects = numpy.empty(len(values), dtype=object)
+    objects[:] = values
+    column = pandas.Series(objects).infer_objects()
+    if isinstance(columnType, pandas.StringDtype) and column.dtype == object:
+        try:
+            column = column.astype(columnType)
+        except (TypeError, ValueError):
+            pass
+    return column
+
+
+def _downcastDataFrame(dataFrame):
+    """
+    Converts integer columns into the smallest integer type that can hold their values, and float columns into 'float32' if that loses no precision.
+    """
+    result = pandas.DataFrame({i: _downcastColumn(dataFrame.iloc[:, i].to_numpy()) for i in range(len(dataFrame.columns))}, index=dataFrame.index)
+    result.columns = dataFrame.columns
+    result.attrs.update(dataFrame.attrs)
+    return result
+
+
+def _downcastColumn(array):
+    if len(array) == 0:
+        return array
+    if array.dtype.kind in "iu":
+        for columnType in ([numpy.uint8, numpy.uint16, numpy.uint32] if array.dtype.kind == "u" else [numpy.int8, numpy.int16, numpy.int32]):
+            if array.dtype.itemsize > numpy.dtype(columnType).itemsize and numpy.iinfo(columnType).min <= array.min() and array.max() <= numpy.iinfo(columnType).max:
+                return array.astype(columnType)
+    elif array.dtype.kind == "f" and array.dtype.itemsize > 4:
+        downcastArray = array.astype(numpy.float32)
+        if numpy.array_equal(downcastArray, array, equal_nan=True):
+            return downcastArray
+    return array
+
+
 def submitJob(sql, context="MyDB"):
     """
     Submits an asynchronous SQL query to the CasJobs queue.
@@ -205,10 +813,67 @@ def submitJob(sql, context="MyDB"):
         headers['X-Auth-Token']=  token
 
 
-        putResponse = requests.put(QueryUrl,data=data,headers=headers)
+        putResponse = _Http.put(QueryUrl,data=data,headers=headers)
+        if putResponse.status_code != 200:
+            raise Exception("Error when submitting a job. Http Response from CasJobs API returned status code " + str(putResponse.status_code) + ":\n" + putResponse.content.decode());
+
+        _invalidateContextsForJob(sql, context)
+        return int(putResponse.content.decode())
+    else:
+        raise Exception("User token is not defined. First log into SciServer.")
+
+
+def _invalidateContextsForJob(sql, context):
+    # job results are written into MyDB, and the query itself might change the tables of its context or of the ones it names.
+    _invalidateContext("MyDB")
+    if not _QueryCache.isReadOnly(sql):
+        _invalidateContextsForQuery(sql, context)
+
+
+def _invalidateContextsForQuery(sql, context):
+    # a query that is not read-only might have changed the tables of its context, and of any context it names, as in 'insert into DR16.dbo.MyTable'.
+    for name in set([context.lower()]) | _QueryCache.getReferencedContexts(sql):
+        _invalidateContext(name)
+
+
+def _invalidateContextsForJobDescription(jobDesc):
+    # invalidated again once the job is complete, since the tables were written while it ran.
+    _invalidateContextsForJob(jobDesc.get("Query") or "", jobDesc.get("Target") or "MyDB")
+
+
+async def submitJobAsync(sql, context="MyDB"):
+    """
+    Asynchronous version of CasJobs.submitJob, which returns an awaitable object.
+
+    :param sql: sql query (string)
+    :param context:	database context (string)
+    :return: Returns the CasJobs jobID (integer).
+    :raises: Throws an exception if the user is not logged into SciServer (use Authentication.login for that purpose). Throws an exception if the HTTP request to the CasJobs API returns an error. Throws an exception if the 'aiohttp' package is not installed.
+    :example: jobIds = await asyncio.gather(CasJobs.submitJobAsync("select 1 as foo"), CasJobs.submitJobAsync("select 2 as foo"))
+
+    .. seealso:: CasJobs.submitJob, CasJobs.getJobStatusAsync
+    """
+    token = await asyncio.to_thread(Authentication.getToken)
+    if token is not None and token != "":
+
+        if Config.isSciServerComputeEnvironment():
+            taskName = "Compute.SciScript-Python.CasJobs.submitJobAsync"
+        else:
+            taskName = "SciScript-Python.CasJobs.submitJobAsync"
+
+        QueryUrl = Config.CasJobsRESTUri + "/contexts/" + context + "/jobs" + "?TaskName=" + taskName
+
+        query = {"Query": sql, "TaskName": taskName}
+
+        data = json.dumps(query).encode()
+
+        headers = {'Content-Type': 'application/json', 'Accept': "text/plain", 'X-Auth-Token': token}
+
+        putResponse = await _Http.requestAsync("PUT", QueryUrl, data=data, headers=headers)
         if putResponse.status_code != 200:
             raise Exception("Error when submitting a job. Http Response from CasJobs API returned status code " + str(putResponse.status_code) + ":\n" + putResponse.content.decode());
 
+        _invalidateContextsForJob(sql, context)
         return int(putResponse.content.decode())
     else:
         raise Exception("User token is not defined. First log into SciServer.")
@@ -238,7 +903,7 @@ def getJobStatus(jobId):
 
         headers={'X-Auth-Token': token,'Content-Type': 'application/json'}
 
-        postResponse =requests.get(QueryUrl,headers=headers)
+        postResponse =_Http.get(QueryUrl,headers=headers)
         if postResponse.status_code != 200:
             raise Exception("Error when getting the status of job " + str(jobId) + ".\nHttp Response from CasJobs API returned status code " + str(postResponse.status_code) + ":\n" + postResponse.content.decode());
 
@@ -247,6 +912,38 @@ def getJobStatus(jobId):
         raise Exception("User token is not defined. First log into SciServer.")
 
 
+async def getJobStatusAsync(jobId):
+    """
+    Asynchronous version of CasJobs.getJobStatus, which returns an awaitable object.
+
+    :param jobId: id of job (integer)
+    :return: Returns a dictionary object containing the job status and related metadata. The "Status" field can be equal to 0 (Ready), 1 (Started), 2 (Canceling), 3(Canceled), 4 (Failed) or 5 (Finished).
+    :raises: Throws an exception if the user is not logged into SciServer (use Authentication.login for that purpose). Throws an exception if the HTTP request to the CasJobs API returns an error. Throws an exception if the 'aiohttp' package is not installed.
+    :example: statuses = await asyncio.gather(*[CasJobs.getJobStatusAsync(jobId) for jobId in jobIds])
+
+    .. seealso:: CasJobs.getJobStatus, CasJobs.submitJobAsync
+    """
+    token = await asyncio.to_thread(Authentication.getToken)
+    if token is not None and token != "":
+
+        if Config.isSciServerComputeEnvironment():
+            taskName = "Compute.SciScript-Python.CasJobs.getJobStatusAsync"
+        else:
+            taskName = "SciScript-Python.CasJobs.getJobStatusAsync"
+
+        QueryUrl = Config.CasJobsRESTUri + "/jobs/" + str(jobId) + "?TaskName=" + taskName
+
+        headers={'X-Auth-Token': token,'Content-Type': 'application/json'}
+
+        response = await _Http.requestAsync("GET", QueryUrl, headers=headers)
+        if response.status_code != 200:
+            raise Exception("Error when getting the status of job " + str(jobId) + ".\nHttp Response from CasJobs API returned status code " + str(response.status_code) + ":\n" + response.content.decode());
+
+        return json.loads(response.content.decode())
+    else:
+        raise Exception("User token is not defined. First log into SciServer.")
+
+
 def cancelJob(jobId):
     """
     Cancels a job already submitted.
@@ -271,7 +968,7 @@ def cancelJob(jobId):
 
         headers={'X-Auth-Token': token,'Content-Type': 'application/json'}
 
-        response =requests.delete(QueryUrl,headers=headers)
+        response =_Http.delete(QueryUrl,headers=headers)
         if response.status_code != 200:
             raise Exception("Error when canceling job " + str(jobId) + ".\nHttp Response from CasJobs API returned status code " + str(response.status_code) + ":\n" + response.content.decode());
 
@@ -280,79 +977,331 @@ def cancelJob(jobId):
         raise Exception("User token is not defined. First log into SciServer.")
 
 
-def waitForJob(jobId, verbose=False, pollTime = 5):
+def waitForJob(jobId, verbose=False, pollTime=None, maxPollTime=None, timeout=None, callback=None):
     """
     Queries regularly the job status and waits until the job is completed.
 
     :param jobId: id of job (integer)
     :param verbose: if True, will print "wait" messages on the screen while the job is still running. If False, will suppress the printing of messages on the screen.
-    :param pollTime: idle time interval (integer, in seconds) before querying again for the job status. Minimum value allowed is 5 seconds.
+    :param pollTime: initial idle time interval (float, in seconds) before querying again for the job status, which then grows exponentially while the job is running. If not set, then Config.PollTime is used.
+    :param maxPollTime: maximum idle time interval (float, in seconds) before querying again for the job status. If not set, then Config.PollMaxTime is used.
+    :param timeout: maximum time (float, in seconds) to wait for the job to be completed. If set to None, then waits with no time limit.
+    :param callback: function called as callback(jobDesc, elapsedSeconds) each time the job status is queried and the job is not completed yet, e.g., to report progress.
     :return: After the job is finished, returns a dictionary object containing the job status and related metadata. The "Status" field can be equal to 0 (Ready), 1 (Started), 2 (Canceling), 3(Canceled), 4 (Failed) or 5 (Finished).
-    :raises: Throws an exception if the user is not logged into SciServer (use Authentication.login for that purpose). Throws an exception if the HTTP request to the CasJobs API returns an error.
+    :raises: Throws an exception if the user is not logged into SciServer (use Authentication.login for that purpose). Throws an exception if the HTTP request to the CasJobs API returns an error. Throws an exception if the timeout is reached before the job is completed.
     :example: CasJobs.waitForJob(CasJobs.submitJob("select 1"))
 
     .. seealso:: CasJobs.submitJob, CasJobs.getJobStatus, CasJobs.cancelJob.
     """
 
     try:
-        minPollTime = 5 # in seconds
-        complete = False
-
         waitingStr = "Waiting..."
-        back = "\b" * len(waitingStr)
         if verbose:
             print(waitingStr, end="")
 
-        while not complete:
+        def getStatus():
             if verbose:
-                #print(back, end="")
                 print(waitingStr, end="")
-            jobDesc = getJobStatus(jobId)
-            jobStatus = int(jobDesc["Status"])
-            if jobStatus in (3, 4, 5):
-                complete = True
-                if verbose:
-                    #print(back, end="")
-                    print("Done!")
-            else:
-                time.sleep(max(minPollTime,pollTime));
+            return getJobStatus(jobId)
+
+        jobDesc = _Poller.poll(getStatus, lambda jobDesc: int(jobDesc["Status"]) in (3, 4, 5), pollTime, maxPollTime, timeout, callback, "CasJobs job " + str(jobId))
+        _invalidateContextsForJobDescription(jobDesc)
+        if verbose:
+            print("Done!")
 
         return jobDesc
     except Exception as e:
         raise e;
 
 
-def writeFitsFileFromQuery(fileName, queryString, context="MyDB"):
+def submitJobs(queries, context="MyDB", numThreads=None):
+    """
+    Submits several asynchronous SQL queries to the CasJobs queue at the same time.
+
+    :param queries: list of sql queries (strings), or of (sql query, database context) tuples for queries to be run in different contexts.
+    :param context: database context (string) of the queries given without one.
+    :param numThreads: maximum number (integer) of queries submitted at the same time. If not set, then Config.HttpPoolMaxSize is used.
+    :return: Returns the list of CasJobs jobIDs (integers), in the same order as the queries.
+    :raises: Throws an exception if the user is not logged into SciServer (use Authentication.login for that purpose). Throws an exception if the HTTP request to the CasJobs API returns an error for any of the queries, after all other queries were submitted. The exception message contains the jobIDs of the submitted queries, so that they can be canceled.
+    :example: jobIds = CasJobs.submitJobs(["select " + str(i) + " as foo" for i in range(100)], "MyDB")
+
+    .. seealso:: CasJobs.submitJob, CasJobs.waitForJobs, CasJobs.cancelJob.
+    """
+    queries = [(query, context) if isinstance(query, str) else tuple(query) for query in queries]
+    numThreads = numThreads if numThreads else Config.HttpPoolMaxSize
+    if len(queries) == 0:
+        return []
+
+    with ThreadPoolExecutor(max_workers=max(1, min(numThreads, len(queries)))) as executor:
+        futures = [executor.submit(submitJob, sql, queryContext) for (sql, queryContext) in queries]
+        wait(futures)
+
+    errors = [future.exception() for future in futures if future.exception() is not None]
+    if len(errors) > 0:
+        jobIds = [future.result() for future in futures if future.exception() is None]
+        raise Exception("Error when submitting " + str(len(errors)) + " of " + str(len(queries)) + " jobs. Submitted jobs: " + str(jobIds) + ". First error:\n" + str(errors[0]))
+    return [future.result() for future in futures]
+
+
+def waitForJobs(jobIds, verbose=False, pollTime=None, maxPollTime=None, timeout=None, numThreads=None):
+    """
+    Queries regularly the status of several jobs, and returns each job status as soon as the job is completed, in order of completion (as in concurrent.futures.as_completed).
+    The statuses of all pending jobs are queried at the same time, and the interval between queries starts at 'pollTime' and grows exponentially after each query, up to 'maxPollTime', so that short jobs are returned quickly and long jobs are not queried too often.
+
+    :param jobIds: list of ids of jobs (integers)
+    :param verbose: if True, will print a message on the screen each time a job is completed. If False, will suppress the printing of messages on the screen.
+    :param pollTime: initial idle time interval (float, in seconds) before querying again for the jobs status. If not set, then Config.PollTime is used.
+    :param maxPollTime: maximum idle time interval (float, in seconds) before querying again for the jobs status. If not set, then Config.PollMaxTime is used.
+    :param timeout: maximum time (float, in seconds) to wait for all jobs to be completed. If set to None, then waits with no time limit.
+    :param numThreads: maximum number (integer) of job statuses queried at the same time. If not set, then Config.HttpPoolMaxSize is used.
+    :return: an iterator of dictionary objects containing the job status and related metadata, as returned by CasJobs.getJobStatus. The "Status" field can be equal to 3(Canceled), 4 (Failed) or 5 (Finished).
+    :raises: Throws an exception if the user is not logged into SciServer (use Authentication.login for that purpose). Throws an exception if the HTTP request to the CasJobs API returns an error. Throws an exception if the timeout is reached before all jobs are completed.
+    :example: for jobDesc in CasJobs.waitForJobs(CasJobs.submitJobs(["select 1", "select 2"])): print(jobDesc["JobID"], jobDesc["Status"])
+
+    .. seealso:: CasJobs.submitJobs, CasJobs.waitForJob, CasJobs.getJobStatus, CasJobs.cancelJob.
+    """
+    pending = list(dict.fromkeys(jobIds))
+    numThreads = numThreads if numThreads else Config.HttpPoolMaxSize
+    backoff = _Poller.Backoff(pollTime, maxPollTime, timeout)
+
+    with ThreadPoolExecutor(max_workers=max(1, numThreads)) as executor:
+        while len(pending) > 0:
+            futures = {executor.submit(getJobStatus, jobId): jobId for jobId in pending}
+            for future in as_completed(futures):
+                jobDesc = future.result()
+                if int(jobDesc["Status"]) in (3, 4, 5):
+                    _invalidateContextsForJobDescription(jobDesc)
+                    pending.remove(futures[future])
+                    if verbose:
+                        print("Job " + str(futures[future]) + " done! " + str(len(pending)) + " jobs pending.")
+                    yield jobDesc
+
+            if len(pending) > 0:
+                if backoff.isExpired():
+                    raise Exception("Timeout when waiting for jobs. Jobs still pending: " + str(pending) + ".")
+                backoff.sleep()
+
+
+def writeFitsFileFromQuery(fileName, queryString, context="MyDB", memmap=False):
     """
     Executes a quick CasJobs query and writes the result to a local Fits file (http://www.stsci.edu/institute/software_hardware/pyfits).
+    The result is written to the file in chunks while it is being received, so it does not need to fit in memory.
 
     :param fileName: path to the local Fits file to be created (string)
     :param queryString: sql query (string)
     :param context: database context (string)
-    :return: Returns True if the fits file was created successfully.
-    :raises: Throws an exception if the user is not logged into SciServer (use Authentication.login for that purpose). Throws an exception if the HTTP request to the CasJobs API returns an error.
+    :param memmap: if set to True, then the created file is opened and returned as an astropy.table.Table whose columns are memory-mapped from the file, so that they are only read from disk when accessed. Requires the 'astropy' package.
+    :return: Returns True if the fits file was created successfully, or an astropy.table.Table if 'memmap' is set to True.
+    :raises: Throws an exception if the user is not logged into SciServer (use Authentication.login for that purpose). Throws an exception if the HTTP request to the CasJobs API returns an error. Throws an exception if 'memmap' is set to True and the 'astropy' package is not installed.
     :example: CasJobs.writeFitsFileFromQuery("/home/user/myFile.fits","select 1 as foo")
 
     .. seealso:: CasJobs.submitJob, CasJobs.getJobStatus, CasJobs.executeQuery, CasJobs.getPandasDataFrameFromQuery, CasJobs.getNumpyArrayFromQuery
     """
-    try:
+    if memmap:
+        try:
+            from astropy.table import Table
+        except ImportError:
+            raise Exception("Parameter 'memmap' requires the 'astropy' package. Install it with 'pip install astropy'.")
 
+    postResponse = _postQuery(queryString, context, "fits", "writeFitsFileFromQuery")
 
-        if Config.isSciServerComputeEnvironment():
-            task.name = "Compute.SciScript-Python.CasJobs.writeFitsFileFromQuery"
-        else:
-            task.name = "SciScript-Python.CasJobs.writeFitsFileFromQuery"
+    _Http.streamToFile(postResponse, fileName, _RESPONSE_CHUNK_SIZE)
 
-        bytesio = executeQuery(queryString, context=context, format="fits")
+    if memmap:
+        return Table.read(fileName, format="fits", memmap=True)
 
-        theFile = open(fileName, "w+b")
-        theFile.write(bytesio.read())
-        theFile.close()
+    return True
 
-        return True
+def writeParquetFileFromQuery(fileName, queryString, context="MyDB"):
+    """
+    Executes a quick CasJobs query and writes the result to a local Apache Parquet file (https://parquet.apache.org), which can be read back much faster than re-parsing the query result, e.g., with pandas.read_parquet or pyarrow.parquet.read_table.
+    The result is written in row groups while it is being received, so it does not need to fit in memory. If the query returns several tables, only the first one is written. If a later batch of rows needs a wider column type than the rows already written (e.g., decimal values in a column that only had integers, or values in a column that only had NULLs), then the rows already written are rewritten with the wider type.
+
+    :param fileName: path to the local Parquet file to be created (string)
+    :param queryString: sql query (string)
+    :param context: database context (string)
+    :return: Returns True if the parquet file was created successfully.
+    :raises: Throws an exception if the user is not logged into SciServer (use Authentication.login for that purpose). Throws an exception if the HTTP request to the CasJobs API returns an error. Throws an exception if the 'pyarrow' package is not installed.
+    :example: CasJobs.writeParquetFileFromQuery("/home/user/myFile.parquet","select 1 as foo")
+
+    .. seealso:: CasJobs.executeQuery, CasJobs.writeFitsFileFromQuery, CasJobs.getPandasDataFrameFromQuery
+    """
+    pyarrow = _importPyArrow()
+
+    postResponse = _postQuery(queryString, context, "parquet", "writeParquetFileFromQuery")
+
+    tempFilePath = _Http.getTempFilePath(fileName)
+    writer = None
+    try:
+        for (tableIndex, table) in _iterArrowTables(postResponse.iter_content(chunk_size=_RESPONSE_CHUNK_SIZE), Config.QueryBatchSize):
+            if tableIndex > 0:
+                break
+            if writer is not None and not table.schema.equals(writer.schema):
+                # column types can differ between batches, e.g., if a column has only NULL values in the first batch, or
+                # integer values in the first batch and decimal ones later. The rows already written are then promoted.
+                schema = _unifyArrowSchemas([writer.schema, table.schema])
+                if not schema.equals(writer.schema):
+                    writer.close()
+                    writer = None
+                    (writer, tempFilePath) = _promoteParquetFile(tempFilePath, schema)
+                table = table.cast(schema)
+            if writer is None:
+                writer = pyarrow.parquet.ParquetWriter(tempFilePath, table.schema)
+            writer.write_table(table)
+        if writer is None:
+            raise Exception("Error when writing the parquet file. The query returned no result table.")
+        writer.close()
+        writer = None
+        os.replace(tempFilePath, fileName)
+    finally:
+        postResponse.close()
+        if writer is not None:
+            writer.close()
+        if os.path.exists(tempFilePath):
+            os.remove(tempFilePath)
+
+    return True
+
+def extract(sql, context, dest, format="parquet", tableName=None, pageSize=None, numThreads=None, dropTable=True, verbose=False, pollTime=None, timeout=None):
+    """
+    Executes a SQL query as a CasJobs job that writes its result into a staging table in MyDB, and downloads that table into local files, for results too large for a synchronous query such as CasJobs.executeQuery.
+    The table is downloaded in pages of rows by several concurrent queries, and each page is written into its own file named 'part-<number>.parquet' or 'part-<number>.csv' in the directory 'dest', so that all of them can be read back at once, e.g., with pandas.read_parquet(dest).
+    The extract can be restarted: its progress is recorded in a state file under Config.CacheDir, and calling CasJobs.extract again with the same parameters after an error or interruption continues from there, without submitting the job again or downloading the pages already written.
+    The query is used as a subquery, so it must return a single table with distinct column names, and it cannot have an 'order by' clause without 'top'. The rows are numbered by an identity column when they are inserted into the staging table, and SQL Server does not guarantee that this numbering follows an 'order by' of the query, so the rows in the files are not necessarily in that order, and should be sorted after reading them back if needed.
+    For format='parquet', the column types of all files are promoted to a common schema (e.g., from integer to float if only some pages have decimal values), so that they can be read back together.
+
+    :param sql: sql query (string)
+    :param context: database context (string) where the query is executed.
+    :param dest: path of the local directory (string) where the files are written. It is created if it does not exist.
+    :param format: format (string) of the files written: 'parquet' for Apache Parquet files (which requires the 'pyarrow' package), or 'csv' for CSV files.
+    :param tableName: name (string) of the staging table created in MyDB. If not set, then a name is derived from the query, context and dest. If the job that creates it fails, the table is dropped if it exists before the job is submitted again.
+    :param pageSize: number of rows (integer) downloaded by each query and written into each file. If not set, then Config.QueryBatchSize is used.
+    :param numThreads: maximum number (integer) of pages downloaded at the same time. If not set, then Config.QueryMaxWorkers is used.
+    :param dropTable: if set to True, then the staging table is dropped from MyDB after all pages are written.
+    :param verbose: if True, will print "wait" messages on the screen while the job is still running.
+    :param pollTime: initial idle time interval (float, in seconds) before querying again for the job status, as in CasJobs.waitForJob.
+    :param timeout: maximum time (float, in seconds) to wait for each job to be completed. If set to None, then waits with no time limit.
+    :return: the list of paths (strings) of the files written, in the order of the rows of the staging table.
+    :raises: Throws an exception if the user is not logged into SciServer (use Authentication.login for that purpose). Throws an exception if a job fails, or if the HTTP request to the CasJobs API returns an error. Throws an exception if 'dest' already contains files of a different extract, or if parameter 'format' is not correctly specified.
+    :example: files = CasJobs.extract("select objID, ra, dec from PhotoObj where r < 21", "DR16", "/home/idies/workspace/Temporary/myUser/scratch/photoObj")
+
+    .. seealso:: CasJobs.submitJob, CasJobs.waitForJob, CasJobs.executeQueryPartitioned, CasJobs.writeParquetFileFromQuery
+    """
+    if format not in ("parquet", "csv"):
+        raise Exception("Error when extracting query result. Illegal format parameter specification: " + str(format));
+    if format == "parquet":
+        pyarrow = _importPyArrow()
+    pageSize = pageSize if pageSize else Config.QueryBatchSize
+    numThreads = numThreads if numThreads else Config.QueryMaxWorkers
+    sql = sql.strip().rstrip(";")
+    if tableName is None:
+        tableName = "extract_" + hashlib.sha1(json.dumps([sql, context, os.path.abspath(dest)]).encode()).hexdigest()[:16]
+
+    state = {"sql": sql, "context": context, "dest": os.path.abspath(dest), "format": format, "tableName": tableName, "pageSize": pageSize}
+    stateFilePath = os.path.join(Config.CacheDir, "extracts", hashlib.sha1(json.dumps([sql, context, os.path.abspath(dest)]).encode()).hexdigest() + ".json")
+    previousState = _Http.readStateFile(stateFilePath)
+    os.makedirs(dest, exist_ok=True)
+    if previousState is not None and all(previousState.get(key) == value for key, value in state.items()):
+        state = previousState
+    elif any(fileName.startswith("part-") for fileName in os.listdir(dest)):
+        raise Exception("Error when extracting query result. Directory " + str(dest) + " already contains the files of a different extract.")
+    os.makedirs(os.path.dirname(stateFilePath), exist_ok=True)
+
+    if state.get("dropped") and any(not os.path.exists(fileName) for fileName in _getExtractFileNames(dest, state["numRows"], pageSize, format)):
+        # the staging table was dropped, so the missing pages can only be written by running the query again, which might
+        # number the rows differently. The files already written are therefore removed, and the extract starts over.
+        for fileName in os.listdir(dest):
+            if fileName.startswith("part-"):
+                os.remove(os.path.join(dest, fileName))
+        state = {key: state[key] for key in ("sql", "context", "dest", "format", "tableName", "pageSize")}
+        _Http.writeStateFile(stateFilePath, state)
+
+    if state.get("numRows") is None:
+        if state.get("jobId") is None:
+            if state.get("failedJobIds"):
+                # a failed job might have created the table, or part of it, before failing.
+                task.name = _getTaskName("extract")
+                executeQuery("if object_id('" + tableName + "', 'U') is not null drop table " + tableName, "MyDB", format="json")
+            state["jobId"] = submitJob("select identity(bigint, 1, 1) as " + _EXTRACT_ROW_ID + ", * into mydb." + tableName + " from (" + sql + ") as _extract", context)
+            _Http.writeStateFile(stateFilePath, state)
+        _waitForExtractJob(state, "jobId", stateFilePath, verbose, pollTime, timeout)
+        # the index allows each page to be read without scanning the whole table.
+        if state.get("indexJobId") is None:
+            state["indexJobId"] = submitJob("create unique clustered index ix_" + _EXTRACT_ROW_ID + " on " + tableName + " (" + _EXTRACT_ROW_ID + ")", "MyDB")
+            _Http.writeStateFile(stateFilePath, state)
+        _waitForExtractJob(state, "indexJobId", stateFilePath, verbose, pollTime, timeout)
+        task.name = _getTaskName("extract")
+        state["numRows"] = int(executeQuery("select count_big(*) as numRows from " + tableName, "MyDB").numRows[0])
+        _Http.writeStateFile(stateFilePath, state)
+
+    fileNames = _getExtractFileNames(dest, state["numRows"], pageSize, format)
+    pages = [page for page in range(len(fileNames)) if not os.path.exists(fileNames[page])]
+
+    with ThreadPoolExecutor(max_workers=max(1, min(numThreads, len(pages) or 1))) as executor:
+        futures = [executor.submit(_writeExtractPage, tableName, page, pageSize, fileNames[page], format) for page in pages]
+        try:
+            for future in futures:
+                future.result()
+        except BaseException:
+            for future in futures:
+                future.cancel()
+            raise
+
+    if format == "parquet":
+        # each page is written with the column types of its own rows, e.g., a column with only NULL values in a page has
+        # no type, so the files whose schema differs from the common one are rewritten with it.
+        schemas = [pyarrow.parquet.read_schema(fileName) for fileName in fileNames]
+        schema = _unifyArrowSchemas(schemas)
+        for (fileName, fileSchema) in zip(fileNames, schemas):
+            if not fileSchema.equals(schema):
+                (writer, tempFilePath) = _promoteParquetFile(fileName, schema)
+                writer.close()
+                os.replace(tempFilePath, fileName)
+
+    if dropTable and not state.get("dropped"):
+        task.name = _getTaskName("extract")
+        executeQuery("drop table " + tableName, "MyDB", format="json")
+        state["dropped"] = True
+        _Http.writeStateFile(stateFilePath, state)
+
+    return fileNames
+
+
+def _getExtractFileNames(dest, numRows, pageSize, format):
+    return [os.path.join(dest, "part-" + str(page).zfill(5) + "." + format) for page in range(max(1, -(-numRows // pageSize)))]
+
+
+def _waitForExtractJob(state, key, stateFilePath, verbose, pollTime, timeout):
+    jobDesc = waitForJob(state[key], verbose, pollTime, timeout=timeout)
+    if int(jobDesc["Status"]) != 5:
+        # the job is submitted again when the extract is restarted.
+        jobId = state.pop(key)
+        state.setdefault("failedJobIds", []).append(jobId)
+        _Http.writeStateFile(stateFilePath, state)
+        raise Exception("Error when extracting query result. CasJobs job " + str(jobId) + " did not finish successfully:\n" + str(jobDesc.get("Message", jobDesc)))
+
+
+def _writeExtractPage(tableName, page, pageSize, fileName, format):
+    """
+    Downloads a page of rows of an extract staging table and writes it into a file, through a temporary file so that only complete pages are found by a restarted extract.
+    """
+    task.name = _getTaskName("extract")
+    sql = "select * from " + tableName + " where " + _EXTRACT_ROW_ID + " between " + str(page * pageSize + 1) + " and " + str((page + 1) * pageSize) + " order by " + _EXTRACT_ROW_ID
+    tempFilePath = _Http.getTempFilePath(fileName)
+    try:
+        if format == "parquet":
+            pyarrow = _importPyArrow()
+            table = executeQuery(sql, "MyDB", format="arrow")
+            table = table.select([name for name in table.column_names if name != _EXTRACT_ROW_ID])
+            pyarrow.parquet.write_table(table, tempFilePath)
+        else:
+            dataFrame = executeQuery(sql, "MyDB", format="pandas")
+            dataFrame.drop(columns=[_EXTRACT_ROW_ID]).to_csv(tempFilePath, index=False)
+        os.replace(tempFilePath, fileName)
+    finally:
+        if os.path.exists(tempFilePath):
+            os.remove(tempFilePath)
 
-    except Exception as e:
-        raise e
 
 # no explicit index column by default
 def getPandasDataFrameFromQuery(queryString, context="MyDB"):
@@ -384,64 +1333,192 @@ def getPandasDataFrameFromQuery(queryString, context="MyDB"):
     except Exception as e:
         raise e
 
-def getNumpyArrayFromQuery(queryString, context="MyDB"):
+def getNumpyArrayFromQuery(queryString, context="MyDB", fileName=None):
     """
-    Executes a casjobs query and returns the results table as a Numpy array (http://docs.scipy.org/doc/numpy/).
+    Executes a casjobs query and returns the results table as a Numpy structured array (http://docs.scipy.org/doc/numpy/), with one typed field per column.
+    The array is built from the result while it is being received, and string columns are stored as fixed-width unicode fields, with NULL values stored as empty strings. If the query returns several tables, only the first one is returned.
 
     :param queryString: sql query (string)
     :param context: database context (string)
-    :return: Returns a Numpy array storing the results table.
-    :raises: Throws an exception if the user is not logged into SciServer (use Authentication.login for that purpose). Throws an exception if the HTTP request to the CasJobs API returns an error.
+    :param fileName: if not set to None, then the result is written into a .npy file at this local path (string), and returned as a read-only numpy.memmap of that file, so that results larger than the available memory can be used.
+    :return: Returns a Numpy structured array storing the results table, or a numpy.memmap if 'fileName' is set.
+    :raises: Throws an exception if the user is not logged into SciServer (use Authentication.login for that purpose). Throws an exception if the HTTP request to the CasJobs API returns an error. Throws an exception if 'fileName' is set and a column cannot be stored in a .npy file.
     :example: array = CasJobs.getNumpyArrayFromQuery("select 1 as foo", context="MyDB")
 
     .. seealso:: CasJobs.submitJob, CasJobs.getJobStatus, CasJobs.executeQuery, CasJobs.writeFitsFileFromQuery, CasJobs.getPandasDataFrameFromQuery
 
     """
-    try:
+    postResponse = _postQuery(queryString, context, "pandas", "getNumpyArrayFromQuery")
 
-        if Config.isSciServerComputeEnvironment():
-            task.name = "Compute.SciScript-Python.CasJobs.getNumpyArrayFromQuery"
+    batches = []
+    rawFilePath = _Http.getTempFilePath(fileName) if fileName is not None else None
+    rawFile = open(rawFilePath, "xb") if fileName is not None else None
+    try:
+        # batches are kept in memory, or appended to a raw temporary file, until the final field types are known.
+        schema = None
+        for (tableIndex, tableName, columns, rows) in _JsonStream.iterResultBatches(postResponse.iter_content(chunk_size=_RESPONSE_CHUNK_SIZE), Config.QueryBatchSize):
+            if tableIndex > 0:
+                break
+            dataFrame = _getDataFrame(columns, rows, schema)
+            schema = schema if schema is not None else list(dataFrame.dtypes)
+            records = _getRecords(dataFrame, fileName is not None)
+            if rawFile is not None:
+                batches.append((rawFile.tell(), records.dtype, len(records)))
+                records.tofile(rawFile)
+            else:
+                batches.append(records)
+
+        if len(batches) == 0:
+            raise Exception("Error when executing query. The query returned no result table.")
+
+        dtypes = [batch.dtype if rawFile is None else batch[1] for batch in batches]
+        dtype = numpy.dtype([(name, _promoteTypes([d.fields[name][0] for d in dtypes])) for name in dtypes[0].names])
+        nRows = sum(len(batch) if rawFile is None else batch[2] for batch in batches)
+
+        if rawFile is None:
+            array = numpy.empty(nRows, dtype=dtype)
+            start = 0
+            while len(batches) > 0:
+                records = batches.pop(0)
+                array[start:start + len(records)] = records.astype(dtype, copy=False)
+                start += len(records)
+            return array
+
+        rawFile.close()
+        npyFilePath = _Http.getTempFilePath(fileName)
+        try:
+            array = numpy.lib.format.open_memmap(npyFilePath, mode="w+", dtype=dtype, shape=(nRows,))
+            start = 0
+            for (offset, batchDtype, count) in batches:
+                array[start:start + count] = numpy.fromfile(rawFilePath, dtype=batchDtype, count=count, offset=offset).astype(dtype, copy=False)
+                start += count
+            array.flush()
+            del array
+            os.replace(npyFilePath, fileName)
+        finally:
+            if os.path.exists(npyFilePath):
+                os.remove(npyFilePath)
+        return numpy.load(fileName, mmap_mode="r")
+
+    finally:
+        postResponse.close()
+        if rawFile is not None:
+            rawFile.close()
+            if os.path.exists(rawFilePath):
+                os.remove(rawFilePath)
+
+
+def _getRecords(dataFrame, fixedSize=False):
+    """
+    Converts a pandas.DataFrame into a Numpy structured array. String columns are converted into fixed-width unicode fields.
+    If 'fixedSize' is True, then an exception is thrown for columns that cannot be stored without Python objects.
+    """
+    fields = []
+    for i in range(len(dataFrame.columns)):
+        column = dataFrame.iloc[:, i]
+        if isinstance(column.dtype, numpy.dtype) and column.dtype.kind in "biuf":
+            values = column.to_numpy()
+        elif pandas.api.types.infer_dtype(column, skipna=True) in ("string", "empty"):
+            values = column.fillna("").to_numpy(dtype=str)
+        elif not fixedSize:
+            values = column.to_numpy(dtype=object)
         else:
-            task.name = "SciScript-Python.CasJobs.getNumpyArrayFromQuery"
+            raise Exception("Error when writing the numpy file. Column '" + str(dataFrame.columns[i]) + "' has values of type '" + str(column.dtype) + "', which cannot be stored in a .npy file.")
+        fields.append((str(dataFrame.columns[i]), values))
 
-        dataFrame = getPandasDataFrameFromQuery(queryString, context)
+    records = numpy.empty(len(dataFrame), dtype=[(name, values.dtype) for (name, values) in fields])
+    for (name, values) in fields:
+        records[name] = values
+    return records
 
-        return dataFrame.as_matrix()
 
-    except Exception as e:
-        raise e
+def _promoteTypes(dtypes):
+    dtype = dtypes[0]
+    for other in dtypes[1:]:
+        dtype = numpy.promote_types(dtype, other) if dtype != other else dtype
+    return dtype
 
 
 #require pandas for now but be able to take a string in the future
-def uploadPandasDataFrameToTable(dataFrame, tableName, context="MyDB"):
+def uploadPandasDataFrameToTable(dataFrame, tableName, context="MyDB", batchSize=None, numThreads=None, retries=None):
     """
     Uploads a pandas dataframe object into a CasJobs table. If the dataframe contains a named index, then the index will be uploaded as a column as well.
+    The dataframe is encoded into CSV and sent in batches of 'batchSize' rows (Config.UploadBatchSize by default), where the first batch creates the table and the following ones are appended to it by several concurrent requests, so that only the batches being uploaded are held in memory as CSV. Failed requests are retried 'retries' times (Config.UploadRetries by default).
 
     :param dataFrame: Pandas data frame containg the data (pandas.core.frame.DataFrame)
     :param tableName: name of CasJobs table to be created.
     :param context: database context (string)
+    :param batchSize: number of rows (integer) sent in each request, or 0 for sending the whole dataframe in a single request. If not set, then Config.UploadBatchSize is used. When uploading in batches, the column types of the table are defined by the server from the first batch only, so that later rows with values that do not fit into them (e.g., longer strings) make the upload fail, and a failed upload leaves the rows of the batches already appended in the table.
+    :param numThreads: maximum number (integer) of batches uploaded at the same time. If not set, then Config.UploadMaxWorkers is used.
+    :param retries: number of times (integer) that the upload of a failed request is retried, or 0 for not retrying it. If not set, then Config.UploadRetries is used. Appending rows is not idempotent: a batch whose request failed after reaching the server might be appended twice when retried.
     :return: Returns True if the dataframe was uploaded successfully.
-    :raises: Throws an exception if the user is not logged into SciServer (use Authentication.login for that purpose). Throws an exception if the HTTP request to the CasJobs API returns an error.
+    :raises: Throws an exception if the user is not logged into SciServer (use Authentication.login for that purpose). Throws an exception if the HTTP request to the CasJobs API returns an error after all retries.
     :example: response = CasJobs.uploadPandasDataFrameToTable(CasJobs.getPandasDataFrameFromQuery("select 1 as foo", context="MyDB"), "NewTableFromDataFrame")
 
     .. seealso:: CasJobs.uploadCSVDataToTable
     """
-    try:
+    if Config.isSciServerComputeEnvironment():
+        taskName = "Compute.SciScript-Python.CasJobs.uploadPandasDataFrameToTable"
+    else:
+        taskName = "SciScript-Python.CasJobs.uploadPandasDataFrameToTable"
 
-        if Config.isSciServerComputeEnvironment():
-            task.name = "Compute.SciScript-Python.CasJobs.uploadPandasDataFrameToTable"
-        else:
-            task.name = "SciScript-Python.CasJobs.uploadPandasDataFrameToTable"
+    token = Authentication.getToken()
+    if token is None or token == "":
+        raise Exception("User token is not defined. First log into SciServer.")
+
+    batchSize = Config.UploadBatchSize if batchSize is None else batchSize
+    numThreads = numThreads if numThreads else Config.UploadMaxWorkers
+    retries = Config.UploadRetries if retries is None else retries
+
+    batches = _iterCSVBatches(dataFrame, batchSize if batchSize else max(len(dataFrame), 1))
+
+    # the first batch creates the table, so that the following ones can be appended to it concurrently.
+    _uploadCSVBatch(next(batches), tableName, context, taskName, retries)
+
+    futures = set()
+    with ThreadPoolExecutor(max_workers=max(1, numThreads)) as executor:
+        try:
+            for csvData in batches:
+                # the next batch is encoded while the previous ones are uploaded, but only when a thread is free.
+                if len(futures) >= numThreads:
+                    (done, futures) = wait(futures, return_when=FIRST_COMPLETED)
+                    for future in done:
+                        future.result()
+                futures.add(executor.submit(_uploadCSVBatch, csvData, tableName, context, taskName, retries))
+            for future in futures:
+                future.result()
+        except BaseException:
+            for future in futures:
+                future.cancel()
+            raise
 
-        if dataFrame.index.name is not None and dataFrame.index.name != "":
-            sio = dataFrame.to_csv().encode("utf8")
+    return True
+
+
+def _iterCSVBatches(dataFrame, batchSize):
+    """
+    Yields the CSV encoding (bytes), with a header line, of consecutive batches of at most batchSize rows of a pandas.DataFrame. At least one batch is yielded.
+    """
+    withIndex = dataFrame.index.name is not None and dataFrame.index.name != ""
+    for start in range(0, max(len(dataFrame), 1), batchSize):
+        batch = dataFrame.iloc[start:start + batchSize]
+        if withIndex:
+            yield batch.to_csv().encode("utf8")
         else:
-            sio = dataFrame.to_csv(index_label=False, index=False).encode("utf8")
+            yield batch.to_csv(index_label=False, index=False).encode("utf8")
 
-        return uploadCSVDataToTable(sio, tableName, context)
 
-    except Exception as e:
-        raise e
+def _uploadCSVBatch(csvData, tableName, context, taskName, retries):
+    attempt = 0
+    while True:
+        try:
+            return _uploadCSVData(csvData, tableName, context, taskName)
+        except Exception:
+            if attempt >= retries:
+                raise
+            time.sleep(min(0.5 * 2 ** attempt, 10))
+            attempt += 1
+
 
 def uploadCSVDataToTable(csvData, tableName, context="MyDB"):
     """
@@ -472,16 +1549,25 @@ def uploadCSVDataToTable(csvData, tableName, context="MyDB"):
             else:
                 taskName = "SciScript-Python.CasJobs.uploadCSVDataToTable"
 
-        tablesUrl = Config.CasJobsRESTUri + "/contexts/" + context + "/Tables/" + tableName + "?TaskName=" + taskName
+        return _uploadCSVData(csvData, tableName, context, taskName)
 
-        headers={}
-        headers['X-Auth-Token']= token
-
-        postResponse = requests.post(tablesUrl,data=csvData,headers=headers, stream=True)
-        if postResponse.status_code != 200:
-            raise Exception("Error when uploading CSV data into CasJobs table " + tableName + ".\nHttp Response from CasJobs API returned status code " + str(postResponse.status_code) + ":\n" + postResponse.content.decode());
+    else:
+        raise Exception("User token is not defined. First log into SciServer.")
 
-        return True
 
-    else:
+def _uploadCSVData(csvData, tableName, context, taskName):
+    token = Authentication.getToken()
+    if token is None or token == "":
         raise Exception("User token is not defined. First log into SciServer.")
+
+    tablesUrl = Config.CasJobsRESTUri + "/contexts/" + context + "/Tables/" + tableName + "?TaskName=" + taskName
+
+    headers={}
+    headers['X-Auth-Token']= token
+
+    postResponse = _Http.post(tablesUrl,data=csvData,headers=headers, stream=True)
+    if postResponse.status_code != 200:
+        raise Exception("Error when uploading CSV data into CasJobs table " + tableName + ".\nHttp Response from CasJobs API returned status code " + str(postResponse.status_code) + ":\n" + postResponse.content.decode());
+
+    _invalidateContext(context)
+    return True
@@ -24,6 +24,66 @@ Although these parameters must be set/defined by the admin or user before the in
 
 - **Config.SciqueryURL**: defines the base URL of the SciQuery web API (string). E.g., "https://apps.sciserver.org/sciquery-api".
 
+- **Config.HttpPoolConnections**: defines the number of hosts (integer) for which pooled keep-alive HTTP connections are kept open. E.g., 10
+
+- **Config.HttpPoolMaxSize**: defines the maximum number of keep-alive HTTP connections (integer) kept open per host. Should be at least as large as the number of threads calling the same SciServer service concurrently. E.g., 10
+
+- **Config.HttpAsyncPoolMaxSize**: defines the maximum number of connections (integer) opened per host by the asynchronous functions (such as CasJobs.executeQueryAsync), within each event loop. E.g., 100
+
+- **Config.FileServiceRegistryTTL**: defines the number of seconds (float) during which the definitions of the file services available to the user are cached and reused by the functions in the SciServer.Files module, instead of being fetched again. E.g., 300
+
+- **Config.RDBComputeDomainRegistryTTL**: defines the number of seconds (float) during which the RDB compute domains available to the user are cached and reused by the functions in the SciServer.SciQuery module, instead of being fetched again. E.g., 300
+
+- **Config.FileServiceMaxWorkers**: defines the maximum number of file service definitions (integer) that are fetched concurrently by Files.getFileServices. E.g., 8
+
+- **Config.FileServiceTimeout**: defines the number of seconds (float) to wait for a file service to respond when fetching its definition, after which the file service is skipped with a warning. E.g., 30
+
+- **Config.FileTransferChunkSize**: defines the size in bytes (integer) of the chunks in which files are streamed to or from the local disk by the SciServer.Files module, which bounds the memory used by a transfer. E.g., 8388608
+
+- **Config.FileTransferPartSize**: defines the size in bytes (integer) of the parts in which a file is split when transferred through several concurrent connections, or in a resumable way, by the SciServer.Files module. E.g., 67108864
+
+- **Config.FileServiceRangedUploads**: if True (boolean), then Files.upload uploads files in parts, each one with a Content-Range header, when 'partSize', 'numConnections' or 'resume' are set. This must only be enabled for file services that write each part at the offset given in its Content-Range header; the size of the uploaded file is checked afterwards, and the file is uploaded again in a single request if it is wrong. E.g., False
+
+- **Config.FileTransferMaxWorkers**: defines the default number of files (integer) transferred at the same time by the bulk transfer functions of the SciServer.Files module, such as Files.uploadFiles. E.g., 8
+
+- **Config.FileTransferRetries**: defines the default number of times (integer) that the bulk transfer functions of the SciServer.Files module retry a file transfer that failed with a connection error, a timeout, or an HTTP status code of 429 or 5xx. E.g., 3
+
+- **Config.ComputeLocalFileAccess**: if True (boolean), then inside SciServer-Compute the functions Files.upload, Files.download, Files.move and Files.dirList read and write directly the volumes mounted under Config.ComputeWorkDir, instead of sending HTTP requests to the FileService API. Paths whose volume is not mounted still go through the FileService API. E.g., True
+
+- **Config.QueryBatchSize**: defines the number of rows (integer) of a query result that are parsed and converted at a time by functions such as CasJobs.executeQuery, which bounds the memory used while a result is being received. E.g., 100000
+
+- **Config.QueryMaxWorkers**: defines the default number of queries (integer) executed at the same time by CasJobs.executeQueryPartitioned. E.g., 4
+
+- **Config.UploadBatchSize**: defines the default number of rows (integer) sent in each request by CasJobs.uploadPandasDataFrameToTable, or 0 for sending the whole dataframe in a single request. E.g., 100000
+
+- **Config.UploadMaxWorkers**: defines the default number of batches of rows (integer) uploaded at the same time by CasJobs.uploadPandasDataFrameToTable. E.g., 4
+
+- **Config.UploadRetries**: defines the default number of times (integer) that CasJobs.uploadPandasDataFrameToTable retries the upload of a failed batch of rows, which might then be appended twice, or 0 for not retrying it. E.g., 3
+
+- **Config.PollTime**: defines the default initial time interval (float, in seconds) between queries for the status of a job, in functions such as CasJobs.waitForJob, Jobs.waitForJob, SkyQuery.waitForJob or SciQuery.wait_for_job. Values below 0.1 are raised to 0.1. E.g., 0.5
+
+- **Config.PollMaxTime**: defines the default maximum time interval (float, in seconds) between queries for the status of a job, up to which the interval grows while the job is running. E.g., 30
+
+- **Config.PollBackoff**: defines the factor (float) by which the time interval between queries for the status of a job is multiplied after each query, which must be at least 1. E.g., 2.0
+
+- **Config.PollJitter**: defines the maximum relative amount (float) of random variation added to each time interval between queries for the status of a job. E.g., 0.1
+
+- **Config.CasJobsMetadataTTL**: defines the number of seconds (float) during which the schema name and table lists of the user, returned by CasJobs.getSchemaName and CasJobs.getTables, are cached in memory and under Config.CacheDir and reused instead of being fetched again. Set to 0 (the default) to disable the cache. E.g., 300
+
+- **Config.QueryCacheEnabled**: defines whether the results of read-only queries run with CasJobs.executeQuery are cached (boolean), so that running the same query again in the same database context returns the cached result without contacting CasJobs. E.g., False
+
+- **Config.QueryCacheTTL**: defines the number of seconds (float) during which a cached query result is used, for the database contexts not listed in Config.QueryCacheContextTTL. E.g., 86400
+
+- **Config.QueryCacheContextTTL**: defines the number of seconds (float) during which cached query results are used, for specific database contexts (dictionary of context name to seconds). E.g., {"DR16": 604800}
+
+- **Config.QueryCacheExcludedContexts**: defines the database contexts (list of strings) whose tables can change, and whose query results are therefore never cached. E.g., ["MyDB", "MyScratch"]
+
+- **Config.QueryCacheMaxMemory**: defines the maximum number of bytes (integer) of query results kept in memory by the query cache, after which the least recently used results are discarded. E.g., 536870912
+
+- **Config.QueryCachePersist**: defines whether cached query results are also stored under Config.CacheDir (boolean), so that they are kept across Python sessions. Tables are stored in Apache Parquet format, which requires the 'pyarrow' package. E.g., True
+
+- **Config.CacheDir**: defines the local directory (string) where the SciServer package keeps cached data and the state of resumable transfers. E.g., "~/.cache/sciserver"
+
 - **Config.version**: defines the SciServer release version tag (string), to which this package belongs. E.g., "sciserver-v1.9.3"
 """
 # URLs for accessing SciServer web services (API endpoints)
@@ -41,6 +101,39 @@ ComputeUrl = "https://apps.sciserver.org/compute"
 SciqueryURL = "https://apps.sciserver.org/sciquery-api"
 ComputeWorkDir = "/home/idies/workspace/"
 
+# pooled keep-alive connections used for all HTTP requests to the SciServer web services
+HttpPoolConnections = 10 # number of hosts for which a connection pool is kept
+HttpPoolMaxSize = 10 # maximum number of connections kept open per host
+HttpAsyncPoolMaxSize = 100 # maximum number of connections per host used by the asynchronous functions
+
+FileServiceRegistryTTL = 300 # seconds during which the file service definitions are cached
+RDBComputeDomainRegistryTTL = 300 # seconds during which the SciQuery RDB compute domains are cached
+FileServiceMaxWorkers = 8 # maximum number of file service definitions fetched concurrently
+FileServiceTimeout = 30 # seconds to wait for each file service definition
+FileTransferChunkSize = 8 * 1024 * 1024 # bytes streamed to or from disk at a time in file transfers
+FileTransferPartSize = 64 * 1024 * 1024 # bytes transferred per request in parallel or resumable file transfers
+FileServiceRangedUploads = False # upload files in parts with Content-Range headers
+FileTransferMaxWorkers = 8 # default number of files transferred concurrently in bulk transfers
+FileTransferRetries = 3 # default number of retries of each file in bulk transfers
+QueryBatchSize = 100000 # rows of a query result parsed and converted at a time
+QueryMaxWorkers = 4 # queries executed concurrently in partitioned queries
+UploadBatchSize = 100000 # rows of a table uploaded per request, or 0 for a single request
+UploadMaxWorkers = 4 # batches of rows of a table uploaded concurrently
+UploadRetries = 3 # retries of each batch of rows of a table upload, which are not idempotent
+PollTime = 0.5 # initial seconds between queries for the status of a job
+PollMaxTime = 30 # maximum seconds between queries for the status of a job
+PollBackoff = 2.0 # growth factor of the interval between queries for the status of a job
+PollJitter = 0.1 # maximum relative random variation of the interval between queries for the status of a job
+CasJobsMetadataTTL = 0 # seconds during which the CasJobs schema name and table lists are cached
+QueryCacheEnabled = False # cache the results of read-only CasJobs queries
+QueryCacheTTL = 24 * 60 * 60 # seconds during which a cached query result is used
+QueryCacheContextTTL = {} # seconds during which cached query results are used, per database context
+QueryCacheExcludedContexts = ["MyDB", "MyScratch"] # database contexts whose query results are never cached
+QueryCacheMaxMemory = 512 * 1024 * 1024 # bytes of query results cached in memory
+QueryCachePersist = True # also store cached query results under CacheDir
+ComputeLocalFileAccess = True # use the volumes mounted under ComputeWorkDir instead of the FileService API inside SciServer-Compute
+CacheDir = os.path.join(os.environ.get('XDG_CACHE_HOME', os.path.join(os.path.expanduser('~'), '.cache')), 'sciserver')
+
 
 def _load_config(filename):
     if os.path.exists(filename):
@@ -49,6 +142,12 @@ def _load_config(filename):
             global CasJobsRESTUri, AuthenticationURL, SciDriveHost, SkyQueryUrl, SkyServerWSurl
             global RacmApiURL, DataRelease, KeystoneTokenPath, version, ComputeJobDirectoryFile
             global ComputeUrl, SciqueryURL, ComputeWorkDir
+            global HttpPoolConnections, HttpPoolMaxSize, HttpAsyncPoolMaxSize
+            global RDBComputeDomainRegistryTTL, FileServiceRegistryTTL, FileServiceMaxWorkers, FileServiceTimeout, FileTransferChunkSize
+            global FileTransferPartSize, FileServiceRangedUploads, FileTransferMaxWorkers, FileTransferRetries, CacheDir
+            global ComputeLocalFileAccess, QueryBatchSize, QueryMaxWorkers, UploadBatchSize, UploadMaxWorkers, UploadRetries
+            global PollTime, PollMaxTime, PollBackoff, PollJitter
+            global CasJobsMetadataTTL, QueryCacheEnabled, QueryCacheTTL, QueryCacheContextTTL, QueryCacheExcludedContexts, QueryCacheMaxMemory, QueryCachePersist
             CasJobsRESTUri = _config_data.get('CasJobsRESTUri', CasJobsRESTUri)
             AuthenticationURL = _config_data.get('AuthenticationURL', AuthenticationURL)
             SciDriveHost = _config_data.get('SciDriveHost', SciDriveHost)
@@ -62,6 +161,36 @@ def _load_config(filename):
             ComputeUrl = _config_data.get('ComputeUrl', ComputeUrl)
             SciqueryURL = _config_data.get('SciqueryURL', SciqueryURL)
             ComputeWorkDir = _config_data.get('ComputeWorkDir', ComputeWorkDir)
+            HttpPoolConnections = _config_data.get('HttpPoolConnections', HttpPoolConnections)
+            HttpPoolMaxSize = _config_data.get('HttpPoolMaxSize', HttpPoolMaxSize)
+            HttpAsyncPoolMaxSize = _config_data.get('HttpAsyncPoolMaxSize', HttpAsyncPoolMaxSize)
+            FileServiceRegistryTTL = _config_data.get('FileServiceRegistryTTL', FileServiceRegistryTTL)
+            RDBComputeDomainRegistryTTL = _config_data.get('RDBComputeDomainRegistryTTL', RDBComputeDomainRegistryTTL)
+            FileServiceMaxWorkers = _config_data.get('FileServiceMaxWorkers', FileServiceMaxWorkers)
+            FileServiceTimeout = _config_data.get('FileServiceTimeout', FileServiceTimeout)
+            FileTransferChunkSize = _config_data.get('FileTransferChunkSize', FileTransferChunkSize)
+            FileTransferPartSize = _config_data.get('FileTransferPartSize', FileTransferPartSize)
+            FileServiceRangedUploads = _config_data.get('FileServiceRangedUploads', FileServiceRangedUploads)
+            FileTransferMaxWorkers = _config_data.get('FileTransferMaxWorkers', FileTransferMaxWorkers)
+            FileTransferRetries = _config_data.get('FileTransferRetries', FileTransferRetries)
+            CacheDir = _config_data.get('CacheDir', CacheDir)
+            ComputeLocalFileAccess = _config_data.get('ComputeLocalFileAccess', ComputeLocalFileAccess)
+            QueryBatchSize = _config_data.get('QueryBatchSize', QueryBatchSize)
+            QueryMaxWorkers = _config_data.get('QueryMaxWorkers', QueryMaxWorkers)
+            UploadBatchSize = _config_data.get('UploadBatchSize', UploadBatchSize)
+            UploadMaxWorkers = _config_data.get('UploadMaxWorkers', UploadMaxWorkers)
+            UploadRetries = _config_data.get('UploadRetries', UploadRetries)
+            PollTime = _config_data.get('PollTime', PollTime)
+            PollMaxTime = _config_data.get('PollMaxTime', PollMaxTime)
+            PollBackoff = _config_data.get('PollBackoff', PollBackoff)
+            PollJitter = _config_data.get('PollJitter', PollJitter)
+            CasJobsMetadataTTL = _config_data.get('CasJobsMetadataTTL', CasJobsMetadataTTL)
+            QueryCacheEnabled = _config_data.get('QueryCacheEnabled', QueryCacheEnabled)
+            QueryCacheTTL = _config_data.get('QueryCacheTTL', QueryCacheTTL)
+            QueryCacheContextTTL = _config_data.get('QueryCacheContextTTL', QueryCacheContextTTL)
+            QueryCacheExcludedContexts = _config_data.get('QueryCacheExcludedContexts', QueryCacheExcludedContexts)
+            QueryCacheMaxMemory = _config_data.get('QueryCacheMaxMemory', QueryCacheMaxMemory)
+            QueryCachePersist = _config_data.get('QueryCachePersist', QueryCachePersist)
 
 _CONFIG_DIR = os.environ.get('XDG_CONFIG_HOME', os.path.join(os.path.expanduser('~'), '.config'))
 _SCISERVER_SYSTEM_CONFIG_DIR = '/etc/' # will not likely exist on non *nix systems
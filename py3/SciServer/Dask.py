@@ -1,4 +1,3 @@
-import requests
 from requests.exceptions import HTTPError
 from base64 import b64decode
 from pathlib import Path
@@ -7,6 +6,7 @@ from distributed.security import Security
 from os.path import expanduser
 import SciServer.Authentication
 import SciServer.Config
+import SciServer._Http
 import json
 
 def getClient(ref_id=None):
@@ -31,7 +31,7 @@ def getClient(ref_id=None):
             data = json.load(f)
     else:
         try:
-            response = requests.get(''.join([SciServer.Config.ComputeUrl.rstrip('/'), '/api/dask/clusters/', ref_id]),
+            response = SciServer._Http.get(''.join([SciServer.Config.ComputeUrl.rstrip('/'), '/api/dask/clusters/', ref_id]),
                                     params = {'connectionInfo': 'true'},
                                     headers = {'X-Auth-Token': token})
             response.raise_for_status()
@@ -1,12 +1,26 @@
 __author__ = 'mtaghiza'
 
-from SciServer import Authentication, Config
-import requests
+from SciServer import Authentication, Config, _Http
+import asyncio
 import json
 from io import StringIO
 from io import BytesIO
 import warnings
 import os
+import requests
+import hashlib
+import shutil
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from datetime import datetime, timezone
+
+
+_fileServiceRegistry = {}
+_fileServiceRegistryLock = threading.RLock()
+_fileServiceFetchLocks = {}
+_fileServiceRegistryVersion = 0
+_rangedUploadSupport = {}
 
 
 def getFileServices(verbose=True):
@@ -18,52 +32,124 @@ def getFileServices(verbose=True):
     :raises: Throws an exception if the user is not logged into SciServer (use Authentication.login for that purpose). Throws an exception if the HTTP request to the RACM API returns an error.
     :example: fileServices = Files.getFileServices();
 
-    .. seealso:: Files.getFileServiceFromName
+    .. seealso:: Files.getFileServiceFromName, Files.invalidateFileServices
     """
     token = Authentication.getToken()
     if token is not None and token != "":
+        fileServices = _fetchFileServices(token, verbose)
+        _setFileServiceRegistry(token, fileServices)
+        return fileServices;
+    else:
+        raise Exception("User token is not defined. First log into SciServer.")
 
-        if Config.isSciServerComputeEnvironment():
-            taskName = "Compute.SciScript-Python.Files.getFileServices"
-        else:
-            taskName = "SciScript-Python.Files.getFileServices"
 
-        url = Config.RacmApiURL + "/storem/fileservices?TaskName="+taskName;
+def _fetchFileServices(token, verbose=True):
+    if Config.isSciServerComputeEnvironment():
+        taskName = "Compute.SciScript-Python.Files.getFileServices"
+    else:
+        taskName = "SciScript-Python.Files.getFileServices"
 
-        headers = {'X-Auth-Token': token}
-        res = requests.get(url, headers=headers)
+    url = Config.RacmApiURL + "/storem/fileservices?TaskName="+taskName;
 
-        if res.status_code >= 200 and res.status_code < 300:
-            fileServices = [];
-            fileServicesAPIs = json.loads(res.content.decode())
-            for fileServicesAPI in fileServicesAPIs:
-                url = fileServicesAPI.get("apiEndpoint")
-                name = fileServicesAPI.get("name")
-                url = url + "api/volumes/?TaskName="+taskName;
-                try:
-                    res = requests.get(url, headers=headers)
-                except:
-                    if verbose:
-                        warnings.warn("Error when getting definition of FileService named '" + name + "' with API URL '" + fileServicesAPI.get("apiEndpoint") + "'. This FileService might be not available", Warning, stacklevel=2)
-
-                if res.status_code >= 200 and res.status_code < 300:
-                    fileServices.append(json.loads(res.content.decode()));
-                else:
-                    if verbose:
-                        warnings.warn("Error when getting definition of FileService named '" + name + "'.\nHttp Response from FileService API returned status code " + str(res.status_code) + ":\n" + res.content.decode(),Warning, stacklevel=2)
+    headers = {'X-Auth-Token': token}
+    res = _Http.get(url, headers=headers)
+
+    if res.status_code >= 200 and res.status_code < 300:
+        fileServices = [];
+        fileServicesAPIs = json.loads(res.content.decode())
+        if fileServicesAPIs.__len__() == 0:
             return fileServices;
-        else:
-            raise Exception("Error when getting the list of FileServices.\nHttp Response from FileService API returned status code " + str(res.status_code) + ":\n" + res.content.decode());
+
+        # the definitions are fetched concurrently, but the warnings are issued from this thread and in the original order of the file services.
+        maxWorkers = max(1, min(Config.FileServiceMaxWorkers, fileServicesAPIs.__len__()))
+        with ThreadPoolExecutor(max_workers=maxWorkers) as executor:
+            futures = [executor.submit(_Http.get, fileServicesAPI.get("apiEndpoint") + "api/volumes/?TaskName="+taskName, headers=headers, timeout=Config.FileServiceTimeout) for fileServicesAPI in fileServicesAPIs]
+
+        for fileServicesAPI, future in zip(fileServicesAPIs, futures):
+            name = fileServicesAPI.get("name")
+            try:
+                res = future.result()
+            except:
+                if verbose:
+                    warnings.warn("Error when getting definition of FileService named '" + name + "' with API URL '" + fileServicesAPI.get("apiEndpoint") + "'. This FileService might be not available", Warning, stacklevel=2)
+                continue
+
+            if res.status_code >= 200 and res.status_code < 300:
+                fileServices.append(json.loads(res.content.decode()));
+            else:
+                if verbose:
+                    warnings.warn("Error when getting definition of FileService named '" + name + "'.\nHttp Response from FileService API returned status code " + str(res.status_code) + ":\n" + res.content.decode(),Warning, stacklevel=2)
+        return fileServices;
     else:
+        raise _FileServiceError("Error when getting the list of FileServices.\nHttp Response from FileService API returned status code " + str(res.status_code) + ":\n" + res.content.decode(), res.status_code);
+
+
+def _setFileServiceRegistry(token, fileServices, version=None):
+    byName = {}
+    byIdentifier = {}
+    for fileService in fileServices:
+        byName.setdefault(fileService.get('name'), fileService)
+        byIdentifier.setdefault(fileService.get('identifier'), fileService)
+    registry = {"fileServices": list(fileServices), "byName": byName, "byIdentifier": byIdentifier, "time": time.monotonic()}
+    with _fileServiceRegistryLock:
+        # a registry fetched before a call to Files.invalidateFileServices() is returned, but not published.
+        if version is not None and version != _fileServiceRegistryVersion:
+            return registry
+        now = registry["time"]
+        for key in [key for key, value in _fileServiceRegistry.items() if now - value["time"] >= Config.FileServiceRegistryTTL]:
+            del _fileServiceRegistry[key]
+            _fileServiceFetchLocks.pop(key, None)
+        _fileServiceRegistry[token] = registry
+    return registry
+
+
+def _getFileServiceRegistry(verbose=True):
+    """
+    Returns the registry of file services available to the logged-in user, as a dictionary with the list of FileService objects under the key "fileServices", and indexes of them by name and identifier under the keys "byName" and "byIdentifier".
+    The registry is kept per user token, and fetched again with Files.getFileServices() only when it is older than Config.FileServiceRegistryTTL seconds or after Files.invalidateFileServices() is called.
+    """
+    token = Authentication.getToken()
+    if token is None or token == "":
         raise Exception("User token is not defined. First log into SciServer.")
 
+    registry = _fileServiceRegistry.get(token)
+    if registry is not None and time.monotonic() - registry["time"] < Config.FileServiceRegistryTTL:
+        return registry
+
+    with _fileServiceRegistryLock:
+        fetchLock = _fileServiceFetchLocks.setdefault(token, threading.Lock())
+
+    # only one thread per token fetches the file services, while the rest for that token wait for its result. The global
+    # lock is not held during the HTTP requests, so that the lookups of other tokens are not blocked.
+    with fetchLock:
+        with _fileServiceRegistryLock:
+            registry = _fileServiceRegistry.get(token)
+            version = _fileServiceRegistryVersion
+        if registry is not None and time.monotonic() - registry["time"] < Config.FileServiceRegistryTTL:
+            return registry
+        return _setFileServiceRegistry(token, _fetchFileServices(token, verbose), version)
+
+
+def invalidateFileServices():
+    """
+    Clears the cached definitions of the file services, so that they are fetched again from the RACM and FileService APIs in the next call to a Files function. This is done automatically after creating, deleting or sharing a user volume with the functions in this module.
+
+    :example: Files.invalidateFileServices();
+
+    .. seealso:: Files.getFileServices, Config.FileServiceRegistryTTL
+    """
+    global _fileServiceRegistryVersion
+    with _fileServiceRegistryLock:
+        _fileServiceRegistryVersion += 1
+        _fileServiceRegistry.clear()
+        _rangedUploadSupport.clear()
 
 
 def getFileServicesNames(fileServices=None, verbose=True):
     """
     Returns the names and description of the fileServices available to the user.
 
-    :param fileServices: a list of FileService objects (dictionaries), as returned by Files.getFileServices(). If not set, then an extra internal call to Jobs.getFileServices() is made.
+    :param fileServices: a list of FileService objects (dictionaries), as returned by Files.getFileServices(). If not set, then the file services cached for the user are used, and fetched only if the cache is empty or older than Config.FileServiceRegistryTTL seconds.
     :param verbose: boolean parameter defining whether warnings will be printed (set to True) or not (set to False).
     :return: an array of dicts, where each dict has the name and description of a file service available to the user.
     :raises: Throws an exception if the user is not logged into SciServer (use Authentication.login for that purpose). Throws an exception if the HTTP request to the RACM API returns an error.
@@ -73,7 +159,7 @@ def getFileServicesNames(fileServices=None, verbose=True):
     """
 
     if fileServices is None:
-        fileServices = getFileServices(verbose);
+        fileServices = _getFileServiceRegistry(verbose)["fileServices"];
 
     fileServiceNames = [];
     for fileService in fileServices:
@@ -90,7 +176,7 @@ def getFileServiceFromName(fileServiceName, fileServices=None, verbose=True):
     Returns a FileService object, given its registered name.
 
     :param fileServiceName: name of the FileService, as shown within the results of Files.getFileServices()
-    :param fileServices: a list of FileService objects (dictionaries), as returned by Files.getFileServices(). If not set, then an extra internal call to Jobs.getFileServices() is made.
+    :param fileServices: a list of FileService objects (dictionaries), as returned by Files.getFileServices(). If not set, then the file services cached for the user are used, and fetched only if the cache is empty or older than Config.FileServiceRegistryTTL seconds.
     :param verbose: boolean parameter defining whether warnings will be printed (set to True) or not (set to False).
     :return: a FileService object (dictionary) that defines a FileService. A list of these kind of objects available to the user is returned by the function Jobs.getFileServices(). If no fileService can be found, then returns None.
     :raises: Throws an exception if the user is not logged into SciServer (use Authentication.login for that purpose). Throws an exception if the HTTP request to the RACM API returns an error.
@@ -103,7 +189,11 @@ def getFileServiceFromName(fileServiceName, fileServices=None, verbose=True):
         raise Exception("fileServiceName is not defined.")
     else:
         if fileServices is None:
-            fileServices = getFileServices(verbose);
+            registry = _getFileServiceRegistry(verbose)
+            fileService = registry["byName"].get(fileServiceName)
+            if fileService is not None:
+                return fileService;
+            fileServices = registry["fileServices"]
 
         if fileServices.__len__() > 0:
             for fileService in fileServices:
@@ -134,8 +224,7 @@ def __getFileServiceAPIUrl(fileService):
 
     url = None;
     if type(fileService) == type(""):
-        fileServices = getFileServices(False);
-        _fileService = getFileServiceFromName(fileService, fileServices, verbose=False);
+        _fileService = getFileServiceFromName(fileService, verbose=False);
         url = _fileService.get("apiEndpoint");
 
     else:
@@ -147,6 +236,155 @@ def __getFileServiceAPIUrl(fileService):
     return url
 
 
+def _getFileServiceResourceUrl(fileService, path, api):
+    """
+    Gets the URL of a resource (file, folder, etc) in a FileService API, without the query string.
+
+    :param fileService: object (dictionary) that defines a file service.
+    :param path: path of the resource (string), starting from the root volume level or data volume level.
+    :param api: name of the FileService API endpoint (string), such as "file", "jsontree" or "data".
+    :return: URL of the resource (string).
+    """
+    (topVolume, userVolumeOwner, userVolume, relativePath, isTopVolumeARootVolume) = splitPath(path, fileService);
+
+    if isTopVolumeARootVolume:
+        return __getFileServiceAPIUrl(fileService) + "api/" + api + "/" + topVolume + "/" + userVolumeOwner + "/" + userVolume + "/" + relativePath
+    else:
+        return __getFileServiceAPIUrl(fileService) + "api/" + api + "/" + topVolume + "/" + relativePath
+
+
+def _getDownloadResult(res, format, path, content=None):
+    content = res.content if content is None else content
+    if format is not None and format != "":
+        if format == "StringIO":
+            return StringIO(content.decode())
+        if format == "txt":
+            return content.decode()
+        elif format == "BytesIO":
+            return BytesIO(content)
+        elif format == "response":
+            return res;
+        else:
+            raise Exception("Unknown format '" + format + "' when trying to download from remote File System the file " + str(path) + ".\n");
+    else:
+        raise Exception("Wrong format parameter value\n");
+
+
+def _getMountedPath(fileService, path):
+    """
+    Inside SciServer-Compute, returns the local path (string) under Config.ComputeWorkDir where the file or directory 'path' of the file service is mounted. Returns None if not running in SciServer-Compute, if Config.ComputeLocalFileAccess is False, or if the volume containing 'path' is not mounted.
+    """
+    if not Config.ComputeLocalFileAccess or not Config.isSciServerComputeEnvironment():
+        return None
+
+    (topVolume, userVolumeOwner, userVolume, relativePath, isTopVolumeARootVolume) = splitPath(path, fileService);
+    if isTopVolumeARootVolume:
+        volumePath = os.path.join(Config.ComputeWorkDir, topVolume, userVolumeOwner, userVolume)
+    else:
+        volumePath = os.path.join(Config.ComputeWorkDir, topVolume)
+
+    if not os.path.isdir(volumePath):
+        return None
+    return os.path.join(volumePath, *[part for part in relativePath.split("/") if part != ""])
+
+
+def _copyLocalFile(sourcePath, destinationPath):
+    """
+    Copies a local file into destinationPath through a temporary file that is renamed atomically, using the zero-copy system calls copy_file_range or sendfile when available.
+    Returns the number of bytes copied.
+    """
+    if os.path.dirname(destinationPath) != "":
+        os.makedirs(os.path.dirname(destinationPath), exist_ok=True)
+    tempFilePath = _Http.getTempFilePath(destinationPath)
+    try:
+        with open(sourcePath, "rb") as source, open(tempFilePath, "xb") as destination:
+            size = os.fstat(source.fileno()).st_size
+            copied = 0
+            for copy in (_copyFileRange, _sendFile):
+                copied = copy(source.fileno(), destination.fileno(), size)
+                if copied is not None:
+                    break
+            if copied is None:
+                shutil.copyfileobj(source, destination, Config.FileTransferChunkSize)
+                copied = size
+        os.replace(tempFilePath, destinationPath)
+        return copied
+    except BaseException:
+        if os.path.exists(tempFilePath):
+            os.remove(tempFilePath)
+        raise
+
+
+def _copyFileRange(sourceFd, destinationFd, size):
+    # copies within the kernel, or even within the storage server for network file systems that support it.
+    if not hasattr(os, "copy_file_range"):
+        return None
+    copied = 0
+    while copied < size:
+        try:
+            n = os.copy_file_range(sourceFd, destinationFd, size - copied)
+        except OSError:
+            if copied == 0:
+                return None
+            raise
+        if n == 0:
+            # nothing is copied by some file systems that do not support the call, so the next method is tried.
+            if copied == 0:
+                return None
+            break
+        copied += n
+    if copied < size:
+        raise Exception("Error when copying local file. Only " + str(copied) + " of " + str(size) + " bytes were copied.")
+    return copied
+
+
+def _sendFile(sourceFd, destinationFd, size):
+    if not hasattr(os, "sendfile"):
+        return None
+    copied = 0
+    while copied < size:
+        try:
+            n = os.sendfile(destinationFd, sourceFd, copied, size - copied)
+        except OSError:
+            if copied == 0:
+                return None
+            raise
+        if n == 0:
+            if copied == 0:
+                return None
+            break
+        copied += n
+    if copied < size:
+        raise Exception("Error when copying local file. Only " + str(copied) + " of " + str(size) + " bytes were copied.")
+    return copied
+
+
+def _getLocalDirList(localPath, level):
+    """
+    Returns a listing of a local directory in the same format as the one returned by the FileService API for Files.dirList.
+    """
+    stat = os.stat(localPath)
+    node = {"name": os.path.basename(localPath.rstrip(os.sep)), "lastModified": _formatLastModified(stat.st_mtime)}
+    if level > 0:
+        folders = []
+        files = []
+        for entry in sorted(os.scandir(localPath), key=lambda entry: entry.name):
+            if entry.is_dir():
+                folders.append(_getLocalDirList(entry.path, level - 1))
+            else:
+                entryStat = entry.stat()
+                files.append({"name": entry.name, "size": entryStat.st_size, "lastModified": _formatLastModified(entryStat.st_mtime)})
+        if folders.__len__() > 0:
+            node["folders"] = folders
+        if files.__len__() > 0:
+            node["files"] = files
+    return node
+
+
+def _formatLastModified(timestamp):
+    return datetime.fromtimestamp(timestamp, tz=timezone.utc).strftime("%Y-%m-%dT%H:%M:%S.%f")[:-3] + "Z"
+
+
 def getRootVolumesInfo(fileService, verbose=True):
     """
     Gets the names and descriptions of root volumes available to the user in a particular FileService.
@@ -302,12 +540,12 @@ def createUserVolume(fileService, path, quiet=True):
         url = __getFileServiceAPIUrl(fileService) + "api/volume/" + rootVolume + "/" + userVolumeOwner + "/" + userVolume + "?quiet="+str(quiet) + "&TaskName="+taskName;
 
         headers = {'X-Auth-Token': token}
-        res = requests.put(url, headers=headers)
+        res = _Http.put(url, headers=headers)
 
         if res.status_code >= 200 and res.status_code < 300:
-            pass;
+            invalidateFileServices()
         else:
-            raise Exception("Error when creating user volume  '" + str(path) + "' in file service '" + str(fileService.get('name')) + "'.\nHttp Response from FileService API returned status code " + str(res.status_code) + ":\n" + res.content.decode());
+            raise _FileServiceError("Error when creating user volume  '" + str(path) + "' in file service '" + str(fileService.get('name')) + "'.\nHttp Response from FileService API returned status code " + str(res.status_code) + ":\n" + res.content.decode(), res.status_code);
     else:
         raise Exception("User token is not defined. First log into SciServer.")
 
@@ -340,12 +578,12 @@ def deleteUserVolume(fileService, path, quiet=True):
         url = __getFileServiceAPIUrl(fileService) + "api/volume/" + rootVolume + "/" + userVolumeOwner + "/" + userVolume + "?quiet="+str(quiet)+"&TaskName="+taskName;
 
         headers = {'X-Auth-Token': token}
-        res = requests.delete(url, headers=headers)
+        res = _Http.delete(url, headers=headers)
 
         if res.status_code >= 200 and res.status_code < 300:
-            pass
+            invalidateFileServices()
         else:
-            raise Exception("Error when deleting user volume '" + str(path) + "' in file service '" + str(fileService.get('name')) + "'.\nHttp Response from FileService API returned status code " + str(res.status_code) + ":\n" + res.content.decode());
+            raise _FileServiceError("Error when deleting user volume '" + str(path) + "' in file service '" + str(fileService.get('name')) + "'.\nHttp Response from FileService API returned status code " + str(res.status_code) + ":\n" + res.content.decode(), res.status_code);
     else:
         raise Exception("User token is not defined. First log into SciServer.")
 
@@ -381,19 +619,19 @@ def createDir(fileService, path, quiet=True):
             url = __getFileServiceAPIUrl(fileService) + "api/folder/" + topVolume + "/" + relativePath + "?quiet=" + str(quiet) + "&TaskName=" + taskName;
 
         headers = {'X-Auth-Token': token}
-        res = requests.put(url, headers=headers)
+        res = _Http.put(url, headers=headers)
 
         if res.status_code >= 200 and res.status_code < 300:
             pass;
         else:
-            raise Exception("Error when creating directory '" + str(path) + "' in file service '" + str(fileService.get('name')) + "'.\nHttp Response from FileService API returned status code " + str(res.status_code) + ":\n" + res.content.decode());
+            raise _FileServiceError("Error when creating directory '" + str(path) + "' in file service '" + str(fileService.get('name')) + "'.\nHttp Response from FileService API returned status code " + str(res.status_code) + ":\n" + res.content.decode(), res.status_code);
     else:
         raise Exception("User token is not defined. First log into SciServer.")
 
 
-def upload(fileService, path, data="", localFilePath=None, quiet=True):
+def upload(fileService, path, data="", localFilePath=None, quiet=True, partSize=None, numConnections=1, resume=False, verbose=False):
     """
-    Uploads data or a local file into a path defined in the file system.
+    Uploads data or a local file into a path defined in the file system. Inside SciServer-Compute, volumes mounted under Config.ComputeWorkDir are accessed directly instead of through the FileService API (see Config.ComputeLocalFileAccess).
 
     :param fileService: name of fileService (string), or object (dictionary) that defines a file service. A list of these kind of objects available to the user is returned by the function Files.getFileServices().
     :param path: path (in the remote file service) to the destination file (string), starting from the root volume level or data volume level. Examples: rootVolume/userVolumeOwner/userVolume/destinationFile.txt or dataVolume/destinationFile.txt
@@ -401,6 +639,10 @@ def upload(fileService, path, data="", localFilePath=None, quiet=True):
     :param localFilePath: path to a local file to be uploaded (string),
     :param userVolumeOwner: name (string) of owner of the userVolume. Can be left undefined if requester is the owner of the user volume.
     :param quiet: If set to False, it will throw an error if the file already exists. If set to True. it will not throw an error.
+    :param partSize: size in bytes (integer) of the parts in which the data or local file is uploaded, each one as a separate HTTP request carrying a Content-Range header. If not set, then Config.FileTransferPartSize is used when 'numConnections' is larger than 1 or 'resume' is True, and otherwise the whole data or file is uploaded in a single request. Uploads in parts are only used if Config.FileServiceRangedUploads is set to True, and the size of the uploaded file is checked afterwards; otherwise, the whole data or file is uploaded in a single request.
+    :param numConnections: number of connections (integer) used for uploading the parts concurrently.
+    :param resume: if True, an upload of 'localFilePath' in parts that was interrupted continues after the parts already uploaded, as long as the local file has not changed since. The uploaded parts are recorded in a state file under Config.CacheDir.
+    :param verbose: if True, prints the size, duration and throughput of the upload.
     :raises: Throws an exception if the user is not logged into SciServer (use Authentication.login for that purpose). Throws an exception if the HTTP request to the FileService API returns an error.
     :example: fileServices = Files.getFileServices(); Files.upload(fileServices[0], "myRootVolume/myUserName/myUserVolume/myUploadedFile.txt", None, localFilePath="/myFile.txt");
 
@@ -417,35 +659,293 @@ def upload(fileService, path, data="", localFilePath=None, quiet=True):
         if type(fileService) == str:
             fileService = getFileServiceFromName(fileService)
 
-        (topVolume, userVolumeOwner, userVolume, relativePath, isTopVolumeARootVolume) = splitPath(path, fileService);
+        mountedPath = _getMountedPath(fileService, path)
+        if mountedPath is not None:
+            if os.path.exists(mountedPath) and not quiet:
+                raise Exception("Error when uploading file to '" + str(path) + "' in file service '" + str(fileService.get('name')) + "'. File already exists.");
+            startTime = time.monotonic()
+            if localFilePath is not None and localFilePath != "":
+                nBytes = _copyLocalFile(localFilePath, mountedPath)
+            elif data is not None:
+                data = data.encode() if isinstance(data, str) else data
+                # the FileService API creates missing parent directories, and so does the mounted volume.
+                os.makedirs(os.path.dirname(mountedPath), exist_ok=True)
+                tempFilePath = _Http.getTempFilePath(mountedPath)
+                with open(tempFilePath, "xb") as f:
+                    f.write(data)
+                os.replace(tempFilePath, mountedPath)
+                nBytes = len(data)
+            else:
+                raise Exception("Error: No local file or data specified for uploading.");
+            if verbose:
+                print("Uploaded '" + str(path) + "': " + _Http.formatThroughput(nBytes, time.monotonic() - startTime))
+            return
 
-        if isTopVolumeARootVolume:
-            url = __getFileServiceAPIUrl(fileService) + "api/file/" + topVolume + "/" + userVolumeOwner + "/" + userVolume + "/" + relativePath + "?quiet=" + str(quiet) + "&TaskName="+taskName
+        url = _getFileServiceResourceUrl(fileService, path, "file") + "?quiet=" + str(quiet) + "&TaskName=" + taskName
+
+        headers = {'X-Auth-Token': token}
+
+        if partSize or numConnections > 1 or resume:
+            if localFilePath is None or localFilePath == "":
+                if data is None:
+                    raise Exception("Error: No local file or data specified for uploading.");
+                localFilePath = None
+                data = data.encode() if isinstance(data, str) else data
+
+            startTime = time.monotonic()
+            if _supportsRangedUploads(fileService):
+                nBytes = _uploadParts(fileService, path, _getFileServiceResourceUrl(fileService, path, "file"), taskName, headers, quiet, data, localFilePath,
+                                      partSize if partSize else Config.FileTransferPartSize, numConnections, resume)
+                if verbose:
+                    print("Uploaded '" + str(path) + "': " + _Http.formatThroughput(nBytes, time.monotonic() - startTime))
+                return
+            warnings.warn("Uploads in parts with Content-Range headers are not enabled for FileService '" + str(fileService.get('name')) + "' (see Config.FileServiceRangedUploads), so '" + str(path) + "' is uploaded in a single request.", Warning, stacklevel=2)
+
+        startTime = time.monotonic()
+        if localFilePath is not None and localFilePath != "":
+            with open(localFilePath, "rb") as file:
+                res = _Http.put(url, data=file, headers=headers, stream=True)
         else:
-            url = __getFileServiceAPIUrl(fileService) + "api/file/" + topVolume + "/" + relativePath + "?quiet=" + str(quiet) + "&TaskName=" + taskName
+            if data != None:
+                res = _Http.put(url, data=data, headers=headers, stream=True)
+            else:
+                raise Exception("Error: No local file or data specified for uploading.");
+
+        if res.status_code >= 200 and res.status_code < 300:
+            if verbose:
+                nBytes = os.path.getsize(localFilePath) if localFilePath else len(data.encode() if isinstance(data, str) else data)
+                print("Uploaded '" + str(path) + "': " + _Http.formatThroughput(nBytes, time.monotonic() - startTime))
+        else:
+            raise _FileServiceError("Error when uploading file to '" + str(path) + "' in file service '" + str(fileService.get('name')) + "'.\nHttp Response from FileService API returned status code " + str(res.status_code) + ":\n" + res.content.decode(), res.status_code);
+    else:
+        raise Exception("User token is not defined. First log into SciServer.")
+
+
+def _supportsRangedUploads(fileService):
+    """
+    Returns True if files can be uploaded in parts with Content-Range headers into the FileService: Config.FileServiceRangedUploads is True, and no upload in parts into it has resulted in a file of the wrong size.
+    """
+    if not Config.FileServiceRangedUploads:
+        return False
+    with _fileServiceRegistryLock:
+        return _rangedUploadSupport.get(__getFileServiceAPIUrl(fileService), True)
+
+
+def _getRemoteFileSize(url, headers):
+    """
+    Returns the size in bytes of a file in a FileService, read from the response to a request for its first byte, or None if it cannot be determined.
+    """
+    rangeHeaders = dict(headers)
+    rangeHeaders["Range"] = "bytes=0-0"
+    res = _Http.get(url, stream=True, headers=rangeHeaders)
+    try:
+        contentRange = res.headers.get("Content-Range", "")
+        if res.status_code in (206, 416) and "/" in contentRange and not contentRange.endswith("/*"):
+            return int(contentRange.rsplit("/", 1)[1])
+        if res.status_code == 200 and res.headers.get("Content-Length") is not None:
+            return int(res.headers["Content-Length"])
+        return None
+    finally:
+        res.close()
+
+
+class _FilePart:
+    """
+    File-like object that reads a byte range of a local file, so that it can be sent as the body of an HTTP request without loading it into memory.
+    """
+    def __init__(self, filePath, offset, length):
+        self.file = open(filePath, "rb")
+        self.file.seek(offset)
+        self.remaining = length
+        self.length = length
+
+    def __len__(self):
+        return self.length
+
+    def read(self, size=-1):
+        if size is None or size < 0 or size > self.remaining:
+            size = self.remaining
+        chunk = self.file.read(size)
+        self.remaining -= len(chunk)
+        return chunk
+
+    def close(self):
+        self.file.close()
+
+
+def _getUploadStateFilePath(fileService, path, localFilePath):
+    key = json.dumps([fileService.get("identifier"), path, os.path.abspath(localFilePath)])
+    return os.path.join(Config.CacheDir, "uploads", hashlib.sha1(key.encode()).hexdigest() + ".json")
+
+
+class _FileServiceError(Exception):
+    """
+    Exception raised when the FileService API returns an error, which carries the HTTP status code (integer) of the response in 'status_code'.
+    """
+    def __init__(self, message, status_code):
+        super().__init__(message)
+        self.status_code = status_code
+
+
+def _isTransientError(error):
+    """
+    Returns True if a failed transfer might succeed when retried: the error, or one that caused it, is a connection error or a timeout, or the FileService API returned a status code of 429 or 5xx.
+    """
+    while error is not None:
+        if isinstance(error, (requests.exceptions.ConnectionError, requests.exceptions.Timeout, requests.exceptions.ChunkedEncodingError)):
+            return True
+        if getattr(error, "status_code", None) is not None:
+            return error.status_code == 429 or error.status_code >= 500
+        error = error.__cause__ or error.__context__
+    return False
+
+
+def _uploadParts(fileService, path, url, taskName, headers, quiet, data, localFilePath, partSize, numConnections, resume):
+    """
+    Uploads data, or the content of localFilePath, as a sequence of HTTP PUT requests with a Content-Range header, each one carrying a part of partSize bytes, and returns the number of bytes uploaded.
+    The first part is uploaded before the rest, which are then uploaded concurrently through numConnections connections.
+    For local files, the indexes of the uploaded parts are recorded in a state file under Config.CacheDir, which allows resuming the upload later on.
+    Once all parts are uploaded, the size of the remote file is checked, and if it differs from the local size, the whole data or file is uploaded again in a single request.
+    """
+    size = os.path.getsize(localFilePath) if localFilePath is not None else len(data)
+    if size == 0:
+        res = _Http.put(url + "?quiet=" + str(quiet) + "&TaskName=" + taskName, data=b"", headers=headers)
+        if res.status_code < 200 or res.status_code >= 300:
+            raise _FileServiceError("Error when uploading file to '" + str(path) + "' in file service '" + str(fileService.get('name')) + "'.\nHttp Response from FileService API returned status code " + str(res.status_code) + ":\n" + res.content.decode(), res.status_code);
+        return 0
+
+    stateFilePath = None
+    state = {"fileService": fileService.get("identifier"), "path": path, "size": size, "partSize": partSize, "completedParts": []}
+    if localFilePath is not None:
+        stateFilePath = _getUploadStateFilePath(fileService, path, localFilePath)
+        state["localFilePath"] = os.path.abspath(localFilePath)
+        state["modified"] = os.path.getmtime(localFilePath)
+        previousState = _Http.readStateFile(stateFilePath) if resume else None
+        if previousState is not None and all(previousState.get(key) == value for key, value in state.items() if key != "completedParts"):
+            state["completedParts"] = previousState.get("completedParts", [])
+        else:
+            os.makedirs(os.path.dirname(stateFilePath), exist_ok=True)
+            _Http.writeStateFile(stateFilePath, state)
+
+    if len(state["completedParts"]) > 0:
+        # the parts already uploaded are only skipped if the remote file still holds them, e.g., it was not deleted meanwhile.
+        remoteSize = _getRemoteFileSize(url + "?TaskName=" + taskName, headers)
+        if remoteSize is None or remoteSize < min(size, (max(state["completedParts"]) + 1) * partSize):
+            state["completedParts"] = []
+            _Http.writeStateFile(stateFilePath, state)
+
+    completedParts = set(state["completedParts"])
+    parts = [(index, index * partSize, min(size, (index + 1) * partSize) - 1) for index in range((size + partSize - 1) // partSize) if index not in completedParts]
+    nBytes = 0
+    try:
+        # the first part creates the remote file, and is the only one that can fail because of the file already existing when quiet is False.
+        if parts.__len__() > 0 and parts[0][0] == 0:
+            (index, start, end) = parts.pop(0)
+            _uploadPart(url + "?quiet=" + str(quiet) + "&TaskName=" + taskName, headers, data, localFilePath, start, end, size)
+            nBytes += end - start + 1
+            state["completedParts"].append(index)
+            if stateFilePath is not None:
+                _Http.writeStateFile(stateFilePath, state)
+
+        with ThreadPoolExecutor(max_workers=max(1, numConnections)) as executor:
+            futures = {executor.submit(_uploadPart, url + "?quiet=True&TaskName=" + taskName, headers, data, localFilePath, start, end, size): (index, start, end) for (index, start, end) in parts}
+            try:
+                for future in as_completed(futures):
+                    future.result()
+                    (index, start, end) = futures[future]
+                    nBytes += end - start + 1
+                    state["completedParts"].append(index)
+                    if stateFilePath is not None:
+                        _Http.writeStateFile(stateFilePath, state)
+            except BaseException:
+                for future in futures:
+                    future.cancel()
+                raise
+    except Exception as e:
+        raise Exception("Error when uploading file to '" + str(path) + "' in file service '" + str(fileService.get('name')) + "'." + (" The upload can be resumed by calling Files.upload with resume=True." if stateFilePath is not None else "") + "\n" + str(e))
+
+    if _getRemoteFileSize(url + "?TaskName=" + taskName, headers) != size:
+        with _fileServiceRegistryLock:
+            _rangedUploadSupport[__getFileServiceAPIUrl(fileService)] = False
+        if localFilePath is not None:
+            with open(localFilePath, "rb") as file:
+                res = _Http.put(url + "?quiet=True&TaskName=" + taskName, data=file, headers=headers, stream=True)
+        else:
+            res = _Http.put(url + "?quiet=True&TaskName=" + taskName, data=data, headers=headers, stream=True)
+        if res.status_code < 200 or res.status_code >= 300:
+            raise _FileServiceError("Error when uploading file to '" + str(path) + "' in file service '" + str(fileService.get('name')) + "'. The uploaded parts did not add up to the size of the file, and uploading it in a single request failed.\nHttp Response from FileService API returned status code " + str(res.status_code) + ":\n" + res.content.decode(), res.status_code);
+        nBytes = size
+
+    if stateFilePath is not None:
+        os.remove(stateFilePath)
+    return nBytes
+
+
+def _uploadPart(url, headers, data, localFilePath, start, end, size):
+    partHeaders = dict(headers)
+    partHeaders["Content-Range"] = "bytes " + str(start) + "-" + str(end) + "/" + str(size)
+    if localFilePath is not None:
+        body = _FilePart(localFilePath, start, end - start + 1)
+        try:
+            res = _Http.put(url, data=body, headers=partHeaders)
+        finally:
+            body.close()
+    else:
+        res = _Http.put(url, data=data[start:end + 1], headers=partHeaders)
+
+    if res.status_code < 200 or res.status_code >= 300:
+        raise _FileServiceError("Http Response from FileService API returned status code " + str(res.status_code) + " for byte range " + str(start) + "-" + str(end) + ":\n" + res.content.decode(), res.status_code)
+
+
+async def uploadAsync(fileService, path, data="", localFilePath=None, quiet=True):
+    """
+    Asynchronous version of Files.upload, which returns an awaitable object. Many files can be uploaded concurrently from a single thread, e.g., by using asyncio.gather.
+
+    :param fileService: name of fileService (string), or object (dictionary) that defines a file service. A list of these kind of objects available to the user is returned by the function Files.getFileServices().
+    :param path: path (in the remote file service) to the destination file (string), starting from the root volume level or data volume level. Examples: rootVolume/userVolumeOwner/userVolume/destinationFile.txt or dataVolume/destinationFile.txt
+    :param data: string containing data to be uploaded, in case localFilePath is not set.
+    :param localFilePath: path to a local file to be uploaded (string),
+    :param quiet: If set to False, it will throw an error if the file already exists. If set to True. it will not throw an error.
+    :raises: Throws an exception if the user is not logged into SciServer (use Authentication.login for that purpose). Throws an exception if the HTTP request to the FileService API returns an error. Throws an exception if the 'aiohttp' package is not installed.
+    :example: fileServices = Files.getFileServices(); await asyncio.gather(*[Files.uploadAsync(fileServices[0], "Storage/myUserName/persistent/" + f, localFilePath=f) for f in ["a.txt", "b.txt"]]);
+
+    .. seealso:: Files.upload, Files.downloadAsync, Files.dirListAsync
+    """
+    token = await asyncio.to_thread(Authentication.getToken)
+    if token is not None and token != "":
+
+        if Config.isSciServerComputeEnvironment():
+            taskName = "Compute.SciScript-Python.Files.UploadFileAsync"
+        else:
+            taskName = "SciScript-Python.Files.UploadFileAsync"
+
+        if type(fileService) == str:
+            fileService = await asyncio.to_thread(getFileServiceFromName, fileService)
+
+        url = _getFileServiceResourceUrl(fileService, path, "file") + "?quiet=" + str(quiet) + "&TaskName=" + taskName
 
         headers = {'X-Auth-Token': token}
 
         if localFilePath is not None and localFilePath != "":
             with open(localFilePath, "rb") as file:
-                res = requests.put(url, data=file, headers=headers, stream=True)
+                res = await _Http.requestAsync("PUT", url, data=file, headers=headers)
         else:
             if data != None:
-                res = requests.put(url, data=data, headers=headers, stream=True)
+                res = await _Http.requestAsync("PUT", url, data=data, headers=headers)
             else:
                 raise Exception("Error: No local file or data specified for uploading.");
 
         if res.status_code >= 200 and res.status_code < 300:
             pass;
         else:
-            raise Exception("Error when uploading file to '" + str(path) + "' in file service '" + str(fileService.get('name')) + "'.\nHttp Response from FileService API returned status code " + str(res.status_code) + ":\n" + res.content.decode());
+            raise _FileServiceError("Error when uploading file to '" + str(path) + "' in file service '" + str(fileService.get('name')) + "'.\nHttp Response from FileService API returned status code " + str(res.status_code) + ":\n" + res.content.decode(), res.status_code);
     else:
         raise Exception("User token is not defined. First log into SciServer.")
 
 
-def download(fileService, path, localFilePath=None, format="txt", quiet=True):
+def download(fileService, path, localFilePath=None, format="txt", quiet=True, chunkSize=None, verbose=False, numConnections=1, resume=False):
     """
-    Downloads a file from the remote file system into the local file system, or returns the file content as an object in several formats.
+    Downloads a file from the remote file system into the local file system, or returns the file content as an object in several formats. Inside SciServer-Compute, volumes mounted under Config.ComputeWorkDir are accessed directly instead of through the FileService API (see Config.ComputeLocalFileAccess).
 
     :param fileService: name of fileService (string), or object (dictionary) that defines a file service. A list of these kind of objects available to the user is returned by the function Files.getFileServices().
     :param path: String defining the path (in the remote file service) of the file to be downloaded, starting from the root volume level or data volume level. Examples: rootVolume/userVolumeOwner/userVolume/fileToBeDownloaded.txt or dataVolume/fileToBeDownloaded.txt
@@ -453,6 +953,10 @@ def download(fileService, path, localFilePath=None, format="txt", quiet=True):
     :param format: name (string) of the returned object's type (if localFilePath is not defined). This parameter can be "StringIO" (io.StringIO object containing readable text), "BytesIO" (io.BytesIO object containing readable binary data), "response" ( the HTTP response as an object of class requests.Response) or "txt" (a text string). If the parameter 'localFilePath' is defined, then the 'format' parameter is not used and the file is downloaded to the local file system instead.
     :param userVolumeOwner: name (string) of owner of the volume. Can be left undefined if requester is the owner of the volume.
     :param quiet: If set to False, it will throw an error if the file already exists. If set to True. it will not throw an error.
+    :param chunkSize: size in bytes (integer) of the chunks in which the file is streamed into 'localFilePath', so that memory usage stays constant regardless of the size of the file. If not set, then Config.FileTransferChunkSize is used. The file is first written into a temporary file in the same directory, and renamed to 'localFilePath' once fully downloaded.
+    :param verbose: if True, prints the size, duration and throughput of the download into 'localFilePath'.
+    :param numConnections: number of connections (integer) used for downloading into 'localFilePath'. If larger than 1, then the file is split into byte ranges of Config.FileTransferPartSize bytes, which are fetched concurrently into the file 'localFilePath' + '.part'. Progress is recorded in the file 'localFilePath' + '.part.json'. If the FileService does not support HTTP Range requests, then the file is downloaded through a single connection.
+    :param resume: if True, a ranged download into 'localFilePath' that was interrupted continues from the byte ranges already downloaded, as long as the remote file has not changed since. If False, a ranged download always starts from the beginning.
     :return: If the 'localFilePath' parameter is defined, then it will return True when the file is downloaded successfully in the local file system. If the 'localFilePath' is not defined, then the type of the returned object depends on the value of the 'format' parameter (either io.StringIO, io.BytesIO, requests.Response or string).
     :raises: Throws an exception if the user is not logged into SciServer (use Authentication.login for that purpose). Throws an exception if the HTTP request to the FileService API returns an error.
     :example: fileServices = Files.getFileServices(); Files.upload(fileServices[0], "Storage/myUserName/persistent/fileToBeDownloaded.txt", localFilePath="/fileToBeDownloaded.txt");
@@ -466,8 +970,6 @@ def download(fileService, path, localFilePath=None, format="txt", quiet=True):
         if type(fileService) == str:
             fileService = getFileServiceFromName(fileService)
 
-        (topVolume, userVolumeOwner, userVolume, relativePath, isTopVolumeARootVolume) = splitPath(path, fileService);
-
         if localFilePath is not None:
             if os.path.isfile(localFilePath) and not quiet:
                 raise Exception("Error when downloading '" + str(path) + "' from file service '" + str(fileService.get("name")) + "'. Local file '" + localFilePath + "' already exists.");
@@ -477,41 +979,179 @@ def download(fileService, path, localFilePath=None, format="txt", quiet=True):
         else:
             taskName = "SciScript-Python.Files.DownloadFile"
 
-        if isTopVolumeARootVolume:
-            url = __getFileServiceAPIUrl(fileService) + "api/file/" + topVolume + "/" + userVolumeOwner + "/" + userVolume + "/" + relativePath + "?TaskName=" + taskName;
-        else:
-            url = __getFileServiceAPIUrl(fileService) + "api/file/" + topVolume + "/" + relativePath + "?TaskName=" + taskName;
+        url = _getFileServiceResourceUrl(fileService, path, "file") + "?TaskName=" + taskName;
 
         headers = {'X-Auth-Token': token}
 
-        res = requests.get(url, stream=True, headers=headers)
+        mountedPath = _getMountedPath(fileService, path)
+        if mountedPath is not None and os.path.isfile(mountedPath):
+            if localFilePath is not None and localFilePath != "":
+                startTime = time.monotonic()
+                nBytes = _copyLocalFile(mountedPath, localFilePath)
+                if verbose:
+                    print("Downloaded '" + str(path) + "' into '" + localFilePath + "': " + _Http.formatThroughput(nBytes, time.monotonic() - startTime))
+                return True
+            elif format != "response":
+                with open(mountedPath, "rb") as f:
+                    return _getDownloadResult(None, format, path, content=f.read())
+
+        if localFilePath is not None and localFilePath != "" and (numConnections > 1 or resume):
+            startTime = time.monotonic()
+            nBytes = _downloadRanges(fileService, path, url, headers, localFilePath, numConnections, resume, chunkSize)
+            if verbose:
+                print("Downloaded '" + str(path) + "' into '" + localFilePath + "': " + _Http.formatThroughput(nBytes, time.monotonic() - startTime))
+            return True
+
+        res = _Http.get(url, stream=True, headers=headers)
 
         if res.status_code < 200 or res.status_code >= 300:
-            raise Exception("Error when downloading '" + str(path) + "' from file service '" + str(fileService.get("name")) + "'.\nHttp Response from FileService API returned status code " + str(res.status_code) + ":\n" + res.content.decode());
+            raise _FileServiceError("Error when downloading '" + str(path) + "' from file service '" + str(fileService.get("name")) + "'.\nHttp Response from FileService API returned status code " + str(res.status_code) + ":\n" + res.content.decode(), res.status_code);
 
         if localFilePath is not None and localFilePath != "":
 
-            bytesio = BytesIO(res.content)
-            theFile = open(localFilePath, "w+b")
-            theFile.write(bytesio.read())
-            theFile.close()
+            (nBytes, seconds) = _Http.streamToFile(res, localFilePath, chunkSize)
+            if verbose:
+                print("Downloaded '" + str(path) + "' into '" + localFilePath + "': " + _Http.formatThroughput(nBytes, seconds))
             return True
 
         else:
+            return _getDownloadResult(res, format, path)
 
-            if format is not None and format != "":
-                if format == "StringIO":
-                    return StringIO(res.content.decode())
-                if format == "txt":
-                    return res.content.decode()
-                elif format == "BytesIO":
-                    return BytesIO(res.content)
-                elif format == "response":
-                    return res;
-                else:
-                    raise Exception("Unknown format '" + format + "' when trying to download from remote File System the file " + str(relativePath) + ".\n");
-            else:
-                raise Exception("Wrong format parameter value\n");
+    else:
+        raise Exception("User token is not defined. First log into SciServer.")
+
+
+def _downloadRanges(fileService, path, url, headers, localFilePath, numConnections, resume, chunkSize):
+    """
+    Downloads a file into localFilePath as concurrent HTTP Range requests of Config.FileTransferPartSize bytes, and returns the number of bytes downloaded.
+    Ranges are written in place into localFilePath + '.part', and the indexes of the completed ranges into localFilePath + '.part.json', which allows resuming the download later on.
+    """
+    partFilePath = localFilePath + ".part"
+    stateFilePath = partFilePath + ".json"
+
+    # this request tells whether the FileService supports ranges and the size of the file, and its body is used directly if it does not.
+    probeHeaders = dict(headers)
+    probeHeaders["Range"] = "bytes=0-0"
+    res = _Http.get(url, stream=True, headers=probeHeaders)
+    if res.status_code == 416 and res.headers.get("Content-Range", "").endswith("/0"):
+        res.close()
+        open(localFilePath, "wb").close()
+        return 0
+    if res.status_code < 200 or res.status_code >= 300:
+        raise _FileServiceError("Error when downloading '" + str(path) + "' from file service '" + str(fileService.get("name")) + "'.\nHttp Response from FileService API returned status code " + str(res.status_code) + ":\n" + res.content.decode(), res.status_code);
+    if res.status_code != 206 or "/" not in res.headers.get("Content-Range", "") or res.headers["Content-Range"].endswith("/*"):
+        (nBytes, seconds) = _Http.streamToFile(res, localFilePath, chunkSize)
+        return nBytes
+    res.close()
+
+    size = int(res.headers["Content-Range"].rsplit("/", 1)[1])
+    partSize = Config.FileTransferPartSize
+    state = {"fileService": fileService.get("identifier"), "path": path, "size": size, "partSize": partSize,
+             "etag": res.headers.get("ETag"), "lastModified": res.headers.get("Last-Modified"), "completedParts": []}
+
+    previousState = _Http.readStateFile(stateFilePath) if resume else None
+    if previousState is not None and all(previousState.get(key) == value for key, value in state.items() if key != "completedParts") \
+            and os.path.isfile(partFilePath) and os.path.getsize(partFilePath) == size:
+        state["completedParts"] = previousState.get("completedParts", [])
+    else:
+        with open(partFilePath, "wb") as f:
+            f.truncate(size)
+        _Http.writeStateFile(stateFilePath, state)
+
+    completedParts = set(state["completedParts"])
+    parts = [(index, index * partSize, min(size, (index + 1) * partSize) - 1) for index in range((size + partSize - 1) // partSize) if index not in completedParts]
+    cancelEvent = threading.Event()
+    nBytes = 0
+    with ThreadPoolExecutor(max_workers=max(1, numConnections)) as executor:
+        futures = {executor.submit(_downloadRange, url, headers, partFilePath, start, end, chunkSize, cancelEvent): (index, start, end) for (index, start, end) in parts}
+        try:
+            for future in as_completed(futures):
+                future.result()
+                (index, start, end) = futures[future]
+                nBytes += end - start + 1
+                state["completedParts"].append(index)
+                _Http.writeStateFile(stateFilePath, state)
+        except BaseException as e:
+            cancelEvent.set()
+            for future in futures:
+                future.cancel()
+            if isinstance(e, Exception):
+                raise Exception("Error when downloading '" + str(path) + "' from file service '" + str(fileService.get("name")) + "'. The download can be resumed by calling Files.download with resume=True.\n" + str(e))
+            raise
+
+    os.replace(partFilePath, localFilePath)
+    os.remove(stateFilePath)
+    return nBytes
+
+
+def _downloadRange(url, headers, partFilePath, start, end, chunkSize, cancelEvent):
+    rangeHeaders = dict(headers)
+    rangeHeaders["Range"] = "bytes=" + str(start) + "-" + str(end)
+    res = _Http.get(url, stream=True, headers=rangeHeaders)
+    try:
+        if res.status_code != 206:
+            raise _FileServiceError("Http Response from FileService API returned status code " + str(res.status_code) + " for byte range " + str(start) + "-" + str(end) + ":\n" + res.content.decode(), res.status_code)
+        position = start
+        with open(partFilePath, "r+b") as f:
+            f.seek(start)
+            for chunk in res.iter_content(chunk_size=chunkSize if chunkSize else Config.FileTransferChunkSize):
+                if cancelEvent.is_set():
+                    raise Exception("Download of byte range " + str(start) + "-" + str(end) + " was cancelled.")
+                f.write(chunk[:end + 1 - position])
+                position += len(chunk)
+        if position < end + 1:
+            raise Exception("Connection closed after " + str(position - start) + " bytes of byte range " + str(start) + "-" + str(end) + ".")
+    finally:
+        res.close()
+
+
+async def downloadAsync(fileService, path, localFilePath=None, format="txt", quiet=True):
+    """
+    Asynchronous version of Files.download, which returns an awaitable object. Many files can be downloaded concurrently from a single thread, e.g., by using asyncio.gather.
+
+    :param fileService: name of fileService (string), or object (dictionary) that defines a file service. A list of these kind of objects available to the user is returned by the function Files.getFileServices().
+    :param path: String defining the path (in the remote file service) of the file to be downloaded, starting from the root volume level or data volume level. Examples: rootVolume/userVolumeOwner/userVolume/fileToBeDownloaded.txt or dataVolume/fileToBeDownloaded.txt
+    :param localFilePath: local destination path of the file to be downloaded. If set to None, then an object of format 'format' will be returned.
+    :param format: name (string) of the returned object's type (if localFilePath is not defined). This parameter can be "StringIO" (io.StringIO object containing readable text), "BytesIO" (io.BytesIO object containing readable binary data), "response" (the HTTP response as an object of class _Http.AsyncResponse) or "txt" (a text string).
+    :param quiet: If set to False, it will throw an error if the file already exists. If set to True. it will not throw an error.
+    :return: If the 'localFilePath' parameter is defined, then it will return True when the file is downloaded successfully in the local file system. If the 'localFilePath' is not defined, then the type of the returned object depends on the value of the 'format' parameter.
+    :raises: Throws an exception if the user is not logged into SciServer (use Authentication.login for that purpose). Throws an exception if the HTTP request to the FileService API returns an error. Throws an exception if the 'aiohttp' package is not installed.
+    :example: fileServices = Files.getFileServices(); texts = await asyncio.gather(*[Files.downloadAsync(fileServices[0], "Storage/myUserName/persistent/" + f) for f in ["a.txt", "b.txt"]]);
+
+    .. seealso:: Files.download, Files.uploadAsync, Files.dirListAsync
+    """
+    token = await asyncio.to_thread(Authentication.getToken)
+    if token is not None and token != "":
+
+        if type(fileService) == str:
+            fileService = await asyncio.to_thread(getFileServiceFromName, fileService)
+
+        if localFilePath is not None:
+            if os.path.isfile(localFilePath) and not quiet:
+                raise Exception("Error when downloading '" + str(path) + "' from file service '" + str(fileService.get("name")) + "'. Local file '" + localFilePath + "' already exists.");
+
+        if Config.isSciServerComputeEnvironment():
+            taskName = "Compute.SciScript-Python.Files.DownloadFileAsync"
+        else:
+            taskName = "SciScript-Python.Files.DownloadFileAsync"
+
+        url = _getFileServiceResourceUrl(fileService, path, "file") + "?TaskName=" + taskName;
+
+        headers = {'X-Auth-Token': token}
+
+        if localFilePath is not None and localFilePath != "":
+            # the body is streamed into the file, instead of being held in memory.
+            res = await _Http.requestToFileAsync("GET", url, localFilePath, headers=headers)
+        else:
+            res = await _Http.requestAsync("GET", url, headers=headers)
+
+        if res.status_code < 200 or res.status_code >= 300:
+            raise _FileServiceError("Error when downloading '" + str(path) + "' from file service '" + str(fileService.get("name")) + "'.\nHttp Response from FileService API returned status code " + str(res.status_code) + ":\n" + res.content.decode(), res.status_code);
+
+        if localFilePath is not None and localFilePath != "":
+            return True
+        else:
+            return _getDownloadResult(res, format, path)
 
     else:
         raise Exception("User token is not defined. First log into SciServer.")
@@ -520,7 +1160,7 @@ def download(fileService, path, localFilePath=None, format="txt", quiet=True):
 
 def dirList(fileService, path, level=1, options=''):
     """
-    Lists the contents of a directory.
+    Lists the contents of a directory. Inside SciServer-Compute, volumes mounted under Config.ComputeWorkDir are accessed directly instead of through the FileService API (see Config.ComputeLocalFileAccess).
 
     :param fileService: name of fileService (string), or object (dictionary) that defines a file service. A list of these kind of objects available to the user is returned by the function Files.getFileServices().
     :param path: String defining the path (in the remote file service) of the directory to be listed, starting from the root volume level or data volume level. Examples: rootVolume/userVolumeOwner/userVolume/directoryToBeListed or dataVolume/directoryToBeListed
@@ -543,27 +1183,64 @@ def dirList(fileService, path, level=1, options=''):
         if type(fileService) == str:
             fileService = getFileServiceFromName(fileService)
 
-        (topVolume, userVolumeOwner, userVolume, relativePath, isTopVolumeARootVolume) = splitPath(path, fileService);
+        mountedPath = _getMountedPath(fileService, path)
+        if mountedPath is not None and os.path.isdir(mountedPath) and (options is None or options == ""):
+            return {"root": _getLocalDirList(mountedPath, level)}
 
-        if isTopVolumeARootVolume:
-            url = __getFileServiceAPIUrl(fileService) + "api/jsontree/" + topVolume + "/" + userVolumeOwner + "/" + userVolume + "/" + relativePath + "?options=" + options + "&level=" + str(level) + "&TaskName=" + taskName;
+        url = _getFileServiceResourceUrl(fileService, path, "jsontree") + "?options=" + options + "&level=" + str(level) + "&TaskName=" + taskName;
+
+        headers = {'X-Auth-Token': token}
+        res = _Http.get(url, headers=headers)
+
+        if res.status_code >= 200 and res.status_code < 300:
+            return json.loads(res.content.decode());
+        else:
+            raise _FileServiceError("Error when listing contents of '" + str(path) + "'.\nHttp Response from FileService API returned status code " + str(res.status_code) + ":\n" + res.content.decode(), res.status_code);
+    else:
+        raise Exception("User token is not defined. First log into SciServer.")
+
+
+async def dirListAsync(fileService, path, level=1, options=''):
+    """
+    Asynchronous version of Files.dirList, which returns an awaitable object. Many directories can be listed concurrently from a single thread, e.g., by using asyncio.gather.
+
+    :param fileService: name of fileService (string), or object (dictionary) that defines a file service. A list of these kind of objects available to the user is returned by the function Files.getFileServices().
+    :param path: String defining the path (in the remote file service) of the directory to be listed, starting from the root volume level or data volume level. Examples: rootVolume/userVolumeOwner/userVolume/directoryToBeListed or dataVolume/directoryToBeListed
+    :param level: amount (int) of listed directory levels that are below or at the same level to that of the relativePath.
+    :param options: string of file filtering options.
+    :return: dictionary containing the directory listing.
+    :raises: Throws an exception if the user is not logged into SciServer (use Authentication.login for that purpose). Throws an exception if the HTTP request to the FileService API returns an error. Throws an exception if the 'aiohttp' package is not installed.
+    :example: fileServices = Files.getFileServices(); dirs = await asyncio.gather(Files.dirListAsync(fileServices[0], "Storage/myUserName/persistent/"), Files.dirListAsync(fileServices[0], "Temporary/myUserName/scratch/"));
+
+    .. seealso:: Files.dirList, Files.downloadAsync, Files.uploadAsync
+    """
+    token = await asyncio.to_thread(Authentication.getToken)
+    if token is not None and token != "":
+
+        if Config.isSciServerComputeEnvironment():
+            taskName = "Compute.SciScript-Python.Files.dirListAsync"
         else:
-            url = __getFileServiceAPIUrl(fileService) + "api/jsontree/" + topVolume + "/" + relativePath + "?options=" + options + "&level=" + str(level) + "&TaskName=" + taskName;
+            taskName = "SciScript-Python.Files.dirListAsync"
+
+        if type(fileService) == str:
+            fileService = await asyncio.to_thread(getFileServiceFromName, fileService)
+
+        url = _getFileServiceResourceUrl(fileService, path, "jsontree") + "?options=" + options + "&level=" + str(level) + "&TaskName=" + taskName;
 
         headers = {'X-Auth-Token': token}
-        res = requests.get(url, headers=headers)
+        res = await _Http.requestAsync("GET", url, headers=headers)
 
         if res.status_code >= 200 and res.status_code < 300:
             return json.loads(res.content.decode());
         else:
-            raise Exception("Error when listing contents of '" + str(path) + "'.\nHttp Response from FileService API returned status code " + str(res.status_code) + ":\n" + res.content.decode());
+            raise _FileServiceError("Error when listing contents of '" + str(path) + "'.\nHttp Response from FileService API returned status code " + str(res.status_code) + ":\n" + res.content.decode(), res.status_code);
     else:
         raise Exception("User token is not defined. First log into SciServer.")
 
 
 def move(fileService, path, destinationFileService, destinationPath, replaceExisting=True, doCopy=True):
     """
-    Moves or copies a file or folder.
+    Moves or copies a file or folder. Inside SciServer-Compute, volumes mounted under Config.ComputeWorkDir are accessed directly instead of through the FileService API (see Config.ComputeLocalFileAccess).
 
     :param fileService: name of fileService (string), or object (dictionary) that defines a file service. A list of these kind of objects available to the user is returned by the function Files.getFileServices().
     :param path: String defining the origin path (in the remote fileService) of the file or directory to be copied/moved, starting from the root volume level or data volume level. Examples: rootVolume/userVolumeOwner/userVolume/fileToBeMoved.txt or dataVolume/fileToBeMoved.txt
@@ -594,6 +1271,25 @@ def move(fileService, path, destinationFileService, destinationPath, replaceExis
         if type(destinationFileService) == str:
             destinationFileService = getFileServiceFromName(destinationFileService)
 
+        mountedPath = _getMountedPath(fileService, path)
+        destinationMountedPath = _getMountedPath(destinationFileService, destinationPath)
+        if mountedPath is not None and destinationMountedPath is not None and os.path.exists(mountedPath):
+            if os.path.isdir(destinationMountedPath) and not os.path.isdir(mountedPath):
+                destinationMountedPath = os.path.join(destinationMountedPath, os.path.basename(mountedPath))
+            if os.path.exists(destinationMountedPath) and not replaceExisting:
+                raise Exception("Error when moving '" + str(path) + "' in file service '" + str(fileService.get("name")) + "' to '" + str(destinationPath) + "' in file service '" + str(destinationFileService.get("name")) + "'. Destination already exists.");
+            if not doCopy:
+                shutil.move(mountedPath, destinationMountedPath)
+            elif os.path.isdir(mountedPath):
+                for (localPath, dirNames, fileNames) in os.walk(mountedPath):
+                    destinationDirectory = os.path.join(destinationMountedPath, os.path.relpath(localPath, mountedPath))
+                    os.makedirs(destinationDirectory, exist_ok=True)
+                    for fileName in fileNames:
+                        _copyLocalFile(os.path.join(localPath, fileName), os.path.join(destinationDirectory, fileName))
+            else:
+                _copyLocalFile(mountedPath, destinationMountedPath)
+            return
+
         (topVolume, userVolumeOwner, userVolume, relativePath, isTopVolumeARootVolume) = splitPath(path, fileService);
         (destinationTopVolume, destinationUserVolumeOwner, destinationUserVolume, destinationRelativePath, isDestinationTopVolumeARootVolume) = splitPath(destinationPath, destinationFileService);
 
@@ -611,10 +1307,10 @@ def move(fileService, path, destinationFileService, destinationPath, replaceExis
                         'destinationFileService': destinationFileServiceName};
 
         headers = {'X-Auth-Token': token, "Content-Type": "application/json"}
-        res = requests.put(url, stream=True, headers=headers, json=jsonDict)
+        res = _Http.put(url, stream=True, headers=headers, json=jsonDict)
 
         if res.status_code < 200 or res.status_code >= 300:
-            raise Exception("Error when moving '" + str(path) + "' in file service '" + str(fileService.get("name")) + "' to '" + str(destinationPath) + "' in file service '" + str(destinationFileService.get("name")) + "'. \nHttp Response from FileService API returned status code " + str(res.status_code) + ":\n" + res.content.decode());
+            raise _FileServiceError("Error when moving '" + str(path) + "' in file service '" + str(fileService.get("name")) + "' to '" + str(destinationPath) + "' in file service '" + str(destinationFileService.get("name")) + "'. \nHttp Response from FileService API returned status code " + str(res.status_code) + ":\n" + res.content.decode(), res.status_code);
 
     else:
         raise Exception("User token is not defined. First log into SciServer.")
@@ -652,12 +1348,12 @@ def delete(fileService, path, quiet=True):
             url = __getFileServiceAPIUrl(fileService) + "api/data/" + topVolume + "/" + relativePath + "?quiet=" + str(quiet) + "&TaskName=" + taskName
 
         headers = {'X-Auth-Token': token}
-        res = requests.delete(url, headers=headers)
+        res = _Http.delete(url, headers=headers)
 
         if res.status_code >= 200 and res.status_code < 300:
             pass;
         else:
-            raise Exception("Error when deleting '" + str(path) + "'.\nHttp Response from FileService API returned status code " + str(res.status_code) + ":\n" + res.content.decode());
+            raise _FileServiceError("Error when deleting '" + str(path) + "'.\nHttp Response from FileService API returned status code " + str(res.status_code) + ":\n" + res.content.decode(), res.status_code);
     else:
         raise Exception("User token is not defined. First log into SciServer.")
 
@@ -697,11 +1393,315 @@ def shareUserVolume(fileService, path, sharedWith, allowedActions, sharee_type="
         url = __getFileServiceAPIUrl(fileService) + "api/share/" + rootVolume + "/" + userVolumeOwner + "/" + userVolume + "?TaskName="+taskName
 
         headers = {'X-Auth-Token': token,'Content-Type':'application/json'}
-        res = requests.patch(url, headers=headers, data=body)
+        res = _Http.patch(url, headers=headers, data=body)
 
         if res.status_code >= 200 and res.status_code < 300:
-            pass;
+            invalidateFileServices()
         else:
-            raise Exception("Error when sharing userVolume '" + str(path) + "' in file service '" + str(fileService.get('name')) + "'.\nHttp Response from FileService API returned status code " + str(res.status_code) + ":\n" + res.content.decode())
+            raise _FileServiceError("Error when sharing userVolume '" + str(path) + "' in file service '" + str(fileService.get('name')) + "'.\nHttp Response from FileService API returned status code " + str(res.status_code) + ":\n" + res.content.decode(), res.status_code)
     else:
         raise Exception("User token is not defined. First log into SciServer.")
+
+
+def uploadFiles(fileService, files, quiet=True, numThreads=None, retries=None, verbose=False):
+    """
+    Uploads many local files into the remote file system concurrently, through a bounded pool of threads that share the same pooled HTTP connections. The file service is resolved only once, and each upload failing with a transient error is retried up to 'retries' times.
+
+    :param fileService: name of fileService (string), or object (dictionary) that defines a file service. A list of these kind of objects available to the user is returned by the function Files.getFileServices().
+    :param files: list of tuples (localFilePath, path), where 'localFilePath' is the path to a local file, and 'path' is the destination path (in the remote file service) of that file, starting from the root volume level or data volume level.
+    :param quiet: If set to False, the upload of a file will fail if it already exists. If set to True, the remote file is overwritten.
+    :param numThreads: maximum number (integer) of files uploaded at the same time. If not set, then Config.FileTransferMaxWorkers is used. Should not be larger than Config.HttpPoolMaxSize, so that all threads reuse open connections.
+    :param retries: number of times (integer) that a upload failing with a connection error, a timeout, or an HTTP status code of 429 or 5xx is retried, while other errors are not retried. If not set, then Config.FileTransferRetries is used.
+    :param verbose: if True, prints a summary with the number of files and bytes uploaded and the aggregated throughput.
+    :return: a dictionary reporting the transfer, with keys "files" (list of dictionaries, one per file, with keys "localFilePath", "path", "bytes", "seconds", "retries" and "error", which is None for successful uploads), "bytes" (total bytes uploaded), "seconds" (total duration), "throughput" (bytes per second), "retries" (total number of retries) and "failed" (number of files that could not be uploaded).
+    :raises: Throws an exception if the user is not logged into SciServer (use Authentication.login for that purpose). Errors in the upload of individual files are not raised, but reported in the returned dictionary.
+    :example: report = Files.uploadFiles("FileServiceJHU", [("cutout1.fits", "Storage/myUserName/persistent/cutouts/cutout1.fits"), ("cutout2.fits", "Storage/myUserName/persistent/cutouts/cutout2.fits")]); print(report["failed"])
+
+    .. seealso:: Files.upload, Files.uploadDirectory, Files.downloadFiles
+    """
+    if type(fileService) == str:
+        fileService = getFileServiceFromName(fileService)
+
+    def transfer(localFilePath, path):
+        upload(fileService, path, localFilePath=localFilePath, quiet=quiet)
+        return os.path.getsize(localFilePath)
+
+    return _transferFiles(transfer, files, numThreads, retries, verbose, "Uploaded")
+
+
+def downloadFiles(fileService, files, quiet=True, numThreads=None, retries=None, verbose=False):
+    """
+    Downloads many files from the remote file system into the local file system concurrently, through a bounded pool of threads that share the same pooled HTTP connections. The file service is resolved only once, and each download failing with a transient error is retried up to 'retries' times. Local directories are created as needed.
+
+    :param fileService: name of fileService (string), or object (dictionary) that defines a file service. A list of these kind of objects available to the user is returned by the function Files.getFileServices().
+    :param files: list of tuples (localFilePath, path), where 'path' is the path (in the remote file service) of the file to be downloaded, starting from the root volume level or data volume level, and 'localFilePath' is its local destination path.
+    :param quiet: If set to False, the download of a file will fail if the local file already exists. If set to True, the local file is overwritten.
+    :param numThreads: maximum number (integer) of files downloaded at the same time. If not set, then Config.FileTransferMaxWorkers is used. Should not be larger than Config.HttpPoolMaxSize, so that all threads reuse open connections.
+    :param retries: number of times (integer) that a download failing with a connection error, a timeout, or an HTTP status code of 429 or 5xx is retried, while other errors are not retried. If not set, then Config.FileTransferRetries is used.
+    :param verbose: if True, prints a summary with the number of files and bytes downloaded and the aggregated throughput.
+    :return: a dictionary reporting the transfer, with the same keys as the one returned by Files.uploadFiles.
+    :raises: Throws an exception if the user is not logged into SciServer (use Authentication.login for that purpose). Errors in the download of individual files are not raised, but reported in the returned dictionary.
+    :example: report = Files.downloadFiles("FileServiceJHU", [("cutout1.fits", "Storage/myUserName/persistent/cutouts/cutout1.fits"), ("cutout2.fits", "Storage/myUserName/persistent/cutouts/cutout2.fits")]); print(report["throughput"])
+
+    .. seealso:: Files.download, Files.downloadDirectory, Files.uploadFiles
+    """
+    if type(fileService) == str:
+        fileService = getFileServiceFromName(fileService)
+
+    def transfer(localFilePath, path):
+        directory = os.path.dirname(localFilePath)
+        if directory != "":
+            os.makedirs(directory, exist_ok=True)
+        download(fileService, path, localFilePath=localFilePath, quiet=quiet)
+        return os.path.getsize(localFilePath)
+
+    return _transferFiles(transfer, files, numThreads, retries, verbose, "Downloaded")
+
+
+def uploadDirectory(fileService, localDirectory, path, quiet=True, numThreads=None, retries=None, verbose=False):
+    """
+    Uploads all the files within a local directory tree into a directory of the remote file system, keeping the same tree structure. Remote subdirectories are created as needed, and files are uploaded concurrently as in Files.uploadFiles.
+
+    :param fileService: name of fileService (string), or object (dictionary) that defines a file service. A list of these kind of objects available to the user is returned by the function Files.getFileServices().
+    :param localDirectory: path to the local directory (string) to be uploaded.
+    :param path: path (in the remote file service) of the destination directory (string), starting from the root volume level or data volume level. Example: rootVolume/userVolumeOwner/userVolume/destinationDirectory
+    :param quiet: If set to False, the upload of a file will fail if it already exists. If set to True, the remote file is overwritten.
+    :param numThreads: maximum number (integer) of files uploaded at the same time. If not set, then Config.FileTransferMaxWorkers is used.
+    :param retries: number of times (integer) that a upload failing with a connection error, a timeout, or an HTTP status code of 429 or 5xx is retried, while other errors are not retried. If not set, then Config.FileTransferRetries is used.
+    :param verbose: if True, prints a summary with the number of files and bytes uploaded and the aggregated throughput.
+    :return: a dictionary reporting the transfer, with the same keys as the one returned by Files.uploadFiles.
+    :raises: Throws an exception if the user is not logged into SciServer (use Authentication.login for that purpose). Throws an exception if the HTTP request to the FileService API for creating a directory returns an error.
+    :example: report = Files.uploadDirectory("FileServiceJHU", "results", "Storage/myUserName/persistent/results");
+
+    .. seealso:: Files.uploadFiles, Files.downloadDirectory, Files.sync
+    """
+    if type(fileService) == str:
+        fileService = getFileServiceFromName(fileService)
+
+    path = path.rstrip("/")
+    files = []
+    directories = [path]
+    for (localPath, dirNames, fileNames) in os.walk(localDirectory):
+        relativeDirectory = os.path.relpath(localPath, localDirectory).replace(os.sep, "/")
+        remoteDirectory = path if relativeDirectory == "." else path + "/" + relativeDirectory
+        dirNames.sort()
+        directories.extend(remoteDirectory + "/" + dirName for dirName in dirNames)
+        files.extend((os.path.join(localPath, fileName), remoteDirectory + "/" + fileName) for fileName in sorted(fileNames))
+
+    for directory in directories:
+        createDir(fileService, directory, quiet=True)
+
+    return uploadFiles(fileService, files, quiet=quiet, numThreads=numThreads, retries=retries, verbose=verbose)
+
+
+def downloadDirectory(fileService, path, localDirectory, quiet=True, numThreads=None, retries=None, verbose=False, level=100):
+    """
+    Downloads all the files within a directory of the remote file system into a local directory, keeping the same tree structure. Local subdirectories are created as needed, and files are downloaded concurrently as in Files.downloadFiles.
+
+    :param fileService: name of fileService (string), or object (dictionary) that defines a file service. A list of these kind of objects available to the user is returned by the function Files.getFileServices().
+    :param path: path (in the remote file service) of the directory (string) to be downloaded, starting from the root volume level or data volume level. Example: rootVolume/userVolumeOwner/userVolume/directoryToBeDownloaded
+    :param localDirectory: path to the local destination directory (string).
+    :param quiet: If set to False, the download of a file will fail if the local file already exists. If set to True, the local file is overwritten.
+    :param numThreads: maximum number (integer) of files downloaded at the same time. If not set, then Config.FileTransferMaxWorkers is used.
+    :param retries: number of times (integer) that a download failing with a connection error, a timeout, or an HTTP status code of 429 or 5xx is retried, while other errors are not retried. If not set, then Config.FileTransferRetries is used.
+    :param verbose: if True, prints a summary with the number of files and bytes downloaded and the aggregated throughput.
+    :param level: maximum depth (integer) of the subdirectories that are downloaded.
+    :return: a dictionary reporting the transfer, with the same keys as the one returned by Files.uploadFiles.
+    :raises: Throws an exception if the user is not logged into SciServer (use Authentication.login for that purpose). Throws an exception if the HTTP request to the FileService API for listing the directory returns an error.
+    :example: report = Files.downloadDirectory("FileServiceJHU", "Storage/myUserName/persistent/results", "results");
+
+    .. seealso:: Files.downloadFiles, Files.uploadDirectory, Files.sync
+    """
+    if type(fileService) == str:
+        fileService = getFileServiceFromName(fileService)
+
+    path = path.rstrip("/")
+    tree = dirList(fileService, path, level=level)
+    files = [(os.path.join(localDirectory, *relativePath.split("/")), path + "/" + relativePath) for (relativePath, fileInfo) in _walkDirList(tree.get("root"))]
+    os.makedirs(localDirectory, exist_ok=True)
+    return downloadFiles(fileService, files, quiet=quiet, numThreads=numThreads, retries=retries, verbose=verbose)
+
+
+# Files.sync has a 'delete' parameter, which hides the module-level function of the same name.
+_deleteFile = delete
+
+
+def sync(localDirectory, fileService, path, direction="upload", delete=False, checksum=False, numThreads=None, retries=None, verbose=False, level=100):
+    """
+    Synchronizes a local directory tree with a directory of the remote file system, transferring only the files that are missing or have changed at the destination, in the same way as rsync.
+    Files are compared using the size and modification time reported by Files.dirList, or, if 'checksum' is True, using a SHA-256 hash of their content.
+    The state of the last synchronization is kept in a manifest file under Config.CacheDir.
+
+    :param localDirectory: path to the local directory (string).
+    :param fileService: name of fileService (string), or object (dictionary) that defines a file service. A list of these kind of objects available to the user is returned by the function Files.getFileServices().
+    :param path: path (in the remote file service) of the remote directory (string), starting from the root volume level or data volume level. Example: rootVolume/userVolumeOwner/userVolume/results
+    :param direction: "upload" for copying the changes in the local directory into the remote directory, or "download" for copying the changes in the remote directory into the local directory.
+    :param delete: if True, files at the destination that do not exist at the source are deleted.
+    :param checksum: if True, a file is transferred only if its content hash differs from the one recorded in the last synchronization, or if the destination file changed since then, instead of whenever the source file is newer than the destination file. Useful when files are re-written with the same content.
+    :param numThreads: maximum number (integer) of files transferred at the same time. If not set, then Config.FileTransferMaxWorkers is used.
+    :param retries: number of times (integer) that a transfer failing with a connection error, a timeout, or an HTTP status code of 429 or 5xx is retried, while other errors are not retried. If not set, then Config.FileTransferRetries is used.
+    :param verbose: if True, prints a summary of the files transferred, skipped and deleted.
+    :param level: maximum depth (integer) of the subdirectories that are synchronized.
+    :return: a dictionary reporting the synchronization, with the same keys as the one returned by Files.uploadFiles, plus the keys "skipped" (number of files that were already up to date) and "deleted" (list of relative paths of the files deleted at the destination).
+    :raises: Throws an exception if the user is not logged into SciServer (use Authentication.login for that purpose). Throws an exception if 'direction' is not valid. Throws an exception if the HTTP request to the FileService API for listing the remote directory returns an error.
+    :example: report = Files.sync("results", "FileServiceJHU", "Storage/myUserName/persistent/results", direction="upload", delete=True);
+
+    .. seealso:: Files.uploadDirectory, Files.downloadDirectory, Files.dirList
+    """
+    if direction not in ("upload", "download"):
+        raise Exception("Invalid direction '" + str(direction) + "'. Allowed values are 'upload' and 'download'.")
+
+    if type(fileService) == str:
+        fileService = getFileServiceFromName(fileService)
+
+    path = path.rstrip("/")
+    try:
+        remoteFiles = {relativePath: file for (relativePath, file) in _walkDirList(dirList(fileService, path, level=level).get("root"))}
+    except Exception as e:
+        # a remote directory that does not exist yet is uploaded as new, but any other error is raised.
+        if direction == "download" or getattr(e, "status_code", None) != 404:
+            raise
+        remoteFiles = {}
+
+    localFiles = {}
+    if os.path.isdir(localDirectory):
+        for (localPath, dirNames, fileNames) in os.walk(localDirectory):
+            relativeDirectory = os.path.relpath(localPath, localDirectory).replace(os.sep, "/")
+            if relativeDirectory != "." and relativeDirectory.count("/") + 1 >= level:
+                continue
+            for fileName in fileNames:
+                relativePath = fileName if relativeDirectory == "." else relativeDirectory + "/" + fileName
+                stat = os.stat(os.path.join(localPath, fileName))
+                localFiles[relativePath] = {"size": stat.st_size, "modified": stat.st_mtime}
+
+    manifestFilePath = os.path.join(Config.CacheDir, "sync", hashlib.sha1(json.dumps([fileService.get("identifier"), path, os.path.abspath(localDirectory)]).encode()).hexdigest() + ".json")
+    manifest = (_Http.readStateFile(manifestFilePath) or {}) if checksum else {}
+
+    def localHash(relativePath):
+        sha256 = hashlib.sha256()
+        with open(os.path.join(localDirectory, *relativePath.split("/")), "rb") as f:
+            for chunk in iter(lambda: f.read(Config.FileTransferChunkSize), b""):
+                sha256.update(chunk)
+        return sha256.hexdigest()
+
+    (sourceFiles, destinationFiles) = (localFiles, remoteFiles) if direction == "upload" else (remoteFiles, localFiles)
+    transfers = []
+    hashes = {}
+    for relativePath in sorted(sourceFiles):
+        source = _getSyncFileInfo(sourceFiles[relativePath])
+        destination = _getSyncFileInfo(destinationFiles.get(relativePath))
+        if destination is None or source["size"] != destination["size"]:
+            transfers.append(relativePath)
+        elif checksum:
+            entry = manifest.get(relativePath)
+            hashes[relativePath] = localHash(relativePath)
+            if entry is None or entry.get("sha256") != hashes[relativePath] or entry.get("remoteLastModified") != remoteFiles[relativePath].get("lastModified"):
+                transfers.append(relativePath)
+        elif source["modified"] is None or destination["modified"] is None or source["modified"] > destination["modified"] + 2:
+            transfers.append(relativePath)
+
+    files = [(os.path.join(localDirectory, *relativePath.split("/")), path + "/" + relativePath) for relativePath in transfers]
+    if direction == "upload":
+        remoteDirectories = sorted(set([path] + [path + "/" + "/".join(relativePath.split("/")[:i]) for relativePath in transfers for i in range(1, relativePath.count("/") + 1)]))
+        existingDirectories = set(path + "/" + "/".join(relativePath.split("/")[:i]) for relativePath in remoteFiles for i in range(1, relativePath.count("/") + 1))
+        if remoteFiles.__len__() > 0:
+            existingDirectories.add(path)
+        for directory in remoteDirectories:
+            if directory not in existingDirectories:
+                createDir(fileService, directory, quiet=True)
+        report = uploadFiles(fileService, files, numThreads=numThreads, retries=retries)
+    else:
+        os.makedirs(localDirectory, exist_ok=True)
+        report = downloadFiles(fileService, files, numThreads=numThreads, retries=retries)
+
+    deleted = []
+    if delete:
+        for relativePath in sorted(set(destinationFiles) - set(sourceFiles)):
+            if direction == "upload":
+                _deleteFile(fileService, path + "/" + relativePath, quiet=True)
+            else:
+                os.remove(os.path.join(localDirectory, *relativePath.split("/")))
+            deleted.append(relativePath)
+
+    if checksum:
+        # the manifest records the content hash of every file in sync, along with the remote modification time it had right after the synchronization.
+        remoteFiles = {relativePath: file for (relativePath, file) in _walkDirList(dirList(fileService, path, level=level).get("root"))} if report["files"].__len__() > 0 or deleted.__len__() > 0 else remoteFiles
+        failed = set(result["path"][len(path) + 1:] for result in report["files"] if result["error"] is not None)
+        manifest = {}
+        for relativePath in sorted(set(sourceFiles) - failed):
+            if relativePath in remoteFiles:
+                manifest[relativePath] = {"sha256": hashes[relativePath] if relativePath in hashes else localHash(relativePath), "remoteLastModified": remoteFiles[relativePath].get("lastModified")}
+        os.makedirs(os.path.dirname(manifestFilePath), exist_ok=True)
+        _Http.writeStateFile(manifestFilePath, manifest)
+
+    report["skipped"] = sourceFiles.__len__() - transfers.__len__()
+    report["deleted"] = deleted
+    if verbose:
+        print(("Uploaded " if direction == "upload" else "Downloaded ") + str(transfers.__len__() - report["failed"]) + " of " + str(transfers.__len__()) + " changed files (" + _Http.formatThroughput(report["bytes"], report["seconds"]) + "), skipped " + str(report["skipped"]) + " unchanged files, deleted " + str(deleted.__len__()) + " files, with " + str(report["retries"]) + " retries.")
+    return report
+
+
+def _getSyncFileInfo(file):
+    """
+    Returns the size and the modification time (as seconds since the epoch) of a file described either by Files.dirList or by the local file listing in Files.sync.
+    """
+    if file is None:
+        return None
+    if "modified" in file:
+        return file
+    modified = None
+    try:
+        modified = datetime.fromisoformat(file.get("lastModified").replace("Z", "+00:00")).timestamp()
+    except (AttributeError, TypeError, ValueError):
+        pass
+    return {"size": file.get("size"), "modified": modified}
+
+
+def _walkDirList(folder, prefix=""):
+    """
+    Yields tuples (relativePath, file) for all the files within a folder of a directory listing returned by Files.dirList, where 'file' is the dictionary describing the file.
+    """
+    for file in folder.get("files") or []:
+        yield (prefix + file.get("name"), file)
+    for subFolder in folder.get("folders") or []:
+        yield from _walkDirList(subFolder, prefix + subFolder.get("name") + "/")
+
+
+def _transferFiles(transfer, files, numThreads, retries, verbose, verb):
+    token = Authentication.getToken()
+    if token is None or token == "":
+        raise Exception("User token is not defined. First log into SciServer.")
+    retries = Config.FileTransferRetries if retries is None else retries
+    numThreads = numThreads if numThreads else Config.FileTransferMaxWorkers
+
+    def transferWithRetries(localFilePath, path):
+        result = {"localFilePath": localFilePath, "path": path, "bytes": 0, "seconds": 0.0, "retries": 0, "error": None}
+        startTime = time.monotonic()
+        while True:
+            try:
+                result["bytes"] = transfer(localFilePath, path)
+                break
+            except Exception as e:
+                if result["retries"] >= retries or not _isTransientError(e):
+                    result["error"] = str(e)
+                    break
+                time.sleep(min(0.5 * 2 ** result["retries"], 10))
+                result["retries"] += 1
+        result["seconds"] = time.monotonic() - startTime
+        return result
+
+    startTime = time.monotonic()
+    files = list(files)
+    if files.__len__() > 0:
+        with ThreadPoolExecutor(max_workers=max(1, min(numThreads, files.__len__()))) as executor:
+            results = list(executor.map(lambda file: transferWithRetries(file[0], file[1]), files))
+    else:
+        results = []
+    seconds = time.monotonic() - startTime
+
+    nBytes = sum(result["bytes"] for result in results)
+    report = {"files": results, "bytes": nBytes, "seconds": seconds, "throughput": nBytes / seconds if seconds > 0 else 0.0,
+              "retries": sum(result["retries"] for result in results), "failed": sum(1 for result in results if result["error"] is not None)}
+    if verbose:
+        print(verb + " " + str(results.__len__() - report["failed"]) + " of " + str(results.__len__()) + " files, " + _Http.formatThroughput(nBytes, seconds) + ", with " + str(report["retries"]) + " retries.")
+    return report
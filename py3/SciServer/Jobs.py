@@ -3,8 +3,8 @@ __author__ = 'mtaghiza'
 import sys
 import os;
 import os.path;
-from SciServer import Authentication, Config
-import requests
+from SciServer import Authentication, Config, _Http, _Poller
+import asyncio
 import json
 import time;
 
@@ -31,7 +31,7 @@ def getDockerComputeDomains():
 
         url = Config.RacmApiURL + "/jobm/rest/computedomains?batch=true&interactive=false&TaskName=" + taskName
         headers = {'X-Auth-Token': token, "Content-Type": "application/json"}
-        res = requests.get(url, headers=headers, stream=True)
+        res = _Http.get(url, headers=headers, stream=True)
 
         if res.status_code != 200:
             raise Exception("Error when getting Docker Compute Domains from JOBM API.\nHttp Response from JOBM API returned status code " + str(res.status_code) + ":\n" + res.content.decode());
@@ -135,7 +135,7 @@ def getJobsList(top=10, open=None, start=None, end=None, type='all'):
         url = url + topString + startString + endString + "TaskName=" + taskName;
 
         headers = {'X-Auth-Token': token, "Content-Type": "application/json"}
-        res = requests.get(url, headers=headers, stream=True)
+        res = _Http.get(url, headers=headers, stream=True)
 
         if res.status_code != 200:
             raise Exception("Error when getting list of jobs from JOBM API.\nHttp Response from JOBM API returned status code " + str(res.status_code) + ":\n" + res.content.decode());
@@ -165,7 +165,7 @@ def getJobDescription(jobId):
 
         url = Config.RacmApiURL + "/jobm/rest/jobs/" + str(jobId) + "?TaskName="+taskName
         headers = {'X-Auth-Token': token, "Content-Type": "application/json"}
-        res = requests.get(url, headers=headers, stream=True)
+        res = _Http.get(url, headers=headers, stream=True)
 
         if res.status_code != 200:
             raise Exception("Error when getting from JOBM API the job status of jobId=" + str(jobId) + ".\nHttp Response from JOBM API returned status code " + str(res.status_code) + ":\n" + res.content.decode());
@@ -186,7 +186,56 @@ def getJobStatus(jobId):
 
     .. seealso:: Jobs.submitShellCommandJob, Jobs.getJobStatus, Jobs.getDockerComputeDomains, Jobs.cancelJob
     """
-    intStatus = getJobDescription(jobId)["status"]
+    return _getJobStatusFromDescription(getJobDescription(jobId), jobId)
+
+
+async def getJobDescriptionAsync(jobId):
+    """
+    Asynchronous version of Jobs.getJobDescription, which returns an awaitable object. The descriptions of many jobs can be fetched concurrently from a single thread, e.g., by using asyncio.gather.
+
+    :param jobId: Id of job
+    :return: dictionary containing the description or definition of the job.
+    :raises: Throws an exception if the HTTP request to the Authentication URL returns an error, and if the HTTP request to the JOBM API returns an error. Throws an exception if the 'aiohttp' package is not installed.
+    :example: jobs = await asyncio.gather(*[Jobs.getJobDescriptionAsync(jobId) for jobId in jobIds]);
+
+    .. seealso:: Jobs.getJobDescription, Jobs.getJobStatusAsync
+    """
+    token = await asyncio.to_thread(Authentication.getToken)
+    if token is not None and token != "":
+
+        if Config.isSciServerComputeEnvironment():
+            taskName = "Compute.SciScript-Python.Jobs.getJobDescriptionAsync"
+        else:
+            taskName = "SciScript-Python.Jobs.getJobDescriptionAsync"
+
+        url = Config.RacmApiURL + "/jobm/rest/jobs/" + str(jobId) + "?TaskName="+taskName
+        headers = {'X-Auth-Token': token, "Content-Type": "application/json"}
+        res = await _Http.requestAsync("GET", url, headers=headers)
+
+        if res.status_code != 200:
+            raise Exception("Error when getting from JOBM API the job status of jobId=" + str(jobId) + ".\nHttp Response from JOBM API returned status code " + str(res.status_code) + ":\n" + res.content.decode());
+        else:
+            return json.loads(res.content.decode())
+    else:
+        raise Exception("User token is not defined. First log into SciServer.")
+
+
+async def getJobStatusAsync(jobId):
+    """
+    Asynchronous version of Jobs.getJobStatus, which returns an awaitable object.
+
+    :param jobId: Id of job (integer).
+    :return: dictionary with the integer value of the job status, as well as its semantic meaning.
+    :raises: Throws an exception if the HTTP request to the Authentication URL returns an error, and if the HTTP request to the JOBM API returns an error. Throws an exception if the 'aiohttp' package is not installed.
+    :example: statuses = await asyncio.gather(*[Jobs.getJobStatusAsync(jobId) for jobId in jobIds]);
+
+    .. seealso:: Jobs.getJobStatus, Jobs.getJobDescriptionAsync
+    """
+    return _getJobStatusFromDescription(await getJobDescriptionAsync(jobId), jobId)
+
+
+def _getJobStatusFromDescription(jobDescription, jobId):
+    intStatus = jobDescription["status"]
 
     if intStatus == 1:
         return {'status':intStatus, 'statusMeaning':"PENDING", 'jobId':jobId}
@@ -310,7 +359,7 @@ def submitNotebookJob(notebookPath, dockerComputeDomain=None, dockerImageName=No
         data = json.dumps(dockerJobModel).encode()
         url = Config.RacmApiURL + "/jobm/rest/jobs/docker?TaskName="+taskName;
         headers = {'X-Auth-Token': token, "Content-Type": "application/json"}
-        res = requests.post(url, data=data, headers=headers, stream=True)
+        res = _Http.post(url, data=data, headers=headers, stream=True)
 
         if res.status_code != 200:
             raise Exception("Error when submitting a notebook job to the JOBM API.\nHttp Response from JOBM API returned status code " + str(res.status_code) + ":\n" + res.content.decode());
@@ -425,7 +474,7 @@ def submitShellCommandJob(shellCommand, dockerComputeDomain = None, dockerImageN
         data = json.dumps(dockerJobModel).encode()
         url = Config.RacmApiURL + "/jobm/rest/jobs/docker?TaskName="+taskName;
         headers = {'X-Auth-Token': token, "Content-Type": "application/json"}
-        res = requests.post(url, data=data, headers=headers, stream=True)
+        res = _Http.post(url, data=data, headers=headers, stream=True)
 
         if res.status_code != 200:
             raise Exception("Error when submitting a job to the JOBM API.\nHttp Response from JOBM API returned status code " + str(res.status_code) + ":\n" + res.content.decode());
@@ -455,7 +504,7 @@ def cancelJob(jobId):
 
         url = Config.RacmApiURL + "/jobm/rest/jobs/" + str(jobId) + "/cancel?TaskName="+taskName
         headers = {'X-Auth-Token': token, "Content-Type": "application/json"}
-        res = requests.post(url, headers=headers, stream=True)
+        res = _Http.post(url, headers=headers, stream=True)
 
         if res.status_code != 200:
             raise Exception("Error when getting from JOBM API the job status of jobId=" + str(jobId) + ".\nHttp Response from JOBM API returned status code " + str(res.status_code) + ":\n" + res.content.decode());
@@ -465,40 +514,35 @@ def cancelJob(jobId):
         raise Exception("User token is not defined. First log into SciServer.")
 
 
-def waitForJob(jobId, verbose=False, pollTime = 5):
+def waitForJob(jobId, verbose=False, pollTime=None, maxPollTime=None, timeout=None, callback=None):
     """
     Queries regularly the job status and waits until the job is completed.
 
     :param jobId: id of job (integer)
     :param verbose: if True, will print "wait" messages on the screen while the job is still running. If False, will suppress the printing of messages on the screen.
-    :param pollTime: idle time interval (integer, in seconds) before querying again for the job status. Minimum value allowed is 5 seconds.
+    :param pollTime: initial idle time interval (float, in seconds) before querying again for the job status, which then grows exponentially while the job is running. If not set, then Config.PollTime is used.
+    :param maxPollTime: maximum idle time interval (float, in seconds) before querying again for the job status. If not set, then Config.PollMaxTime is used.
+    :param timeout: maximum time (float, in seconds) to wait for the job to be completed. If set to None, then waits with no time limit.
+    :param callback: function called as callback(jobDesc, elapsedSeconds) each time the job status is queried and the job is not completed yet, e.g., to report progress.
     :return: After the job is finished, returns a dictionary object containing the job definition.
-    :raises: Throws an exception if the user is not logged into SciServer (use Authentication.login for that purpose). Throws an exception if the HTTP request to the JOBM API returns an error.
+    :raises: Throws an exception if the user is not logged into SciServer (use Authentication.login for that purpose). Throws an exception if the HTTP request to the JOBM API returns an error. Throws an exception if the timeout is reached before the job is completed.
     :example:  dockerComputeDomain = Jobs.getDockerComputeDomains()[0]; job = Jobs.submitShellCommandJob(dockerComputeDomain,'pwd', 'Python (astro)');Jobs.waitForJob(job.get('id'))
 
     .. seealso:: Jobs.getJobStatus, Jobs.getDockerComputeDomains, Jobs.submitNotebookJob, Jobs.submitShellCommandJob
     """
     try:
-        minPollTime = 5 # in seconds
-        complete = False
         waitingStr = "Waiting..."
-        back = "\b" * len(waitingStr)
         if verbose:
             print(waitingStr)
 
-        while not complete:
+        def getStatus():
             if verbose:
-                #print back,
                 print(waitingStr)
-            jobDesc = getJobStatus(jobId)
-            jobStatus = jobDesc["status"]
-            if jobStatus >= 32:
-                complete = True
-                if verbose:
-                    #print back,
-                    print("Done!")
-            else:
-                time.sleep(max(minPollTime,pollTime));
+            return getJobStatus(jobId)
+
+        jobDesc = _Poller.poll(getStatus, lambda jobDesc: jobDesc["status"] >= 32, pollTime, maxPollTime, timeout, callback, "job " + str(jobId))
+        if verbose:
+            print("Done!")
 
         return jobDesc
     except Exception as e:
@@ -3,7 +3,6 @@ __author__ = 'mtaghiza, gerard'
 
 import json
 import sys
-import requests
 import os.path
 import warnings
 import SciServer.Authentication;
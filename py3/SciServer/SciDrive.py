@@ -1,17 +1,27 @@
+import contextvars
 import json
 from io import StringIO
 from io import BytesIO
 import urllib
-import requests as requests
 
-from SciServer import Config, Authentication
+from SciServer import Config, Authentication, _Http
 
 
 class Task:
     """
     The class TaskName stores the name of the task that executes the API call.
+    The name is kept in a context variable, so that each thread and each asyncio task sees its own value, and concurrent calls do not mix up their task names.
     """
-    name = None
+    def __init__(self):
+        self._name = contextvars.ContextVar("SciServer.SciDrive.task.name", default=None)
+
+    @property
+    def name(self):
+        return self._name.get()
+
+    @name.setter
+    def name(self, name):
+        self._name.set(name)
 
 
 task = Task();
@@ -43,7 +53,7 @@ def createContainer(path):
         url = Config.SciDriveHost + '/vospace-2.0/nodes/' + path + "?TaskName=" + taskName;
         data = str.encode(containerBody)
         headers = {'X-Auth-Token': token, 'Content-Type': 'application/xml'}
-        res = requests.put(url, data=data, headers=headers)
+        res = _Http.put(url, data=data, headers=headers)
         if res.status_code < 200 or res.status_code >= 300:
             raise Exception("Error when creating SciDrive container at " + str(path) + ".\nHttp Response from SciDrive API returned status code " + str(res.status_code) + ":\n" + res.content.decode());
 
@@ -78,9 +88,9 @@ def upload(path, data="", localFilePath=""):
         headers = {'X-Auth-Token': token}
         if(localFilePath != ""):
             with open(localFilePath, "rb") as file:
-                res = requests.put(url, data=file, headers=headers, stream=True)
+                res = _Http.put(url, data=file, headers=headers, stream=True)
         else:
-            res = requests.put(url, data=data, headers=headers, stream=True)
+            res = _Http.put(url, data=data, headers=headers, stream=True)
 
         if res.status_code != 200:
             if (localFilePath != None):
@@ -119,7 +129,7 @@ def publicUrl(path):
 
         url = Config.SciDriveHost + '/vospace-2.0/1/media/sandbox/' + str(path) + "?TaskName=" + taskName
         headers = {'X-Auth-Token': token}
-        res = requests.get(url, headers=headers)
+        res = _Http.get(url, headers=headers)
         if res.status_code != 200:
             raise Exception("Error when getting the public URL of SciDrive file " + str(path) + ".\nHttp Response from SciDrive API returned status code " + str(res.status_code) + ":\n" + res.content.decode());
 
@@ -153,7 +163,7 @@ def directoryList(path=""):
 
         url = Config.SciDriveHost + "/vospace-2.0/1/metadata/sandbox/" + str(path) + "?list=True&path="  + str(path) + "&TaskName=" + taskName;
         headers = {'X-Auth-Token': token}
-        res = requests.get(url, headers=headers)
+        res = _Http.get(url, headers=headers)
         if res.status_code != 200:
             raise Exception("Error when getting the public URL of SciDrive file " + str(path) + ".\nHttp Response from SciDrive API returned status code " + str(res.status_code) + ":\n" + res.content.decode());
 
@@ -188,7 +198,7 @@ def download(path, format="text", localFilePath=""):
             task.name = "SciScript-Python.SciDrive.download"
 
         fileUrl = publicUrl(path)
-        res = requests.get(fileUrl, stream=True)
+        res = _Http.get(fileUrl, stream=True)
         if res.status_code != 200:
             raise Exception("Error when downloading SciDrive file " + str(path) + ".\nHttp Response from SciDrive API returned status code " + str(res.status_code) + ":\n" + res.content.decode());
 
@@ -247,7 +257,7 @@ def delete(path):
         url = Config.SciDriveHost + '/vospace-2.0/nodes/' + path + "?TaskName=" + taskName;
         data = str.encode(containerBody)
         headers = {'X-Auth-Token': token, 'Content-Type': 'application/xml'}
-        res = requests.delete(url, data=data, headers=headers)
+        res = _Http.delete(url, data=data, headers=headers)
         if res.status_code < 200 or res.status_code >= 300:
             raise Exception("Error when deleting " + str(path) + " in SciDrive.\nHttp Response from SciDrive API returned status code " + str(res.status_code) + ":\n" + res.content.decode());
 
@@ -1,14 +1,19 @@
-from SciServer import Authentication, Config, Files, Jobs
+from SciServer import Authentication, Config, Files, Jobs, _Http, _Poller
 import pandas as pd
 import json
-import requests
-import cachetools.func
 from collections.abc import Iterable
 from datetime import datetime
 import warnings
 from pathlib import PurePosixPath
 from typing import Union, List
 import time
+import asyncio
+import copy
+import threading
+
+
+_rdb_compute_domain_registry = {}
+_rdb_compute_domain_registry_lock = threading.RLock()
 
 
 class OutputType:
@@ -17,23 +22,80 @@ class OutputType:
     """
     FILE_JSON = "FILE_JSON"
     FILE_CSV = "FILE_CSV"
+    FILE_PARQUET = "FILE_PARQUET"
     DATABASE_TABLE = "TABLE"
 
 
-@cachetools.func.ttl_cache(maxsize=128, ttl=120)
 def _get_file_service(file_service: str = None):
-    file_services = Files.getFileServices(verbose=False)
+    registry = Files._getFileServiceRegistry(verbose=False)
     if file_service is None:
-        if len(file_services) > 0:
-            return file_services[0]
+        if len(registry["fileServices"]) > 0:
+            return registry["fileServices"][0]
         raise Exception("No file services available for the user.")
     else:
-        for fs in file_services:
-            if file_service == fs.get("name") or file_service == fs.get("identifier"):
-                return fs
+        fs = registry["byName"].get(file_service) or registry["byIdentifier"].get(file_service)
+        if fs is not None:
+            return fs
         raise Exception("Unable to find fileService")
 
 
+def _get_rdb_compute_domain_registry() -> dict:
+    """
+    Returns the registry of RDB compute domains available to the logged-in user, as a dictionary with the list of
+    domain dictionaries under the key "domains", and indexes of them by name, id and racmId under the keys "by_name",
+    "by_id" and "by_racm_id".
+    The registry is kept per user token, and fetched again from the SciQuery API only when it is older than
+    Config.RDBComputeDomainRegistryTTL seconds or after SciQuery.refresh() is called.
+    """
+    token = SciQuery.get_token()
+    registry = _rdb_compute_domain_registry.get(token)
+    if registry is not None and time.monotonic() - registry["time"] < Config.RDBComputeDomainRegistryTTL:
+        return registry
+
+    with _rdb_compute_domain_registry_lock:
+        # only one thread fetches the domains, while the rest wait for its result.
+        registry = _rdb_compute_domain_registry.get(token)
+        if registry is not None and time.monotonic() - registry["time"] < Config.RDBComputeDomainRegistryTTL:
+            return registry
+        domains = _fetch_rdb_compute_domains(token)
+        registry = {"domains": domains,
+                    "by_name": {},
+                    "by_id": {},
+                    "by_racm_id": {},
+                    "time": time.monotonic()}
+        for domain in domains:
+            registry["by_name"].setdefault(domain.get('name'), domain)
+            registry["by_id"].setdefault(domain.get('id'), domain)
+            registry["by_racm_id"].setdefault(domain.get('racmId'), domain)
+        now = registry["time"]
+        for key in [key for key, value in _rdb_compute_domain_registry.items()
+                    if now - value["time"] >= Config.RDBComputeDomainRegistryTTL]:
+            del _rdb_compute_domain_registry[key]
+        _rdb_compute_domain_registry[token] = registry
+        return registry
+
+
+def _fetch_rdb_compute_domains(token: str) -> list:
+    if Config.isSciServerComputeEnvironment():
+        task_name = "Compute.SciScript-Python.SciQuery.get_rdb_compute_domains"
+    else:
+        task_name = "SciScript-Python.SciQuery.get_rdb_compute_domains"
+
+    url = Config.SciqueryURL + "/api/info/domain?TaskName=" + task_name
+    headers = {'X-Auth-Token': token, "Content-Type": "application/json"}
+    res = _Http.get(url, headers=headers, stream=True)
+    if res.status_code != 200:
+        raise Exception(
+            "Error when getting RDB Compute Domains from the SciQuery API.\nHttp Response from the SciQuery API "
+            "returned status code " + str(res.status_code) + ":\n" + res.content.decode())
+    return json.loads(res.content.decode())
+
+
+def _invalidate_rdb_compute_domains():
+    with _rdb_compute_domain_registry_lock:
+        _rdb_compute_domain_registry.clear()
+
+
 class Output:
 
     def __init__(self,
@@ -217,10 +279,11 @@ class DatabaseTableOutput(Output):
         if type(table) != str or type(schema) != str:
             raise TypeError("Input parameter(s) 'table' or 'schema' should be of type string.")
 
-        domain = RDBComputeDomains.get_default_rdb_compute_domain() if not rdb_compute_domain else rdb_compute_domain
+        domain = SciQuery.get_rdb_compute_domains().get_default_rdb_compute_domain() if not rdb_compute_domain else \
+            rdb_compute_domain
         if not database:
             if type(domain) == str:
-                database = SciQuery.get_rdb_compute_domains().get_rdb_compute_domain(domain).get_default_database().name
+                database = RDBComputeDomain(domain).get_default_database().name
             else:
                 database = domain.get_default_database().name
                 domain = domain.name
@@ -239,9 +302,10 @@ class DatabaseTableOutput(Output):
         Gets a OutputTarget object filled with default values: JSON output file where only the 1st SQL statement of
         the query is written in it.
         """
+        domain = SciQuery.get_rdb_compute_domains().get_default_rdb_compute_domain()
         return cls(table = "resultTable",
-                   database = RDBComputeDomains.get_default_rdb_compute_domain().get_default_database().name,
-                   rdb_compute_domain = RDBComputeDomains.get_default_rdb_compute_domain().name,
+                   database = domain.get_default_database().name,
+                   rdb_compute_domain = domain.name,
                    schema = "",
                    statement_indexes = [1])
 
@@ -470,6 +534,42 @@ class RDBJob:
 
         return data
 
+    async def get_output_as_string_async(self, output: Union[Output, int, str] = None):
+        """
+        Asynchronous version of get_output_as_string, which returns an awaitable object.
+        """
+        if not Config.isSciServerComputeEnvironment() and not isinstance(output, str):
+            out = self._get_output_from_index(output) if isinstance(output, int) else output
+            await asyncio.to_thread(self.get_output_path, out)
+            fs = await asyncio.to_thread(FileOutput.find_file_service, out.file_service_identifier)
+            return await Files.downloadAsync(fs, out.file_service_path, format="txt", quiet=True)
+        # the output is read from the local file system, in another thread so that the event loop is not blocked.
+        return await asyncio.to_thread(self.get_output_as_string, output)
+
+    def _get_output_as_file(self, out: Output):
+        """
+        Gets the path of an output file when it is accessible in the local file system, or its content as a BytesIO object otherwise.
+        """
+        file_path = self.get_output_path(out)
+        if Config.isSciServerComputeEnvironment():
+            return file_path
+        fs = FileOutput.find_file_service(out.file_service_identifier)
+        return Files.download(fs, out.file_service_path, format="BytesIO", quiet=True)
+
+    def get_arrow_table_from_output(self, output: Union[Output, int] = 0):
+        """
+        Gets query output written in a file of type OutputType.FILE_PARQUET as a pyarrow.Table, without converting it into a Pandas DataFrame.
+        Requires the 'pyarrow' package.
+        """
+        out = self._get_output_from_index(output) if isinstance(output, int) else output
+        if out.output_type != OutputType.FILE_PARQUET:
+            raise Exception(f"Output type {out.output_type} not supported")
+        try:
+            import pyarrow.parquet
+        except ImportError:
+            raise Exception("Reading parquet outputs requires the 'pyarrow' package. Install it with 'pip install pyarrow'.")
+        return pyarrow.parquet.read_table(self._get_output_as_file(out))
+
     def get_json_output(self, output: Union[Output, int, str] = 0) -> dict:
         """
         Gets content of output file in SciServer's filesystem as a dictionary.
@@ -483,11 +583,11 @@ class RDBJob:
         """
         out = self._get_output_from_index(output) if isinstance(output, int) else output
         if out.output_type == OutputType.FILE_JSON:
-            result = self.get_json_output(out)[result_index]
-            df = pd.DataFrame(result['Data'], columns=result['ColumnNames'])
-            df.name = result['TableName']
+            df = self._get_dataframe_from_json_output(self.get_json_output(out), result_index)
         elif out.output_type == OutputType.FILE_CSV:
             df = pd.read_csv(out.get_path(), skiprows=1)
+        elif out.output_type == OutputType.FILE_PARQUET:
+            df = pd.read_parquet(self._get_output_as_file(out))
         elif out.output_type == OutputType.DATABASE_TABLE:
             sq = SciQuery(rdb_compute_domain=out.rdb_compute_domain_name, database=out.database)
             query = f"select * from {out.table};"
@@ -496,6 +596,24 @@ class RDBJob:
             raise Exception(f"Output type {out.output_type} not supported")
         return df
 
+    async def get_dataframe_from_output_async(self, output: Union[Output, int] = 0,
+                                              result_index: int = 0) -> pd.DataFrame:
+        """
+        Asynchronous version of get_dataframe_from_output, which returns an awaitable object.
+        """
+        out = self._get_output_from_index(output) if isinstance(output, int) else output
+        if out.output_type == OutputType.FILE_JSON:
+            data_dict = json.loads(await self.get_output_as_string_async(out))
+            return self._get_dataframe_from_json_output(data_dict.get("Result"), result_index)
+        return await asyncio.to_thread(self.get_dataframe_from_output, out, result_index)
+
+    @staticmethod
+    def _get_dataframe_from_json_output(results: list, result_index: int = 0) -> pd.DataFrame:
+        result = results[result_index]
+        df = pd.DataFrame(result['Data'], columns=result['ColumnNames'])
+        df.name = result['TableName']
+        return df
+
     def _get_datetime(self, time):
         return datetime.fromtimestamp(time / 1000.0) if time is not None else None
 
@@ -581,22 +699,29 @@ class RDBComputeDomain:
         are able to query.
 
         :param rdb_compute_domain: Parameter that identifies the domain. Could be either its name (string),
-            ID (integer), or a dictionary containing all the attributes of the domain.
+            ID (integer), or a dictionary containing all the attributes of the domain. A dictionary without the
+            databases of the domain is completed from the domains available to the user, by its 'id' or 'racmId'.
         """
         if type(rdb_compute_domain) not in [str, int, dict]:
             raise TypeError("Invalid type for input parameter 'rdb_compute_domain'.")
 
-        if type(rdb_compute_domain) != dict:
-            domains = SciQuery.get_rdb_compute_domains("dict")
+        if type(rdb_compute_domain) == dict and rdb_compute_domain.get('dbContexts') is None and \
+                rdb_compute_domain.get('databases') is None:
+            registry = _get_rdb_compute_domain_registry()
+            domain = registry["by_id"].get(rdb_compute_domain.get('id')) or \
+                registry["by_racm_id"].get(rdb_compute_domain.get('racmId', rdb_compute_domain.get('_racm_id')))
+            if domain is None:
+                raise NameError("Unable to find rdbComputeDomain {0}.".format(rdb_compute_domain))
+            rdb_compute_domain = copy.deepcopy(domain)
+        elif type(rdb_compute_domain) != dict:
+            registry = _get_rdb_compute_domain_registry()
             if type(rdb_compute_domain) == str:
-                domain = [d for d in domains if d.get('name') == rdb_compute_domain]
-            elif type(rdb_compute_domain) == int:
-                domain = [d for d in domains if d.get('id') == rdb_compute_domain]
+                domain = registry["by_name"].get(rdb_compute_domain)
             else:
-                raise TypeError("Invalid type for input parameter 'rdb_compute_domain'.")
+                domain = registry["by_id"].get(rdb_compute_domain)
 
-            if len(domain) > 0:
-                rdb_compute_domain = domain[0]
+            if domain is not None:
+                rdb_compute_domain = copy.deepcopy(domain)
             else:
                 raise NameError("Unable to find rdbComputeDomain {0}.".format(rdb_compute_domain))
 
@@ -787,7 +912,8 @@ class SciQuery:
         :param hard_fail: Boolean parameter. If True, exceptions will be raised in case of errors during instantiation.
             If False, then no exceptions are raised, and warnings might be showed instead
             (depending on the value of the verbose parameter).
-        :param poll_time: time (float) in seconds between consecutive requests for updates in the jobs status.
+        :param poll_time: initial time (float) in seconds between consecutive requests for updates in the jobs status,
+            which then grows exponentially up to Config.PollMaxTime seconds while a job is running.
         """
 
         self.user = SciQuery.get_user()
@@ -857,7 +983,8 @@ class SciQuery:
         :param hard_fail: Boolean parameter. If True, exceptions will be raised in case of errors during instantiation.
             If False, then no exceptions are raised, and warnings might be showed instead
             (depending on the value of the verbose parameter).
-        :param poll_time: time (float) in seconds between consecutive requests for updates in the jobs status.
+        :param poll_time: initial time (float) in seconds between consecutive requests for updates in the jobs status,
+            which then grows exponentially up to Config.PollMaxTime seconds while a job is running.
         """
 
         self.verbose = verbose if verbose else self.verbose
@@ -923,8 +1050,12 @@ class SciQuery:
 
     def refresh(self):
         """
-        Refreshes SciQuery instance.
+        Refreshes SciQuery instance. The RDB compute domains and file services available to the user, which are
+        otherwise cached for Config.RDBComputeDomainRegistryTTL and Config.FileServiceRegistryTTL seconds, are fetched
+        again.
         """
+        _invalidate_rdb_compute_domains()
+        Files.invalidateFileServices()
         self.set(verbose=self.verbose, hard_fail=self.hard_fail)
 
     @staticmethod
@@ -940,6 +1071,8 @@ class SciQuery:
     def get_rdb_compute_domains(result_format: str = 'class') -> RDBComputeDomains:
         """
         Gets a list of all registered Relational Database (RDB) compute domains that the user has access to.
+        The domains are cached per user token for Config.RDBComputeDomainRegistryTTL seconds, and fetched again after
+        calling SciQuery.refresh().
 
         :param result_format: If set to "class", then the returned value will be of class RDBComputeDomains.
             If set to "dict", then the return value will be a list of dictionaries, each of them containing the
@@ -947,26 +1080,12 @@ class SciQuery:
         :return: an object of class RDBComputeDomains, or a list of dictionaries, each of them containing the
             attributes of an RDBComputeDomain object.
         """
-        token = SciQuery.get_user().token
-
-        if Config.isSciServerComputeEnvironment():
-            task_name = "Compute.SciScript-Python.SciQuery.get_rdb_compute_domains"
-        else:
-            task_name = "SciScript-Python.SciQuery.get_rdb_compute_domains"
-
-        url = Config.SciqueryURL + "/api/info/domain?TaskName=" + task_name
-        headers = {'X-Auth-Token': token, "Content-Type": "application/json"}
-        res = requests.get(url, headers=headers, stream=True)
-        if res.status_code != 200:
-            raise Exception(
-                "Error when getting RDB Compute Domains from the SciQuery API.\nHttp Response from the SciQuery API "
-                "returned status code " + str(res.status_code) + ":\n" + res.content.decode())
+        domains = _get_rdb_compute_domain_registry()["domains"]
+        if result_format == 'class':
+            # copies of the cached domains are used, so that changes to the returned objects do not alter the cache.
+            return RDBComputeDomains([RDBComputeDomain(copy.deepcopy(d)) for d in domains])
         else:
-            arr = json.loads(res.content.decode())
-            if result_format == 'class':
-                return RDBComputeDomains([RDBComputeDomain(d) for d in arr])
-            else:
-                return arr
+            return copy.deepcopy(domains)
 
     # rdb_compute_domains ---------------------------------------------------
 
@@ -1198,7 +1317,48 @@ class SciQuery:
         :param job_alias: alias (string) of job, defined by the user.
         :return: the ID (string) that labels the job.
         """
+        url, data, headers = self._get_query_job_request("submit_query_job", sql_query, database, outputs,
+                                                         results_base_path, rdb_compute_domain, file_service, job_alias)
+        res = _Http.post(url, data=data, headers=headers, stream=True)
+        if res.status_code < 200 or res.status_code >= 300:
+            raise Exception("Error when submitting a job to the SciQuery API.\nHttp Response from SciQuery API " +
+                            "returned status code " + str(res.status_code) + ":\n" + res.content.decode());
+        else:
+            return res.content.decode()
+
+    async def submit_query_job_async(self,
+                                     sql_query: str,
+                                     database: Union[str, int, dict, Database] = None,
+                                     outputs: Union[Outputs, Output] = None,
+                                     results_base_path: str = None,
+                                     rdb_compute_domain: Union[str, int, dict, RDBComputeDomain] = None,
+                                     file_service: str = None,
+                                     job_alias: str = "") -> str:
+        """
+        Asynchronous version of submit_query_job, which returns an awaitable object. Many query jobs can be submitted
+        concurrently from a single thread, e.g., by using asyncio.gather. Takes the same parameters as
+        submit_query_job.
 
+        :return: the ID (string) that labels the job.
+        :raises: Throws an exception if the HTTP request to the SciQuery API returns an error. Throws an exception if
+            the 'aiohttp' package is not installed.
+        """
+        # building the request might fetch the domains and file services, so it is done in another thread.
+        url, data, headers = await asyncio.to_thread(self._get_query_job_request, "submit_query_job_async", sql_query,
+                                                     database, outputs, results_base_path, rdb_compute_domain,
+                                                     file_service, job_alias)
+        res = await _Http.requestAsync("POST", url, data=data, headers=headers)
+        if res.status_code < 200 or res.status_code >= 300:
+            raise Exception("Error when submitting a job to the SciQuery API.\nHttp Response from SciQuery API " +
+                            "returned status code " + str(res.status_code) + ":\n" + res.content.decode());
+        else:
+            return res.content.decode()
+
+    def _get_query_job_request(self, function_name, sql_query, database, outputs, results_base_path,
+                               rdb_compute_domain, file_service, job_alias):
+        """
+        Builds the url, body and headers of the HTTP request that submits a query job to the SciQuery API.
+        """
         domain = self.get_rdb_compute_domain(rdb_compute_domain)
         db = self.get_database(database, domain)
         fs = self.get_file_service(file_service)
@@ -1219,19 +1379,14 @@ class SciQuery:
         }
 
         if Config.isSciServerComputeEnvironment():
-            task_name = "Compute.SciScript-Python.SciQuery.submit_query_job"
+            task_name = "Compute.SciScript-Python.SciQuery." + function_name
         else:
-            task_name = "SciScript-Python.SciQuery.submit_query_job"
+            task_name = "SciScript-Python.SciQuery." + function_name
 
         data = json.dumps(job_model).encode()
         url = Config.SciqueryURL + "/api/jobs/" + str(domain._racm_id) + "?TaskName=" + task_name;
         headers = {'X-Auth-Token': self.user.token, "Content-Type": "application/json"}
-        res = requests.post(url, data=data, headers=headers, stream=True)
-        if res.status_code < 200 or res.status_code >= 300:
-            raise Exception("Error when submitting a job to the SciQuery API.\nHttp Response from SciQuery API " +
-                            "returned status code " + str(res.status_code) + ":\n" + res.content.decode());
-        else:
-            return res.content.decode()
+        return url, data, headers
 
     def execute_query(self,
                       sql_query,
@@ -1279,6 +1434,41 @@ class SciQuery:
         if write_job_id:
             print("Query was submitted as a job with id = " + job_id)
         job = self.wait_for_job(job_id, verbose=False)
+        self._check_query_job(job)
+        df = job.get_dataframe_from_output(0)
+        return df
+
+    async def execute_query_async(self,
+                                  sql_query,
+                                  database: Union[str, int, dict, Database] = None,
+                                  results_base_path: str = None,
+                                  rdb_compute_domain: Union[str, int, dict, RDBComputeDomain] = None,
+                                  job_alias: str = "",
+                                  file_service: str = None,
+                                  write_job_id = True) -> pd.DataFrame:
+        """
+        Asynchronous version of execute_query, which returns an awaitable object. Many queries can be executed
+        concurrently from a single thread, e.g., by using asyncio.gather. Takes the same parameters as execute_query.
+
+        :return: Pandas data frame containing the result of the query.
+        :raises: Throws an exception if the HTTP request to the SciQuery API returns an error. Throws an exception if
+            the 'aiohttp' package is not installed.
+        """
+        output = FileOutput("result1.json", OutputType.FILE_JSON, 1)
+        job_alias = job_alias if job_alias else "synchronous query"
+        job_id = await self.submit_query_job_async(sql_query=sql_query, rdb_compute_domain=rdb_compute_domain,
+                                                   database=database, outputs=output,
+                                                   results_base_path=results_base_path, job_alias=job_alias,
+                                                   file_service=file_service)
+        if write_job_id:
+            print("Query was submitted as a job with id = " + job_id)
+        job = await self.wait_for_job_async(job_id, verbose=False)
+        self._check_query_job(job)
+        df = await job.get_dataframe_from_output_async(0)
+        return df
+
+    @staticmethod
+    def _check_query_job(job):
         if job.status > 32:
             messages = ". ".join(job.message_list)
             if job.status == 64:
@@ -1286,9 +1476,6 @@ class SciQuery:
             if job.status == 128:
                 raise Exception("Query was cancelled. " + messages)
 
-        df = job.get_dataframe_from_output(0)
-        return df
-
     @staticmethod
     def get_jobs_list(top=5, open=None, start=None, end=None, result_format="pandas") \
             -> Union[pd.DataFrame, list]:
@@ -1352,29 +1539,58 @@ class SciQuery:
         else:
             raise NameError("Invalid type for input parameter 'job'.")
 
-    def wait_for_job(self, job_id, verbose=False):
+    def wait_for_job(self, job_id, verbose=False, timeout: float = None, callback=None):
         """
-        Queries the job status regularly and waits until the job is completed.
+        Queries the job status regularly and waits until the job is completed. The job status is queried after
+        'poll_time' seconds at first, and the interval between queries then grows exponentially up to
+        Config.PollMaxTime seconds while the job is running.
 
         :param job_id: id of job (integer)
         :param verbose: if True, will print "wait" messages on the screen while the job is still running. If False, it
             will suppress the printing of messages on the screen.
+        :param timeout: maximum time (float, in seconds) to wait for the job to be completed. If set to None, then
+            waits with no time limit.
+        :param callback: function called as callback(job_desc, elapsed_seconds) each time the job status is queried
+            and the job is not completed yet, e.g., to report progress.
         :return: After the job is finished, returns an object of class RDBJob, containing the job definition.
         :raises: Throws an exception if the user is not logged into SciServer (use Authentication.login for that
             purpose).
             Throws an exception if the HTTP request to the JOBM API returns an error.
+            Throws an exception if the timeout is reached before the job is completed.
         """
-        t = max(0.5, self.poll_time)
-        wait_message = "Waiting"
-        while True:
-            job_desc = Jobs.getJobDescription(job_id)
-            if job_desc.get("status") >= 32:
-                return RDBJob(job_desc)
-            else:
-                if verbose:
-                    wait_message += "."
-                    print(wait_message, end="\r")
-                time.sleep(t)
+        job_desc = _Poller.poll(lambda: Jobs.getJobDescription(job_id), lambda job_desc: job_desc.get("status") >= 32,
+                                self.poll_time, None, timeout, self._get_wait_callback(verbose, callback),
+                                "job " + str(job_id))
+        return RDBJob(job_desc)
+
+    async def wait_for_job_async(self, job_id, verbose=False, timeout: float = None, callback=None):
+        """
+        Asynchronous version of wait_for_job, which returns an awaitable object. Many jobs can be waited for
+        concurrently from a single thread, e.g., by using asyncio.gather. Takes the same parameters as wait_for_job.
+
+        :return: After the job is finished, returns an object of class RDBJob, containing the job definition.
+        :raises: Throws an exception if the HTTP request to the JOBM API returns an error. Throws an exception if
+            the 'aiohttp' package is not installed. Throws an exception if the timeout is reached before the job is
+            completed.
+        """
+        job_desc = await _Poller.pollAsync(lambda: Jobs.getJobDescriptionAsync(job_id),
+                                           lambda job_desc: job_desc.get("status") >= 32,
+                                           self.poll_time, None, timeout, self._get_wait_callback(verbose, callback),
+                                           "job " + str(job_id))
+        return RDBJob(job_desc)
+
+    @staticmethod
+    def _get_wait_callback(verbose, callback):
+        if not verbose:
+            return callback
+        wait_message = ["Waiting"]
+
+        def wait_callback(job_desc, elapsed_seconds):
+            wait_message[0] += "."
+            print(wait_message[0], end="\r")
+            if callback is not None:
+                callback(job_desc, elapsed_seconds)
+        return wait_callback
 
     # METADATA -------------------------------------------------------------------------------------------------
 
@@ -1470,7 +1686,7 @@ class SciQuery:
 
         url += "?taskName=" + task_name
         headers = {'X-Auth-Token': self.user.token}
-        res = requests.get(url, headers=headers, stream=True)
+        res = _Http.get(url, headers=headers, stream=True)
 
         if res.status_code < 200 or res.status_code >= 300:
             raise Exception("Error when getting metadata from SciQuery API.\nHttp Response from SciQuery API " +
@@ -3,11 +3,10 @@ import json
 import sys
 from io import StringIO
 
-import requests
 import pandas
 import time
 import urllib
-from SciServer import Authentication, Config
+from SciServer import Authentication, Config, _Http, _Poller
 
 
 ######################################################################################################################
@@ -39,7 +38,7 @@ def getJobStatus(jobId):
         headers = {'Content-Type': 'application/json','Accept': 'application/json'}
         headers['X-Auth-Token']=  token
 
-        response = requests.get(statusURL, headers=headers)
+        response = _Http.get(statusURL, headers=headers)
 
         if response.status_code == 200:
             r = response.json()
@@ -75,7 +74,7 @@ def cancelJob(jobId):
         headers = {'Content-Type': 'application/json','Accept': 'application/json'}
         headers['X-Auth-Token']=  token
 
-        response = requests.delete(statusURL, headers=headers)
+        response = _Http.delete(statusURL, headers=headers)
 
         if response.status_code == 200:
             #r = response.json()
@@ -118,7 +117,7 @@ def listQueues():
         headers = {'Content-Type': 'application/json','Accept': 'application/json'}
         headers['X-Auth-Token']=  token
 
-        response = requests.get(jobsURL, headers=headers)
+        response = _Http.get(jobsURL, headers=headers)
 
         if response.status_code == 200:
             r = response.json()
@@ -154,7 +153,7 @@ def getQueueInfo(queue):
         headers = {'Content-Type': 'application/json','Accept': 'application/json'}
         headers['X-Auth-Token']=  token
 
-        response = requests.get(jobsURL, headers=headers)
+        response = _Http.get(jobsURL, headers=headers)
 
         if response.status_code == 200:
             r = response.json()
@@ -195,7 +194,7 @@ def submitJob(query, queue='quick'):
 
         data=json.dumps(body).encode()
 
-        response = requests.post(jobsURL,data=data,headers=headers)
+        response = _Http.post(jobsURL,data=data,headers=headers)
 
         if response.status_code == 200:
             r = response.json()
@@ -206,39 +205,35 @@ def submitJob(query, queue='quick'):
         raise Exception("User token is not defined. First log into SciServer.")
 
 
-def waitForJob(jobId, verbose=False, pollTime = 5):
+def waitForJob(jobId, verbose=False, pollTime=None, maxPollTime=None, timeout=None, callback=None):
     """
     Queries regularly the job status and waits until the job is completed.
 
     :param jobId: id of job (integer)
     :param verbose: if True, will print "wait" messages on the screen while the job is still running. If False, will suppress the printing of messages on the screen.
-    :param pollTime: idle time interval (integer, in seconds) before querying again for the job status. Minimum value allowed is 5 seconds.
+    :param pollTime: initial idle time interval (float, in seconds) before querying again for the job status, which then grows exponentially while the job is running. If not set, then Config.PollTime is used.
+    :param maxPollTime: maximum idle time interval (float, in seconds) before querying again for the job status. If not set, then Config.PollMaxTime is used.
+    :param timeout: maximum time (float, in seconds) to wait for the job to be completed. If set to None, then waits with no time limit.
+    :param callback: function called as callback(jobDesc, elapsedSeconds) each time the job status is queried and the job is not completed yet, e.g., to report progress.
     :return: After the job is finished, returns a dictionary object containing the job status and related metadata.
-    :raises: Throws an exception if the user is not logged into SciServer (use Authentication.login for that purpose). Throws an exception if the HTTP request to the SkyQuery API returns an error.
+    :raises: Throws an exception if the user is not logged into SciServer (use Authentication.login for that purpose). Throws an exception if the HTTP request to the SkyQuery API returns an error. Throws an exception if the timeout is reached before the job is completed.
     :example: SkyQuery.waitForJob(SkyQuery.submitJob("select 1"))
 
     .. seealso:: SkyQuery.submitJob, SkyQuery.getJobStatus.
     """
     try:
-        minPollTime = 5 # in seconds
-        complete = False
         waitingStr = "Waiting..."
-        back = "\b" * len(waitingStr)
         if verbose:
             print(waitingStr, end="")
 
-        while not complete:
+        def getStatus():
             if verbose:
-                #print(back, end="")
                 print(waitingStr, end="")
-            jobDesc = getJobStatus(jobId)
-            if jobDesc.get('dateFinished') is not None:
-                complete = True
-                if verbose:
-                    #print(back, end="")
-                    print("Done!")
-            else:
-                time.sleep(max(minPollTime,pollTime));
+            return getJobStatus(jobId)
+
+        jobDesc = _Poller.poll(getStatus, lambda jobDesc: jobDesc.get('dateFinished') is not None, pollTime, maxPollTime, timeout, callback, "SkyQuery job " + str(jobId))
+        if verbose:
+            print("Done!")
 
         return jobDesc
     except Exception as e:
@@ -271,7 +266,7 @@ def listJobs(queue="quick"):
         headers = {'Content-Type': 'application/json','Accept': 'application/json'}
         headers['X-Auth-Token']=  token
 
-        response = requests.get(jobsURL,headers=headers)
+        response = _Http.get(jobsURL,headers=headers)
 
         if response.status_code == 200:
             r = response.json()
@@ -312,7 +307,7 @@ def listAllDatasets():
         headers = {'Content-Type': 'application/json','Accept': 'application/json'}
         headers['X-Auth-Token']=  token
 
-        response = requests.get(schemaURL, headers=headers)
+        response = _Http.get(schemaURL, headers=headers)
 
         if response.status_code == 200:
             r = response.json()
@@ -348,7 +343,7 @@ def getDatasetInfo(datasetName="MyDB"):
         headers = {'Content-Type': 'application/json','Accept': 'application/json'}
         headers['X-Auth-Token']=  token
 
-        response = requests.get(schemaURL, headers=headers)
+        response = _Http.get(schemaURL, headers=headers)
 
         if response.status_code == 200:
             return(response.json())
@@ -383,7 +378,7 @@ def listDatasetTables(datasetName="MyDB"):
         headers = {'Content-Type': 'application/json','Accept': 'application/json'}
         headers['X-Auth-Token']=  token
 
-        response = requests.get(url, headers=headers)
+        response = _Http.get(url, headers=headers)
 
         if response.status_code == 200:
             r = response.json()
@@ -420,7 +415,7 @@ def getTableInfo(tableName, datasetName="MyDB"):
         headers = {'Content-Type': 'application/json','Accept': 'application/json'}
         headers['X-Auth-Token']=  token
 
-        response = requests.get(url, headers=headers)
+        response = _Http.get(url, headers=headers)
 
         if response.status_code == 200:
             return(response.json())
@@ -456,7 +451,7 @@ def listTableColumns(tableName, datasetName="MyDB"):
         headers = {'Content-Type': 'application/json','Accept': 'application/json'}
         headers['X-Auth-Token']=  token
 
-        response = requests.get(url, headers=headers)
+        response = _Http.get(url, headers=headers)
 
         if response.status_code == 200:
             r = response.json()
@@ -499,7 +494,7 @@ def getTable(tableName, datasetName="MyDB", top = None):
         headers = {'Content-Type': 'application/json','Accept': 'application/json'}
         headers['X-Auth-Token']=  token
 
-        response = requests.get(url, headers=headers, stream=True)
+        response = _Http.get(url, headers=headers, stream=True)
 
         if response.status_code == 200:
             return(pandas.read_csv(StringIO(response.content.decode()), sep="\t"))
@@ -535,7 +530,7 @@ def dropTable(tableName, datasetName="MyDB"):
         headers = {'Content-Type': 'application/json','Accept': 'application/json'}
         headers['X-Auth-Token']=  token
 
-        response = requests.delete(url, headers=headers)
+        response = _Http.delete(url, headers=headers)
 
         if response.status_code == 200:
             return (True)
@@ -580,7 +575,7 @@ def uploadTable(uploadData, tableName, datasetName="MyDB", format="csv"):
 
         #url = urllib.quote_plus(url)
 
-        response = requests.put(url, data=uploadData, headers=headers, stream=True)
+        response = _Http.put(url, data=uploadData, headers=headers, stream=True)
 
         if response.status_code == 200:
             return (True)
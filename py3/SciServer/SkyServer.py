@@ -1,4 +1,4 @@
-import requests
+import asyncio
 import pandas
 import skimage.io
 import urllib
@@ -7,7 +7,7 @@ import urllib
 from io import StringIO
 from io import BytesIO
 
-from SciServer import Authentication, Config
+from SciServer import Authentication, Config, _Http
 
 def sqlSearch(sql, dataRelease=None):
     """
@@ -21,6 +21,52 @@ def sqlSearch(sql, dataRelease=None):
 
     .. seealso:: CasJobs.executeQuery, CasJobs.submitJob.
     """
+    url = _getSqlSearchUrl(sql, dataRelease, "sqlSearch")
+
+    acceptHeader = "text/plain"
+    headers = {'Content-Type': 'application/json', 'Accept': acceptHeader}
+
+    token = Authentication.getToken()
+    if token is not None and token != "":
+        headers['X-Auth-Token'] = token
+
+    response = _Http.get(url,headers=headers, stream=True)
+    if response.status_code != 200:
+        raise Exception("Error when executing a sql query.\nHttp Response from SkyServer API returned status code " + str(response.status_code) + ":\n" + response.content.decode());
+
+    r=response.content.decode();
+    return pandas.read_csv(StringIO(r), comment='#', index_col=None)
+
+
+async def sqlSearchAsync(sql, dataRelease=None):
+    """
+    Asynchronous version of SkyServer.sqlSearch, which returns an awaitable object. Many queries can be executed concurrently from a single thread, e.g., by using asyncio.gather.
+
+    :param sql: a string containing the sql query
+    :param dataRelease: SDSS data release (string). E.g, 'DR13'. Default value already set in SciServer.Config.DataRelease
+    :return: Returns the results table as a Pandas data frame.
+    :raises: Throws an exception if the HTTP request to the SkyServer API returns an error. Throws an exception if the 'aiohttp' package is not installed.
+    :example: dfs = await asyncio.gather(SkyServer.sqlSearchAsync(sql="select 1"), SkyServer.sqlSearchAsync(sql="select 2"))
+
+    .. seealso:: SkyServer.sqlSearch, CasJobs.executeQueryAsync.
+    """
+    url = _getSqlSearchUrl(sql, dataRelease, "sqlSearchAsync")
+
+    headers = {'Content-Type': 'application/json', 'Accept': "text/plain"}
+
+    token = await asyncio.to_thread(Authentication.getToken)
+    if token is not None and token != "":
+        headers['X-Auth-Token'] = token
+
+    response = await _Http.requestAsync("GET", url, headers=headers)
+    if response.status_code != 200:
+        raise Exception("Error when executing a sql query.\nHttp Response from SkyServer API returned status code " + str(response.status_code) + ":\n" + response.content.decode());
+
+    r=response.content.decode();
+    return pandas.read_csv(StringIO(r), comment='#', index_col=None)
+
+
+def _getSqlSearchUrl(sql, dataRelease, functionName):
     if(dataRelease):
         if dataRelease != "":
             url = Config.SkyServerWSurl + '/' + dataRelease + '/SkyServerWS/SearchTools/SqlSearch?'
@@ -36,24 +82,12 @@ def sqlSearch(sql, dataRelease=None):
     url = url + 'cmd=' + sql + '&'
 
     if Config.isSciServerComputeEnvironment():
-        url = url + "TaskName=Compute.SciScript-Python.SkyServer.sqlSearch&"
+        url = url + "TaskName=Compute.SciScript-Python.SkyServer." + functionName + "&"
     else:
-        url = url + "TaskName=SciScript-Python.SkyServer.sqlSearch&"
+        url = url + "TaskName=SciScript-Python.SkyServer." + functionName + "&"
 
     #url = urllib.quote_plus(url)
-    acceptHeader = "text/plain"
-    headers = {'Content-Type': 'application/json', 'Accept': acceptHeader}
-
-    token = Authentication.getToken()
-    if token is not None and token != "":
-        headers['X-Auth-Token'] = token
-
-    response = requests.get(url,headers=headers, stream=True)
-    if response.status_code != 200:
-        raise Exception("Error when executing a sql query.\nHttp Response from SkyServer API returned status code " + str(response.status_code) + ":\n" + response.content.decode());
-
-    r=response.content.decode();
-    return pandas.read_csv(StringIO(r), comment='#', index_col=None)
+    return url
 
 
 def getJpegImgCutout(ra, dec, scale=0.7, width=512, height=512, opt="", query="", dataRelease=None):
@@ -125,7 +159,7 @@ def getJpegImgCutout(ra, dec, scale=0.7, width=512, height=512, opt="", query=""
     if token is not None and token != "":
         headers['X-Auth-Token'] = token
 
-    response = requests.get(url,headers=headers, stream=True)
+    response = _Http.get(url,headers=headers, stream=True)
     if response.status_code != 200:
         if response.status_code == 404 or response.status_code == 500:
             raise Exception("Error when getting an image cutout.\nHttp Response from SkyServer API returned status code " + str(response.status_code) + ". " + response.reason);
@@ -183,7 +217,7 @@ def radialSearch(ra, dec, radius=1, coordType="equatorial", whichPhotometry="opt
     if token is not None and token != "":
         headers['X-Auth-Token'] = token
 
-    response = requests.get(url,headers=headers, stream=True)
+    response = _Http.get(url,headers=headers, stream=True)
     if response.status_code != 200:
         raise Exception("Error when executing a radial search.\nHttp Response from SkyServer API returned status code " + str(response.status_code) + ":\n" + response.content.decode());
 
@@ -242,7 +276,7 @@ def rectangularSearch(min_ra, max_ra, min_dec, max_dec, coordType="equatorial",
     if token is not None and token != "":
         headers['X-Auth-Token'] = token
 
-    response = requests.get(url,headers=headers, stream=True)
+    response = _Http.get(url,headers=headers, stream=True)
     if response.status_code != 200:
         raise Exception("Error when executing a rectangular search.\nHttp Response from SkyServer API returned status code " + str(response.status_code) + ":\n" + response.content.decode());
 
@@ -330,7 +364,7 @@ def objectSearch(objId=None, specObjId=None, apogee_id=None, apstar_id=None, ra=
     if token is not None and token != "":
         headers['X-Auth-Token'] = token
 
-    response = requests.get(url,headers=headers, stream=True)
+    response = _Http.get(url,headers=headers, stream=True)
     if response.status_code != 200:
         raise Exception("Error when doing an object search.\nHttp Response from SkyServer API returned status code " + str(response.status_code) + ":\n" + response.content.decode());
 
@@ -0,0 +1,324 @@
+"""
+Internal HTTP client used by all the SciServer modules to talk to the SciServer web services.
+
+All requests are sent through one shared requests.Session, which keeps a pool of keep-alive connections per host.
+Consecutive calls to the same service (e.g., many Jobs.getJobDescription or Files.dirList calls) therefore reuse an
+already open TCP/TLS connection instead of paying a new handshake on every call.
+The size of the pools is defined by Config.HttpPoolConnections and Config.HttpPoolMaxSize.
+
+The asynchronous variants of the SciServer functions (e.g., CasJobs.executeQueryAsync) send their requests through an
+aiohttp.ClientSession instead, which is created once per running event loop and holds up to
+Config.HttpAsyncPoolMaxSize connections per host. The aiohttp package is only required when those functions are used.
+"""
+__author__ = 'mtaghiza'
+
+import asyncio
+import json
+import os
+import threading
+import time
+import uuid
+import weakref
+from http.cookiejar import DefaultCookiePolicy
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from SciServer import Config
+
+
+_lock = threading.Lock()
+_session = None
+_sessionKey = None
+
+
+def _newSession():
+    session = requests.Session()
+    # the module-level requests.get/post/... calls used previously did not keep cookies between calls.
+    session.cookies.set_policy(DefaultCookiePolicy(allowed_domains=[]))
+    adapter = HTTPAdapter(pool_connections=Config.HttpPoolConnections, pool_maxsize=Config.HttpPoolMaxSize)
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    return session
+
+
+def getSession():
+    """
+    Returns the requests.Session shared by all SciServer modules. The session is created on first use, and re-created
+    if the pool sizes in Config.HttpPoolConnections or Config.HttpPoolMaxSize change, or if the process was forked.
+
+    :return: object of class requests.Session
+    :example: session = _Http.getSession()
+
+    .. seealso:: _Http.closeSession, _Http.request
+    """
+    global _session, _sessionKey
+    key = (os.getpid(), Config.HttpPoolConnections, Config.HttpPoolMaxSize)
+    session = _session
+    if session is not None and _sessionKey == key:
+        return session
+
+    with _lock:
+        if _session is None or _sessionKey != key:
+            oldSession, oldKey = _session, _sessionKey
+            _session = _newSession()
+            _sessionKey = key
+            # connections of a forked parent process must not be closed from within the child.
+            if oldSession is not None and oldKey[0] == key[0]:
+                oldSession.close()
+        return _session
+
+
+def closeSession():
+    """
+    Closes all pooled connections of the shared session. A new session is created automatically on the next request.
+
+    :example: _Http.closeSession()
+
+    .. seealso:: _Http.getSession
+    """
+    global _session, _sessionKey
+    with _lock:
+        if _session is not None and _sessionKey[0] == os.getpid():
+            _session.close()
+        _session = None
+        _sessionKey = None
+
+
+def request(method, url, **kwargs):
+    """
+    Sends an HTTP request through the shared session. Takes the same parameters as requests.request.
+
+    :param method: HTTP method (string), such as "GET" or "POST".
+    :param url: URL of the request (string).
+    :return: object of class requests.Response
+    """
+    return getSession().request(method, url, **kwargs)
+
+
+def get(url, **kwargs):
+    return request("GET", url, **kwargs)
+
+
+def head(url, **kwargs):
+    kwargs.setdefault("allow_redirects", False)
+    return request("HEAD", url, **kwargs)
+
+
+def post(url, data=None, json=None, **kwargs):
+    return request("POST", url, data=data, json=json, **kwargs)
+
+
+def put(url, data=None, **kwargs):
+    return request("PUT", url, data=data, **kwargs)
+
+
+def patch(url, data=None, **kwargs):
+    return request("PATCH", url, data=data, **kwargs)
+
+
+def delete(url, **kwargs):
+    return request("DELETE", url, **kwargs)
+
+
+def streamToFile(res, localFilePath, chunkSize=None):
+    """
+    Writes the body of a streamed HTTP response into a local file, one chunk at a time, so that memory usage does not
+    depend on the size of the body. The body is first written into a temporary file in the same directory, which is
+    then renamed to localFilePath, so that localFilePath never contains a partially written file.
+
+    :param res: object of class requests.Response, returned by a request sent with stream=True.
+    :param localFilePath: local destination path of the file (string).
+    :param chunkSize: size in bytes (integer) of the chunks read from the response and written into the file. If not
+        set, then Config.FileTransferChunkSize is used.
+    :return: a tuple (number of bytes written, seconds taken).
+    """
+    chunkSize = chunkSize if chunkSize else Config.FileTransferChunkSize
+    tempFilePath = getTempFilePath(localFilePath)
+    startTime = time.monotonic()
+    nBytes = 0
+    try:
+        with open(tempFilePath, "xb") as f:
+            for chunk in res.iter_content(chunk_size=chunkSize):
+                f.write(chunk)
+                nBytes += len(chunk)
+        os.replace(tempFilePath, localFilePath)
+    except BaseException:
+        if os.path.exists(tempFilePath):
+            os.remove(tempFilePath)
+        raise
+    finally:
+        res.close()
+    return nBytes, time.monotonic() - startTime
+
+
+def getTempFilePath(localFilePath):
+    """
+    Returns a unique path (string) for a hidden temporary file in the same directory as localFilePath, into which the
+    content of localFilePath can be written before renaming it atomically with os.replace.
+    """
+    directory, fileName = os.path.split(os.path.abspath(localFilePath))
+    return os.path.join(directory, "." + fileName + "." + uuid.uuid4().hex[:8] + ".tmp")
+
+
+def readStateFile(stateFilePath):
+    """
+    Returns the object stored in a JSON state file, such as the progress of a resumable transfer, or None if the file
+    does not exist or cannot be parsed.
+    """
+    try:
+        with open(stateFilePath) as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+def writeStateFile(stateFilePath, state):
+    """
+    Writes an object into a JSON state file through a temporary file that is renamed atomically, so that an interruption
+    or a concurrent writer never leaves a truncated state file behind.
+    """
+    tempFilePath = getTempFilePath(stateFilePath)
+    try:
+        with open(tempFilePath, "x") as f:
+            json.dump(state, f)
+        os.replace(tempFilePath, stateFilePath)
+    except BaseException:
+        if os.path.exists(tempFilePath):
+            os.remove(tempFilePath)
+        raise
+
+
+def formatThroughput(nBytes, seconds):
+    """
+    Returns a human readable description (string) of the amount of bytes transferred within a time interval.
+    """
+    megaBytes = nBytes / 1048576.0
+    return "%.1f MB in %.2f s (%.1f MB/s)" % (megaBytes, seconds, megaBytes / seconds if seconds > 0 else float("inf"))
+
+
+class AsyncResponse:
+    """
+    The class AsyncResponse stores the HTTP response of an asynchronous request, after its body has been fully read.
+    """
+    def __init__(self, status_code, headers, content, url):
+        self.status_code = status_code
+        self.headers = headers
+        self.content = content
+        self.url = url
+
+    def json(self):
+        return json.loads(self.content.decode())
+
+
+_asyncSessions = weakref.WeakKeyDictionary()
+
+
+def _importAiohttp():
+    try:
+        import aiohttp
+    except ImportError:
+        raise Exception("The asynchronous SciServer functions require the 'aiohttp' package. Install it with 'pip install aiohttp'.")
+    return aiohttp
+
+
+async def _closeOnLoopShutdown(session):
+    # asynchronous generators are finalized by the event loop when it shuts down (e.g., at the end of asyncio.run),
+    # which gives a chance to close the connections of the session bound to that loop.
+    try:
+        yield
+    finally:
+        await session.close()
+
+
+async def getAsyncSession():
+    """
+    Returns the aiohttp.ClientSession used for asynchronous requests within the running event loop. The session is
+    created on first use, and closed automatically when the event loop shuts down.
+
+    :return: object of class aiohttp.ClientSession
+    :example: session = await _Http.getAsyncSession()
+
+    .. seealso:: _Http.closeAsyncSession, _Http.requestAsync
+    """
+    loop = asyncio.get_running_loop()
+    entry = _asyncSessions.get(loop)
+    if entry is None or entry[0].closed:
+        aiohttp = _importAiohttp()
+        connector = aiohttp.TCPConnector(limit=0, limit_per_host=Config.HttpAsyncPoolMaxSize)
+        session = aiohttp.ClientSession(connector=connector, cookie_jar=aiohttp.DummyCookieJar())
+        closer = _closeOnLoopShutdown(session)
+        await closer.__anext__()
+        entry = (session, closer)
+        _asyncSessions[loop] = entry
+    return entry[0]
+
+
+async def closeAsyncSession():
+    """
+    Closes the aiohttp.ClientSession bound to the running event loop, if any.
+
+    :example: await _Http.closeAsyncSession()
+
+    .. seealso:: _Http.getAsyncSession
+    """
+    entry = _asyncSessions.pop(asyncio.get_running_loop(), None)
+    if entry is not None:
+        await entry[1].aclose()
+
+
+async def requestAsync(method, url, data=None, headers=None, params=None, json=None):
+    """
+    Sends an asynchronous HTTP request through the aiohttp session of the running event loop, and reads the whole
+    response body.
+
+    :param method: HTTP method (string), such as "GET" or "POST".
+    :param url: URL of the request (string).
+    :param data: body of the request (bytes, string or file object).
+    :param headers: dictionary of HTTP headers.
+    :param params: dictionary of URL query parameters.
+    :param json: object sent as a JSON body.
+    :return: object of class _Http.AsyncResponse
+    """
+    session = await getAsyncSession()
+    async with session.request(method, url, data=data, headers=headers, params=params, json=json) as res:
+        content = await res.read()
+        return AsyncResponse(res.status, res.headers, content, str(res.url))
+
+
+async def requestToFileAsync(method, url, localFilePath, headers=None, chunkSize=None):
+    """
+    Sends an asynchronous HTTP request through the aiohttp session of the running event loop, and, if the response
+    has a 2xx status code, writes its body into a local file one chunk at a time, so that memory usage does not depend
+    on the size of the body. As in _Http.streamToFile, the body is first written into a temporary file that is then
+    renamed to localFilePath, and the file is written in another thread, so that the event loop is not blocked.
+
+    :param method: HTTP method (string), such as "GET".
+    :param url: URL of the request (string).
+    :param localFilePath: local destination path of the file (string).
+    :param headers: dictionary of HTTP headers.
+    :param chunkSize: size in bytes (integer) of the chunks read from the response and written into the file. If not
+        set, then Config.FileTransferChunkSize is used.
+    :return: object of class _Http.AsyncResponse, whose content is None if the body was written into the file, or the
+        whole body otherwise.
+    """
+    chunkSize = chunkSize if chunkSize else Config.FileTransferChunkSize
+    session = await getAsyncSession()
+    async with session.request(method, url, headers=headers) as res:
+        if res.status < 200 or res.status >= 300:
+            content = await res.read()
+            return AsyncResponse(res.status, res.headers, content, str(res.url))
+        tempFilePath = getTempFilePath(localFilePath)
+        f = await asyncio.to_thread(open, tempFilePath, "xb")
+        try:
+            try:
+                async for chunk in res.content.iter_chunked(chunkSize):
+                    await asyncio.to_thread(f.write, chunk)
+            finally:
+                await asyncio.to_thread(f.close)
+            os.replace(tempFilePath, localFilePath)
+        except BaseException:
+            if os.path.exists(tempFilePath):
+                os.remove(tempFilePath)
+            raise
+        return AsyncResponse(res.status, res.headers, None, str(res.url))
@@ -0,0 +1,168 @@
+"""
+Internal incremental parser for the JSON query results returned by the CasJobs API, which have the form
+{"Result": [{"TableName": "...", "Columns": ["...", ...], "Data": [[...], [...], ...]}, ...]}.
+
+The response body is consumed chunk by chunk, and the rows of each table are decoded one at a time and returned in
+batches, so that neither the whole body nor the whole tree of Python lists has to be held in memory at once.
+"""
+__author__ = 'mtaghiza'
+
+import codecs
+import json
+
+
+_decoder = json.JSONDecoder()
+
+# consumed text is dropped from the buffer once it is larger than this number of characters.
+_COMPACT_SIZE = 1024 * 1024
+
+
+class _Reader:
+
+    def __init__(self, chunks):
+        self.chunks = iter(chunks)
+        self.textDecoder = codecs.getincrementaldecoder("utf-8")()
+        self.buffer = ""
+        self.position = 0
+        self.eof = False
+
+    def refill(self):
+        if self.eof:
+            return False
+        if self.position > _COMPACT_SIZE:
+            self.buffer = self.buffer[self.position:]
+            self.position = 0
+        for chunk in self.chunks:
+            text = self.textDecoder.decode(chunk) if isinstance(chunk, bytes) else chunk
+            if text:
+                self.buffer += text
+                return True
+        self.buffer += self.textDecoder.decode(b"", final=True)
+        self.eof = True
+        return True
+
+    def peek(self):
+        """
+        Returns the next non-whitespace character, without consuming it, or None at the end of the body.
+        """
+        while True:
+            while self.position < len(self.buffer) and self.buffer[self.position] in " \t\n\r":
+                self.position += 1
+            if self.position < len(self.buffer):
+                return self.buffer[self.position]
+            if not self.refill() or (self.eof and self.position >= len(self.buffer)):
+                return None
+
+    def expect(self, characters):
+        character = self.peek()
+        if character is None or character not in characters:
+            raise Exception("Error when parsing the query result. Expected one of '" + characters + "' but found " + repr(character) + ".")
+        self.position += 1
+        return character
+
+    def value(self):
+        """
+        Decodes and consumes the next JSON value.
+        """
+        self.peek()
+        while True:
+            try:
+                (value, end) = _decoder.raw_decode(self.buffer, self.position)
+                # a number at the very end of the buffer might continue in the next chunk.
+                if end < len(self.buffer) or self.eof:
+                    self.position = end
+                    return value
+            except ValueError:
+                if self.eof:
+                    raise
+            self.refill()
+
+
+def iterResultBatches(chunks, batchSize):
+    """
+    Parses a JSON query result from an iterable of chunks (bytes or strings), and yields tuples
+    (tableIndex, tableName, columns, rows) where 'rows' is a list of at most batchSize rows of the table. At least one
+    tuple is yielded per table, with an empty list of rows if the table has no rows.
+
+    :param chunks: iterable of bytes or strings, such as the one returned by requests.Response.iter_content.
+    :param batchSize: maximum number of rows (integer) in each batch.
+    """
+    reader = _Reader(chunks)
+    reader.expect("{")
+    if reader.peek() == "}":
+        return
+    while True:
+        key = reader.value()
+        reader.expect(":")
+        if key == "Result":
+            yield from _iterTables(reader, batchSize)
+        else:
+            reader.value()
+        if reader.expect(",}") == "}":
+            return
+
+
+def _iterTables(reader, batchSize):
+    reader.expect("[")
+    if reader.peek() == "]":
+        reader.position += 1
+        return
+    tableIndex = 0
+    while True:
+        yield from _iterTable(reader, tableIndex, batchSize)
+        tableIndex += 1
+        if reader.expect(",]") == "]":
+            return
+
+
+def _iterTable(reader, tableIndex, batchSize):
+    tableName = None
+    columns = None
+    # rows found before the column names are kept until the end of the table.
+    pendingBatches = []
+    yielded = False
+    reader.expect("{")
+    if reader.peek() != "}":
+        while True:
+            key = reader.value()
+            reader.expect(":")
+            if key == "Data":
+                for rows in _iterRows(reader, batchSize):
+                    if columns is None:
+                        pendingBatches.append(rows)
+                    else:
+                        yielded = True
+                        yield (tableIndex, tableName, columns, rows)
+            elif key == "Columns":
+                columns = reader.value()
+            elif key == "TableName":
+                tableName = reader.value()
+            else:
+                reader.value()
+            if reader.expect(",}") == "}":
+                break
+    else:
+        reader.position += 1
+
+    for rows in pendingBatches:
+        yielded = True
+        yield (tableIndex, tableName, columns, rows)
+    if not yielded:
+        yield (tableIndex, tableName, columns, [])
+
+
+def _iterRows(reader, batchSize):
+    reader.expect("[")
+    if reader.peek() == "]":
+        reader.position += 1
+        return
+    rows = []
+    while True:
+        rows.append(reader.value())
+        if len(rows) >= batchSize:
+            yield rows
+            rows = []
+        if reader.expect(",]") == "]":
+            break
+    if rows:
+        yield rows
@@ -0,0 +1,101 @@
+"""
+Internal adaptive poller shared by the functions that wait for jobs to complete, such as CasJobs.waitForJob,
+SkyQuery.waitForJob, Jobs.waitForJob and SciQuery.wait_for_job.
+
+The status of a job is queried quickly at first, and the interval between queries then grows exponentially up to a
+cap, so that short jobs return without delay and long jobs are not queried too often. A random jitter is added to each
+interval, so that many clients waiting at the same time do not query in lockstep.
+"""
+__author__ = 'mtaghiza'
+
+import asyncio
+import random
+import time
+
+from SciServer import Config
+
+
+_MIN_POLL_TIME = 0.1 # seconds, so that a zero or negative poll time does not query the status in a busy loop
+
+
+class Backoff:
+    """
+    Sequence of poll intervals growing exponentially from 'pollTime' to 'maxPollTime', within an optional deadline.
+    If a parameter is not set, then its value is taken from Config.PollTime, Config.PollMaxTime, Config.PollBackoff or Config.PollJitter.
+    Intervals are never shorter than 0.1 seconds, and the backoff factor must be at least 1.
+    """
+
+    def __init__(self, pollTime=None, maxPollTime=None, timeout=None, backoff=None, jitter=None):
+        self.interval = max(pollTime if pollTime is not None else Config.PollTime, _MIN_POLL_TIME)
+        self.maxPollTime = max(maxPollTime if maxPollTime is not None else Config.PollMaxTime, self.interval)
+        self.backoff = backoff if backoff is not None else Config.PollBackoff
+        if self.backoff < 1:
+            raise Exception("Invalid poll backoff factor " + str(self.backoff) + ". It must be at least 1.")
+        self.jitter = jitter if jitter is not None else Config.PollJitter
+        self.startTime = time.monotonic()
+        self.deadline = self.startTime + timeout if timeout is not None else None
+
+    @property
+    def elapsed(self):
+        return time.monotonic() - self.startTime
+
+    def isExpired(self):
+        return self.deadline is not None and time.monotonic() >= self.deadline
+
+    def next(self):
+        """
+        Returns the number of seconds (float) to wait before the next poll, and grows the interval for the following one.
+        """
+        interval = self.interval * (1 + random.uniform(-self.jitter, self.jitter))
+        self.interval = min(self.interval * self.backoff, self.maxPollTime)
+        if self.deadline is not None:
+            interval = min(interval, self.deadline - time.monotonic())
+        return max(0.0, interval)
+
+    def sleep(self):
+        time.sleep(self.next())
+
+    async def sleepAsync(self):
+        await asyncio.sleep(self.next())
+
+
+def poll(getStatus, isComplete, pollTime=None, maxPollTime=None, timeout=None, callback=None, description="job"):
+    """
+    Calls getStatus() until isComplete(status) returns True, waiting for growing intervals between calls, and returns the last status.
+
+    :param getStatus: function with no arguments, returning the current status of the job.
+    :param isComplete: function taking a status and returning True if the job is complete.
+    :param pollTime: initial interval (float, in seconds) between calls. If not set, then Config.PollTime is used.
+    :param maxPollTime: maximum interval (float, in seconds) between calls. If not set, then Config.PollMaxTime is used.
+    :param timeout: maximum time (float, in seconds) to wait. If set to None, then waits with no time limit.
+    :param callback: function called as callback(status, elapsedSeconds) after each call returning a status that is not complete, e.g., to report progress.
+    :param description: description (string) of what is waited for, used in the timeout message.
+    :return: the first complete status.
+    :raises: Throws an exception if the timeout is reached before the job is complete. Re-throws the exceptions of getStatus and callback.
+    """
+    backoff = Backoff(pollTime, maxPollTime, timeout)
+    while True:
+        status = getStatus()
+        if isComplete(status):
+            return status
+        if callback is not None:
+            callback(status, backoff.elapsed)
+        if backoff.isExpired():
+            raise Exception("Timeout after " + str(timeout) + " seconds when waiting for " + description + ".")
+        backoff.sleep()
+
+
+async def pollAsync(getStatus, isComplete, pollTime=None, maxPollTime=None, timeout=None, callback=None, description="job"):
+    """
+    Asynchronous version of poll, where getStatus() returns an awaitable object. Takes the same parameters as poll.
+    """
+    backoff = Backoff(pollTime, maxPollTime, timeout)
+    while True:
+        status = await getStatus()
+        if isComplete(status):
+            return status
+        if callback is not None:
+            callback(status, backoff.elapsed)
+        if backoff.isExpired():
+            raise Exception("Timeout after " + str(timeout) + " seconds when waiting for " + description + ".")
+        await backoff.sleepAsync()
@@ -0,0 +1,276 @@
+"""
+Internal cache of query results used by CasJobs.executeQuery, which is enabled by setting Config.QueryCacheEnabled to True.
+
+Results are kept under a key made of the database context, a hash of the user token, the requested format and a hash
+of the normalized SQL text (whitespace collapsed outside of string literals and trailing semicolons removed), so that
+re-running the same query against a static context such as a data release returns without contacting CasJobs, and
+the results of one user are never returned to another one.
+There are two tiers: an in-memory LRU cache holding up to Config.QueryCacheMaxMemory bytes of results, and, if
+Config.QueryCachePersist is True, files under Config.CacheDir/queries/<token hash> that are kept across Python sessions. Tables are
+stored on disk in Apache Parquet format (which requires the 'pyarrow' package), and the other formats as the raw response.
+Entries expire after Config.QueryCacheTTL seconds, or after the number of seconds set for their context in
+Config.QueryCacheContextTTL.
+
+Only read-only queries (a single statement starting with 'select' or 'with', and without 'into' or any keyword that
+modifies data or schema outside of string literals) are cached. Queries run in one of Config.QueryCacheExcludedContexts
+(MyDB and MyScratch by default), or referring to the tables of one of them as in 'mydb.MyTable', are never cached, since
+those contexts change. The entries of a context are also removed when the SciServer.CasJobs functions write to it, or
+run a query that is not read-only in it or naming it as in 'insert into DR16.dbo.MyTable'.
+"""
+__author__ = 'mtaghiza'
+
+import hashlib
+import json
+import os
+import re
+import threading
+import time
+import uuid
+from urllib.parse import quote
+
+import cachetools
+
+from SciServer import Authentication, Config
+
+
+_lock = threading.RLock()
+_memory = None
+
+_QUOTED = re.compile(r"('(?:[^']|'')*'|\"(?:[^\"]|\"\")*\"|\[[^\]]*\])")
+_WHITESPACE = re.compile(r"\s+")
+_READ_ONLY = re.compile(r"^\(*\s*(select|with)\b", re.IGNORECASE)
+_CONTEXT = re.compile(r"\b(\w+)\s*\.")
+_WRITE = re.compile(r";|\b(into|insert|update|delete|merge|drop|alter|create|truncate|exec|execute)\b", re.IGNORECASE)
+
+
+def normalizeSql(sql):
+    """
+    Returns the SQL text with runs of whitespace outside of string literals and quoted identifiers collapsed into one space, and without leading or trailing whitespace and semicolons.
+    """
+    parts = _QUOTED.split(sql)
+    for i in range(0, len(parts), 2):
+        parts[i] = _WHITESPACE.sub(" ", parts[i])
+    return "".join(parts).strip().rstrip(";").strip()
+
+
+def _getUnquotedSql(sql):
+    return " ".join(_QUOTED.split(normalizeSql(sql))[0::2])
+
+
+def isCacheable(sql, context):
+    """
+    Returns True if the result of the query can be cached: the cache is enabled, the query is read-only, and neither its context nor the tables it refers to are in Config.QueryCacheExcludedContexts.
+    """
+    if not Config.QueryCacheEnabled or _getTTL(context) <= 0 or not isReadOnly(sql):
+        return False
+    unquotedSql = _getUnquotedSql(sql)
+    for excludedContext in Config.QueryCacheExcludedContexts:
+        if re.search(r"\b" + re.escape(excludedContext) + r"\s*\.", unquotedSql, re.IGNORECASE):
+            return False
+    return True
+
+
+def isReadOnly(sql):
+    """
+    Returns True if the query only reads data: it is a single statement starting with 'select' or 'with', and has no 'into' clause nor any of the keywords 'insert', 'update', 'delete', 'merge', 'drop', 'alter', 'create', 'truncate' or 'exec' outside of string literals and quoted identifiers.
+    """
+    unquotedSql = _getUnquotedSql(sql)
+    return _READ_ONLY.match(unquotedSql) is not None and _WRITE.search(unquotedSql) is None
+
+
+def getReferencedContexts(sql):
+    """
+    Returns the set of names (lowercase strings) that prefix an object name in the query, as in 'mydb.MyTable' or '[DR16].dbo.PhotoObj', which might be database contexts.
+    """
+    parts = _QUOTED.split(normalizeSql(sql))
+    names = set()
+    for (i, part) in enumerate(parts):
+        if i % 2 == 0:
+            names.update(name.lower() for name in _CONTEXT.findall(part))
+        elif i + 1 < len(parts) and parts[i + 1].lstrip().startswith(".") and part[0] in "[\"":
+            names.add(part[1:-1].lower())
+    return names
+
+
+def _getTTL(context):
+    for excludedContext in Config.QueryCacheExcludedContexts:
+        if excludedContext.lower() == context.lower():
+            return 0
+    for (name, ttl) in Config.QueryCacheContextTTL.items():
+        if name.lower() == context.lower():
+            return ttl
+    return Config.QueryCacheTTL
+
+
+def _getUser():
+    # a hash of the token, so that the token itself is not written to disk.
+    token = Authentication.getToken()
+    return hashlib.sha256((token or "").encode()).hexdigest()[:32]
+
+
+def _getKey(sql, context, format):
+    digest = hashlib.sha256("\n".join([Config.CasJobsRESTUri, format, normalizeSql(sql)]).encode()).hexdigest()
+    return (context.lower(), _getUser(), digest)
+
+
+def _getSize(entry):
+    value = entry[1]
+    if isinstance(value, bytes):
+        return len(value)
+    size = 0
+    for table in value:
+        size += table.nbytes if hasattr(table, "nbytes") else int(table.memory_usage(index=False, deep=True).sum())
+    return max(size, 1)
+
+
+def _getMemory():
+    global _memory
+    if _memory is None or _memory.maxsize != Config.QueryCacheMaxMemory:
+        previousMemory = _memory
+        # entries are (time, value) tuples, and expire at the same time as their files on disk, from the time when the result was received.
+        _memory = cachetools.TLRUCache(maxsize=Config.QueryCacheMaxMemory, ttu=lambda key, entry, now: now + _getTTL(key[0]) - (time.time() - entry[0]),
+                                       timer=time.monotonic, getsizeof=_getSize)
+        if previousMemory is not None:
+            # the entries are kept when Config.QueryCacheMaxMemory is changed, as long as they fit.
+            for (key, entry) in list(previousMemory.items()):
+                try:
+                    _memory[key] = entry
+                except ValueError:
+                    pass
+    return _memory
+
+
+def _getDirectory(context, user):
+    return os.path.join(Config.CacheDir, "queries", user, quote(context.lower(), safe=""))
+
+
+def get(sql, context, format):
+    """
+    Returns the cached result of a query, either as the bytes of the response, or as a list of pandas.DataFrame or pyarrow.Table objects, one per result table. Returns None if the result is not cached or has expired.
+    """
+    key = _getKey(sql, context, format)
+    with _lock:
+        entry = _getMemory().get(key)
+    if entry is None and Config.QueryCachePersist:
+        entry = _readFiles(key)
+        if entry is not None:
+            _putMemory(key, entry)
+    return entry[1] if entry is not None else None
+
+
+def put(sql, context, format, value):
+    """
+    Caches the result of a query, given either as the bytes of the response, or as a list of pandas.DataFrame or pyarrow.Table objects, one per result table.
+    """
+    key = _getKey(sql, context, format)
+    entry = (time.time(), value)
+    _putMemory(key, entry)
+    if Config.QueryCachePersist:
+        _writeFiles(key, entry)
+
+
+def _putMemory(key, entry):
+    with _lock:
+        try:
+            _getMemory()[key] = entry
+        except ValueError:
+            pass # larger than the whole in-memory cache
+
+
+def invalidate(context=None):
+    """
+    Removes the cached results of the queries run in a database context by any user, or of all queries if context is None.
+    """
+    global _memory
+    with _lock:
+        if context is None:
+            _memory = None
+        elif _memory is not None:
+            for key in [key for key in list(_memory.keys()) if key[0] == context.lower()]:
+                _memory.pop(key, None)
+    rootDirectory = os.path.join(Config.CacheDir, "queries")
+    if context is None:
+        directories = [rootDirectory]
+    else:
+        directories = [os.path.join(rootDirectory, user, quote(context.lower(), safe="")) for user in (os.listdir(rootDirectory) if os.path.isdir(rootDirectory) else [])]
+    for directory in directories:
+        if os.path.isdir(directory):
+            for (dirPath, dirNames, fileNames) in os.walk(directory):
+                for fileName in fileNames:
+                    if fileName.endswith(".json"):
+                        _removeFiles(os.path.join(dirPath, fileName[:-len(".json")]))
+
+
+def _removeFiles(path):
+    # the metadata file is removed first, so that a partially removed entry is never read.
+    try:
+        with open(path + ".json") as f:
+            meta = json.load(f)
+        os.remove(path + ".json")
+    except (OSError, ValueError):
+        return
+    for fileName in meta.get("files", []):
+        try:
+            os.remove(os.path.join(os.path.dirname(path), fileName))
+        except OSError:
+            pass
+
+
+def _readFiles(key):
+    path = os.path.join(_getDirectory(key[0], key[1]), key[2])
+    try:
+        with open(path + ".json") as f:
+            meta = json.load(f)
+    except (OSError, ValueError):
+        return None
+    if time.time() - meta["time"] >= _getTTL(key[0]):
+        _removeFiles(path)
+        return None
+    try:
+        files = [os.path.join(os.path.dirname(path), fileName) for fileName in meta["files"]]
+        if meta["kind"] == "content":
+            with open(files[0], "rb") as f:
+                return (meta["time"], f.read())
+        import pyarrow.parquet
+        tables = [pyarrow.parquet.read_table(fileName) for fileName in files]
+        if meta["kind"] == "pandas":
+            return (meta["time"], [table.to_pandas() for table in tables])
+        return (meta["time"], tables)
+    except Exception:
+        return None
+
+
+def _writeFiles(key, entry):
+    (createdTime, value) = entry
+    directory = _getDirectory(key[0], key[1])
+    suffix = "." + uuid.uuid4().hex
+    files = []
+    try:
+        os.makedirs(directory, exist_ok=True)
+        if isinstance(value, bytes):
+            kind = "content"
+            files.append(key[2] + suffix + ".bin")
+            with open(os.path.join(directory, files[0]), "wb") as f:
+                f.write(value)
+        else:
+            import pyarrow
+            import pyarrow.parquet
+            kind = "arrow" if len(value) > 0 and isinstance(value[0], pyarrow.Table) else "pandas"
+            for (i, table) in enumerate(value):
+                if kind == "pandas":
+                    table = pyarrow.Table.from_pandas(table, preserve_index=False)
+                files.append(key[2] + suffix + "." + str(i) + ".parquet")
+                pyarrow.parquet.write_table(table, os.path.join(directory, files[-1]))
+        # the metadata file is written last and replaced atomically, so that an entry is only read once all its files are complete.
+        path = os.path.join(directory, key[2])
+        with open(path + suffix + ".json", "w") as f:
+            json.dump({"time": createdTime, "kind": kind, "files": files}, f)
+        _removeFiles(path)
+        os.replace(path + suffix + ".json", path + ".json")
+    except Exception:
+        # the in-memory cache is still used when the result cannot be stored on disk, e.g., if 'pyarrow' is not installed.
+        for fileName in files + [key[2] + suffix + ".json"]:
+            try:
+                os.remove(os.path.join(directory, fileName))
+            except OSError:
+                pass